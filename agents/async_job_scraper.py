@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import time
+
+# aiohttp is only needed for the async scraper; the rest of the app runs without it
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from agents.deadline import deadline_expired, time_left
+from agents.job_scraper import JobScraperAgent, USAJOBS_HEADERS, SCRAPER_CONFIG
+
+class AsyncJobScraperAgent:
+    """Scrape many USAJobs searches concurrently on an asyncio event loop"""
+
+    def __init__(self, scraper=None, max_concurrency=None, timeout=15, max_retries=3):
+        if aiohttp is None:
+            raise ImportError("aiohttp is required for AsyncJobScraperAgent (pip install aiohttp)")
+
+        self.logger = logging.getLogger(__name__)
+        # URL building and HTML parsing are shared with the synchronous scraper so
+        # both produce exactly the same job dictionaries
+        self.scraper = scraper or JobScraperAgent()
+        self.max_concurrency = max_concurrency or SCRAPER_CONFIG.get('MAX_CONCURRENT_SEARCHES', 4)
+        self.timeout = timeout
+        self.max_retries = max_retries
+
+    async def scrape_usajobs(self, session, keywords, location, job_type="full-time"):
+        """
+        Scrape one USAJobs search over an open aiohttp session
+
+        Args:
+            session (aiohttp.ClientSession): Session to fetch with
+            keywords (str): Job title, keywords, or agency name
+            location (str): City, state, ZIP, or country
+            job_type (str): Type of job (full-time, part-time, etc.)
+
+        Returns:
+            list: List of job dictionaries (empty on failure)
+        """
+        # The JSON API adapter is synchronous; run it (and its cache) off the event loop
+        if self.scraper.api is not None:
+            return await asyncio.to_thread(self.scraper.scrape_usajobs, keywords, location, job_type)
+            
+        cached_jobs = self.scraper.cache.get(keywords, location, job_type)
+        if cached_jobs is not None:
+            return cached_jobs
+
+        search_url = self.scraper.build_search_url(keywords, location, job_type)
+        self.logger.info(f"Making async request to USAJobs: {search_url}")
+
+        limiter = self.scraper.rate_limiter
+        host = limiter.host_key(search_url)
+        breaker = self.scraper.breakers.get(host)
+        for retry in range(self.max_retries):
+            if not breaker.allow():
+                self.logger.warning(f"USAJobs request not sent: circuit for {host} is open")
+                return []
+            # Book a slot with the shared per-host limiter and wait for it on the loop
+            wait = limiter.reserve(host)
+            if wait is None:
+                breaker.release()
+                self.logger.warning(f"USAJobs request not sent: no request slot for {host} within {limiter.max_wait}s")
+                return []
+            if wait > 0:
+                await asyncio.sleep(wait)
+            # Requests made under a deadline get only the time it leaves
+            if deadline_expired():
+                breaker.release()
+                self.logger.warning("USAJobs request not sent: request time budget used up")
+                return []
+            start = time.monotonic()
+            response = None
+            try:
+                async with session.get(search_url, timeout=aiohttp.ClientTimeout(total=time_left(self.timeout))) as response:
+                    breaker.record(response.status >= 500 or response.status == 429, time.monotonic() - start)
+                    if response.status == 200:
+                        html = await response.text()
+                        break
+                    self.logger.error(f"Error scraping USAJobs: Status code {response.status}")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if response is None:
+                    breaker.record(True, time.monotonic() - start)
+                self.logger.error(f"Request error: {str(e)}")
+
+            if retry < self.max_retries - 1:
+                wait_time = (retry + 1) * 2  # Exponential backoff, shared with every other caller
+                self.logger.info(f"Retrying in {wait_time} seconds...")
+                limiter.backoff(host, wait_time)
+        else:
+            return []
+
+        try:
+            # Parsing is CPU-bound, keep it off the event loop
+            job_listings = await asyncio.to_thread(self.scraper.parse_search_results, html)
+        except Exception as e:
+            self.logger.error(f"Error scraping USAJobs: {str(e)}")
+            return []
+
+        # Stored the same way as synchronous fetches (dedup, high-water mark, details);
+        # the dedup index may be a database, so this runs off the loop too
+        return await asyncio.to_thread(self.scraper.cache_search, keywords, location, job_type,
+                                       job_listings, True)
+
+    async def scrape_many(self, queries):
+        """
+        Scrape several searches concurrently
+
+        Args:
+            queries (list): (keywords, location) or (keywords, location, job_type) tuples
+
+        Returns:
+            list: One list of job dictionaries per query, in the same order
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        connector = aiohttp.TCPConnector(limit_per_host=self.scraper.pool_size)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+
+        async with aiohttp.ClientSession(headers=USAJOBS_HEADERS, connector=connector,
+                                         timeout=timeout) as session:
+            async def run(query):
+                keywords, location, job_type = (tuple(query) + ("full-time",))[:3]
+                async with semaphore:
+                    return await self.scrape_usajobs(session, keywords, location, job_type)
+
+            return await asyncio.gather(*(run(query) for query in queries))
+
+    def scrape_many_sync(self, queries):
+        """Blocking wrapper around scrape_many for synchronous Flask views (runs under the caller's deadline)"""
+        return asyncio.run(self.scrape_many(queries))
+
+    def scrape_usajobs_sync(self, keywords, location, job_type="full-time"):
+        """Blocking wrapper that scrapes a single search"""
+        return self.scrape_many_sync([(keywords, location, job_type)])[0]
@@ -0,0 +1,81 @@
+class CardLineIndex:
+    """
+    Text lines of one job card, extracted and classified in a single pass
+
+    Cards whose fields don't match any selector fall back to scanning the card's
+    text. The text is pulled from the card's subtree once, on first use, and a
+    single scan over its lines records the first agency, location and salary
+    candidates, so every fallback heuristic reads from the same index.
+    """
+
+    # Text that suggests a line names a hiring agency
+    AGENCY_INDICATORS = ("Department of", "Bureau of", "Office of", "Agency for", "U.S.", "Federal")
+    # Text that suggests a line is a duty location
+    COMMON_LOCATIONS = ("Washington", "DC", "New York", "Virginia", "California", "Remote", "Telework")
+
+    def __init__(self, card):
+        self.card = card
+        self._lines = None
+        self._agency = None
+        self._location = None
+        self._salary = None
+
+    def _scan(self):
+        if self._lines is not None:
+            return
+        self._lines = []
+        for line in self.card.get_text().split('\n'):
+            line = line.strip()
+            if not line:
+                continue
+            self._lines.append(line)
+            length = len(line)
+            if (self._agency is None and length < 100
+                    and any(indicator in line for indicator in self.AGENCY_INDICATORS)):
+                self._agency = line
+            if (self._location is None and length < 50
+                    and any(loc in line for loc in self.COMMON_LOCATIONS)):
+                self._location = line
+            if (self._salary is None and length < 100
+                    and ('$' in line or ' per ' in line.lower())):
+                self._salary = line
+
+    @property
+    def lines(self):
+        """Non-empty, stripped text lines of the card in document order"""
+        self._scan()
+        return self._lines
+
+    def agency(self):
+        """First line that looks like an agency name, or None"""
+        self._scan()
+        return self._agency
+
+    def location(self):
+        """First short line that mentions a common location, or None"""
+        self._scan()
+        return self._location
+
+    def salary(self):
+        """First line with a dollar amount or a "per" rate, or None"""
+        self._scan()
+        return self._salary
+
+    def description(self, exclude_texts, limit=5):
+        """
+        Leading lines that contain none of the already extracted fields
+
+        Args:
+            exclude_texts (list): Field values (title, company, location) to skip
+            limit (int): Maximum number of lines returned
+
+        Returns:
+            list: Up to limit lines
+        """
+        description_lines = []
+        for line in self.lines:
+            if not any(exclude in line for exclude in exclude_texts):
+                description_lines.append(line)
+                if len(description_lines) == limit:
+                    break
+        return description_lines
@@ -0,0 +1,210 @@
+import logging
+import threading
+import time
+from collections import deque
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from agents.rate_limiter import RateLimitedAdapter, RateLimitTimeout
+
+# Scraper settings come from the config module when available
+try:
+    from config.config import SCRAPER_CONFIG
+except ImportError:
+    SCRAPER_CONFIG = {}
+
+class CircuitOpenError(requests.RequestException):
+    """A request was refused because the upstream's circuit is open"""
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open breaker driven by the recent error rate and latency
+
+    Calls are remembered for a sliding window. Once enough of them have been seen
+    and too many failed (or were too slow), the circuit opens and callers are
+    refused straight away. After open_seconds one trial call is let through
+    (half-open): if it succeeds the circuit closes, otherwise it opens again.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, name, failure_rate=None, slow_call_seconds=None, slow_call_rate=None,
+                 min_calls=None, window=None, open_seconds=None):
+        self.logger = logging.getLogger(__name__)
+        self.name = name
+        self.failure_rate = failure_rate or SCRAPER_CONFIG.get('CIRCUIT_FAILURE_RATE', 0.5)
+        self.slow_call_seconds = slow_call_seconds or SCRAPER_CONFIG.get('CIRCUIT_SLOW_CALL_SECONDS', 10.0)
+        self.slow_call_rate = slow_call_rate or SCRAPER_CONFIG.get('CIRCUIT_SLOW_CALL_RATE', 0.8)
+        self.min_calls = min_calls or SCRAPER_CONFIG.get('CIRCUIT_MIN_CALLS', 5)
+        self.window = window or SCRAPER_CONFIG.get('CIRCUIT_WINDOW', 60.0)
+        self.open_seconds = open_seconds or SCRAPER_CONFIG.get('CIRCUIT_OPEN_SECONDS', 30.0)
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._trial_running = False
+        # (finished_at, failed, slow) for calls within the window
+        self._calls = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def _current_state(self, now):
+        if self._state == self.OPEN and now - self._opened_at >= self.open_seconds:
+            self._state = self.HALF_OPEN
+            self._trial_running = False
+            self.logger.info(f"Circuit '{self.name}' is half-open, letting a trial request through")
+        return self._state
+
+    def allow(self):
+        """
+        Ask whether a call may go upstream now
+
+        Every allowed call must be followed by record() (or release() if it never
+        reached upstream).
+
+        Returns:
+            bool: False while the circuit is open or a half-open trial is running
+        """
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def release(self):
+        """Hand back an allowed call that was never sent"""
+        with self._lock:
+            self._trial_running = False
+
+    def record(self, failed, latency):
+        """
+        Record the outcome of an allowed call
+
+        Args:
+            failed (bool): Whether the upstream errored
+            latency (float): Seconds the call took
+        """
+        now = time.monotonic()
+        slow = latency >= self.slow_call_seconds
+        with self._lock:
+            state = self._current_state(now)
+            if state == self.OPEN:
+                # A call that was already in flight when the circuit opened
+                return
+            if state == self.HALF_OPEN:
+                self._trial_running = False
+                if failed or slow:
+                    self._open(now, "trial request failed")
+                else:
+                    self._state = self.CLOSED
+                    self._calls.clear()
+                    self.logger.info(f"Circuit '{self.name}' closed")
+                return
+
+            self._calls.append((now, failed, slow))
+            self._trim(now)
+            if len(self._calls) >= self.min_calls:
+                failures = sum(1 for _, call_failed, _ in self._calls if call_failed)
+                slow_calls = sum(1 for _, _, call_slow in self._calls if call_slow)
+                if failures / len(self._calls) >= self.failure_rate:
+                    self._open(now, f"{failures} of the last {len(self._calls)} requests failed")
+                elif slow_calls / len(self._calls) >= self.slow_call_rate:
+                    self._open(now, f"{slow_calls} of the last {len(self._calls)} requests took over {self.slow_call_seconds}s")
+
+    def _open(self, now, reason):
+        self._state = self.OPEN
+        self._opened_at = now
+        self._calls.clear()
+        self.logger.warning(f"Circuit '{self.name}' opened for {self.open_seconds}s: {reason}")
+
+    def _trim(self, now):
+        while self._calls and now - self._calls[0][0] > self.window:
+            self._calls.popleft()
+
+    def stats(self):
+        """State, recent error and slow-call rates, and seconds until the next trial"""
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            self._trim(now)
+            calls = len(self._calls)
+            return {
+                'state': state,
+                'calls': calls,
+                'error_rate': round(sum(1 for _, failed, _ in self._calls if failed) / calls, 3) if calls else 0.0,
+                'slow_rate': round(sum(1 for _, _, slow in self._calls if slow) / calls, 3) if calls else 0.0,
+                'retry_in': round(max(0.0, self._opened_at + self.open_seconds - now), 1) if state == self.OPEN else 0.0
+            }
+
+class CircuitBreakerRegistry:
+    """One circuit breaker per upstream host, created on first use"""
+
+    def __init__(self, **settings):
+        self.settings = settings
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def get(self, host):
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker(host, **self.settings)
+            return breaker
+
+    def stats(self):
+        """Breaker stats by host"""
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {host: breaker.stats() for host, breaker in breakers.items()}
+
+def is_upstream_failure(response):
+    """Responses that count against the circuit: server errors and throttling"""
+    return response.status_code >= 500 or response.status_code == 429
+
+class CircuitBreakerAdapter(RateLimitedAdapter):
+    """Rate-limited adapter that also refuses requests to hosts whose circuit is open"""
+
+    def __init__(self, rate_limiter, breakers, **kwargs):
+        self.breakers = breakers
+        super().__init__(rate_limiter, **kwargs)
+
+    def send(self, request, **kwargs):
+        host = self.rate_limiter.host_key(request.url)
+        breaker = self.breakers.get(host)
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit for {host} is open, request not sent")
+
+        try:
+            self.rate_limiter.acquire(host)
+        except RateLimitTimeout:
+            breaker.release()
+            raise
+
+        # Latency is timed from the rate limiter slot, not from when the caller queued
+        start = time.monotonic()
+        try:
+            response = HTTPAdapter.send(self, request, **kwargs)
+        except Exception:
+            breaker.record(True, time.monotonic() - start)
+            raise
+        breaker.record(is_upstream_failure(response), time.monotonic() - start)
+        return response
+
+_default_breakers = None
+_default_lock = threading.Lock()
+
+def get_circuit_breakers():
+    """Circuit breakers shared by every scraper in this process"""
+    global _default_breakers
+    with _default_lock:
+        if _default_breakers is None:
+            _default_breakers = CircuitBreakerRegistry()
+        return _default_breakers
@@ -0,0 +1,119 @@
+import contextvars
+import functools
+import time
+from contextlib import contextmanager
+
+import requests
+
+# Scraper settings come from the config module when available
+try:
+    from config.config import SCRAPER_CONFIG
+except ImportError:
+    SCRAPER_CONFIG = {}
+
+class DeadlineExceeded(requests.Timeout):
+    """The request's time budget ran out before an upstream call could be made"""
+
+class Deadline:
+    """Point in time by which a request must be answered"""
+
+    def __init__(self, budget):
+        self.budget = budget
+        self.expires_at = time.monotonic() + budget
+
+    def remaining(self):
+        """Seconds left, never negative"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self):
+        return self.remaining() <= 0
+
+# Deadline of the request being handled in the current thread (or task)
+_current = contextvars.ContextVar('request_deadline', default=None)
+
+def current_deadline():
+    """Deadline of the current request, or None outside a deadline scope"""
+    return _current.get()
+
+@contextmanager
+def deadline_scope(budget):
+    """
+    Give the code inside the block a time budget
+
+    A scope nested in another never extends the outer deadline.
+
+    Args:
+        budget (float): Seconds available, or None/0 for no limit
+
+    Yields:
+        Deadline: The deadline in effect inside the block (None without a limit)
+    """
+    outer = _current.get()
+    deadline = Deadline(budget) if budget else None
+    if outer is not None and (deadline is None or outer.expires_at < deadline.expires_at):
+        deadline = outer
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+def time_left(default=None):
+    """
+    Seconds the current request has left, capped at default
+
+    Returns:
+        float: The smaller of the time left and default (default alone without a deadline)
+    """
+    deadline = _current.get()
+    if deadline is None:
+        return default
+    remaining = deadline.remaining()
+    return remaining if default is None else min(default, remaining)
+
+def deadline_expired():
+    deadline = _current.get()
+    return deadline is not None and deadline.expired()
+
+def request_timeout(read=15, connect=5):
+    """
+    (connect, read) timeouts for an upstream call, fitted into the time left
+
+    Raises:
+        DeadlineExceeded: When the budget is already used up
+    """
+    deadline = _current.get()
+    if deadline is None:
+        return (connect, read)
+    remaining = deadline.remaining()
+    if remaining <= 0:
+        raise DeadlineExceeded(f"Request time budget of {deadline.budget}s used up")
+    return (min(connect, remaining), min(read, remaining))
+
+def submit_in_context(executor, fn, *args, **kwargs):
+    """Submit work to a thread pool so it runs under the caller's deadline"""
+    return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+def route_budget(name):
+    """Time budget of a route: its entry in ROUTE_BUDGETS, else REQUEST_BUDGET"""
+    return SCRAPER_CONFIG.get('ROUTE_BUDGETS', {}).get(name, SCRAPER_CONFIG.get('REQUEST_BUDGET', 25))
+
+def with_deadline(budget=None):
+    """
+    Decorator running a view (or any function) under a time budget
+
+    Args:
+        budget (float): Seconds for the whole call (defaults to route_budget of the function name)
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with deadline_scope(route_budget(fn.__name__) if budget is None else budget):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def iter_with_deadline(budget, iterable):
+    """Iterate under a time budget, for responses generated after the view returns"""
+    with deadline_scope(budget):
+        yield from iterable
@@ -0,0 +1,207 @@
+import hashlib
+import re
+import threading
+from collections import Counter, OrderedDict
+from urllib.parse import urlsplit, urlunsplit
+
+# Scraper settings come from the config module when available
+try:
+    from config.config import SCRAPER_CONFIG
+except ImportError:
+    SCRAPER_CONFIG = {}
+
+FINGERPRINT_BITS = 64
+
+# Fields that identify a posting, and how much each one weighs in the fingerprint
+FINGERPRINT_FIELDS = {'title': 3, 'company': 2, 'location': 2, 'description': 1}
+
+# Values the card parser fills in when a field is missing; a copy's real value replaces them
+PLACEHOLDERS = {'U.S. Government', 'Various Locations', 'Salary not specified'}
+
+WORD_RE = re.compile(r'\w+')
+
+def canonical_job_url(url):
+    """
+    Normalize a job URL so copies of the same posting compare equal
+    
+    Lowercases the scheme and host and drops the query string, fragment and
+    trailing slash (USAJobs links carry tracking parameters).
+    
+    Args:
+        url (str): Job posting URL
+        
+    Returns:
+        str: Canonical URL
+    """
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, '', ''))
+
+def simhash(features, bits=FINGERPRINT_BITS):
+    """
+    SimHash of weighted features
+
+    Similar feature sets give fingerprints that differ in only a few bits.
+
+    Args:
+        features (dict): Feature string -> weight
+
+    Returns:
+        int: Fingerprint of the given number of bits
+    """
+    totals = [0] * bits
+    for feature, weight in features.items():
+        value = int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=bits // 8).digest(), 'big')
+        for bit in range(bits):
+            totals[bit] += weight if value >> bit & 1 else -weight
+    return sum(1 << bit for bit, total in enumerate(totals) if total > 0)
+
+def job_fingerprint(job):
+    """SimHash over the title, company, location and description words of a job"""
+    features = Counter()
+    for field, weight in FINGERPRINT_FIELDS.items():
+        for word in WORD_RE.findall(str(job.get(field) or '').lower()):
+            features[f"{field}:{word}"] += weight
+    return simhash(features)
+
+def merge_jobs(kept, copy):
+    """
+    Fold a duplicate posting into the one being kept
+
+    Missing or placeholder fields are taken from the copy, the longer description
+    wins, and the copy's URL and source are remembered.
+
+    Returns:
+        dict: New merged job dictionary
+    """
+    merged = dict(kept)
+    for field, value in copy.items():
+        if value and (not merged.get(field) or merged.get(field) in PLACEHOLDERS):
+            merged[field] = value
+    if len(copy.get('description') or '') > len(merged.get('description') or ''):
+        merged['description'] = copy['description']
+
+    sources = [source for source in [kept.get('source'), *kept.get('also_from', []), copy.get('source'),
+                                     *copy.get('also_from', [])] if source]
+    also_from = [source for source in dict.fromkeys(sources) if source != merged.get('source')]
+    if also_from:
+        merged['also_from'] = also_from
+    urls = [url for url in [*kept.get('duplicate_urls', []), copy.get('url'), *copy.get('duplicate_urls', [])]
+            if url and canonical_job_url(url) != canonical_job_url(merged['url'])]
+    if urls:
+        merged['duplicate_urls'] = list(dict.fromkeys(urls))
+    return merged
+
+class DedupIndex:
+    """
+    Postings seen so far, for spotting copies by canonical URL or near-identical content
+
+    Each posting is kept as its fingerprint and canonical URL only. Fingerprints
+    are split into max_distance + 1 bands: two fingerprints within max_distance
+    bits of each other agree on at least one whole band, so a lookup is one dict
+    probe per band. The oldest postings are forgotten past max_entries.
+    """
+
+    def __init__(self, max_distance=None, max_entries=None):
+        self.max_distance = SCRAPER_CONFIG.get('DEDUP_MAX_DISTANCE', 3) if max_distance is None else max_distance
+        self.max_entries = max_entries or SCRAPER_CONFIG.get('DEDUP_MAX_ENTRIES', 100000)
+        self.band_count = self.max_distance + 1
+        self.band_bits = FINGERPRINT_BITS // self.band_count
+        # entry id -> (fingerprint, canonical URL), oldest first
+        self._entries = OrderedDict()
+        self._by_url = {}
+        self._by_band = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _bands(self, fingerprint):
+        mask = (1 << self.band_bits) - 1
+        return [(band, fingerprint >> (band * self.band_bits) & mask) for band in range(self.band_count)]
+
+    def _find(self, url, fingerprint):
+        entry_id = self._by_url.get(url)
+        if entry_id in self._entries:
+            return entry_id
+        if entry_id is not None:
+            # URL of a copy whose posting has been forgotten
+            del self._by_url[url]
+        for band in self._bands(fingerprint):
+            for candidate in self._by_band.get(band, ()):
+                if bin(self._entries[candidate][0] ^ fingerprint).count('1') <= self.max_distance:
+                    return candidate
+        return None
+
+    def _forget_oldest(self):
+        entry_id, (fingerprint, url) = self._entries.popitem(last=False)
+        if self._by_url.get(url) == entry_id:
+            del self._by_url[url]
+        for band in self._bands(fingerprint):
+            ids = self._by_band.get(band)
+            if ids is not None:
+                ids.discard(entry_id)
+                if not ids:
+                    del self._by_band[band]
+
+    def add(self, job):
+        """
+        Look a posting up and remember it
+
+        Returns:
+            str: Canonical URL of the earlier posting this one copies, or None if it is new
+        """
+        url = canonical_job_url(job['url']) if job.get('url') else None
+        fingerprint = job_fingerprint(job)
+        with self._lock:
+            entry_id = self._find(url, fingerprint)
+            if entry_id is not None:
+                self._entries.move_to_end(entry_id)
+                original_url = self._entries[entry_id][1]
+                # Further copies may come back under this URL too
+                if url and url not in self._by_url:
+                    self._by_url[url] = entry_id
+                return original_url or None
+
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = (fingerprint, url)
+            if url:
+                self._by_url[url] = entry_id
+            for band in self._bands(fingerprint):
+                self._by_band.setdefault(band, set()).add(entry_id)
+            while len(self._entries) > self.max_entries:
+                self._forget_oldest()
+            return None
+
+    def dedupe(self, jobs):
+        """
+        Merge the copies in a list of postings
+
+        Copies of a posting earlier in the list are folded into it. A posting
+        copying one seen in an earlier call is kept, with duplicate_of set to the
+        canonical URL of the first copy.
+
+        Args:
+            jobs (list): Job dictionaries
+
+        Returns:
+            list: Job dictionaries in first-seen order, one per posting
+        """
+        merged = OrderedDict()
+        for job in jobs:
+            own_url = canonical_job_url(job['url']) if job.get('url') else None
+            original_url = self.add(job)
+            key = original_url or own_url or id(job)
+            if key in merged:
+                merged[key] = merge_jobs(merged[key], job)
+            elif original_url and original_url != own_url:
+                merged[key] = dict(job, duplicate_of=original_url)
+            else:
+                merged[key] = job
+        return list(merged.values())
+
+    def stats(self):
+        with self._lock:
+            return {'postings': len(self._entries), 'urls': len(self._by_url), 'max_distance': self.max_distance}
@@ -0,0 +1,215 @@
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import requests
+
+from agents.dedup import canonical_job_url
+from agents.deadline import request_timeout, time_left
+from agents.parser_backends import make_soup
+from agents.search_cache import create_cache_backend
+
+# Main-content extraction is optional; announcement sections are parsed directly without it
+try:
+    import trafilatura
+except ImportError:
+    trafilatura = None
+
+# Scraper settings come from the config module when available
+try:
+    from config.config import SCRAPER_CONFIG
+except ImportError:
+    SCRAPER_CONFIG = {}
+
+# Element ids of the sections of a USAJobs announcement, in reading order
+ANNOUNCEMENT_SECTIONS = {
+    'summary': ('summary',),
+    'duties': ('duties',),
+    'qualifications': ('qualifications', 'requirements')
+}
+
+def section_text(element):
+    """Text of a page section, one line per block"""
+    lines = (' '.join(line.split()) for line in element.get_text('\n').splitlines())
+    return '\n'.join(line for line in lines if line)
+
+def extract_details(html, url=None):
+    """
+    Pull the full posting text out of a job announcement page
+
+    USAJobs announcements are read section by section; other pages (and
+    announcements in an unknown layout) go through trafilatura when it is
+    installed, falling back to the page text.
+
+    Args:
+        html (str): Announcement page HTML
+        url (str): Page URL, to help the extractor
+
+    Returns:
+        dict: 'description' (full text), plus 'summary', 'duties' and
+              'qualifications' for the sections that were found
+    """
+    soup = make_soup(html)
+    details = {}
+    for name, ids in ANNOUNCEMENT_SECTIONS.items():
+        for element_id in ids:
+            element = soup.find(id=element_id)
+            if element is not None:
+                details[name] = section_text(element)
+                break
+
+    if details:
+        details['description'] = '\n\n'.join(details[name] for name in ANNOUNCEMENT_SECTIONS if name in details)
+        return details
+
+    text = None
+    if trafilatura is not None:
+        text = trafilatura.extract(html, url=url, include_comments=False, include_tables=True)
+    if not text:
+        body = soup.body or soup
+        for element in body(['script', 'style', 'nav', 'header', 'footer']):
+            element.decompose()
+        text = section_text(body)
+    details['description'] = text
+    return details
+
+class JobDetailFetcher:
+    """
+    Fetches job announcement pages for their full text, on a bounded worker pool
+
+    Details are cached by canonical URL. A URL already being fetched is not
+    fetched again, so enriching the same results twice costs one request per
+    posting. Fetched URLs are recorded in the seen-URL filter. When the filter
+    is kept on disk (shared by the workers on a host and kept across restarts)
+    it answers "never fetched" without a cache lookup; an in-memory filter only
+    knows this process's fetches, so the cache is always asked.
+    """
+
+    # Key prefix for job details in the cache backend
+    PREFIX = 'detail:'
+
+    def __init__(self, session=None, backend=None, seen=None, max_workers=None, ttl=None):
+        self.logger = logging.getLogger(__name__)
+        self.session = session or requests.Session()
+        self.backend = backend or create_cache_backend(max_entries=SCRAPER_CONFIG.get('DETAIL_CACHE_ENTRIES', 2048))
+        self.seen = seen
+        self.ttl = ttl or SCRAPER_CONFIG.get('DETAIL_CACHE_TTL', 604800)
+        self.max_workers = max_workers or SCRAPER_CONFIG.get('DETAIL_WORKERS', 4)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='job-detail')
+        # Fetches in progress, by canonical URL
+        self._pending = {}
+        self._lock = threading.Lock()
+        self.fetched = 0
+        self.failed = 0
+
+    def key(self, url):
+        return self.PREFIX + canonical_job_url(url)
+
+    def cached(self, url):
+        """Cached details of a posting, or None"""
+        key = self.key(url)
+        if self.seen is not None and self.seen.path and key not in self.seen:
+            return None
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            self.logger.error(f"Error reading job details from cache: {str(e)}")
+            return None
+        return json.loads(value.decode('utf-8')) if value is not None else None
+
+    def fetch(self, url):
+        """
+        Fetch and cache the details of a posting (cached details are returned as is)
+
+        Returns:
+            dict: Details (see extract_details), or None if the page couldn't be read
+        """
+        details = self.cached(url)
+        if details is not None:
+            return details
+        try:
+            response = self.session.get(url, timeout=request_timeout(15))
+            if response.status_code != 200:
+                raise requests.HTTPError(f"Status code {response.status_code}", response=response)
+            details = extract_details(response.text, url)
+        except Exception as e:
+            self.failed += 1
+            self.logger.error(f"Error fetching job details from {url}: {str(e)}")
+            return None
+
+        key = self.key(url)
+        try:
+            self.backend.set(key, json.dumps(details).encode('utf-8'), self.ttl)
+            if self.seen is not None:
+                self.seen.add(key)
+        except Exception as e:
+            self.logger.error(f"Error caching job details: {str(e)}")
+        self.fetched += 1
+        return details
+
+    def submit(self, url):
+        """
+        Fetch a posting's details on the pool (once, however often it is asked for)
+
+        Fetches run outside the caller's deadline: they outlive the request that
+        started them and end up in the cache either way.
+        """
+        key = canonical_job_url(url)
+        with self._lock:
+            future = self._pending.get(key)
+            if future is not None:
+                return future
+            future = self._executor.submit(self.fetch, url)
+            self._pending[key] = future
+        future.add_done_callback(lambda _: self._forget(key))
+        return future
+
+    def _forget(self, key):
+        with self._lock:
+            self._pending.pop(key, None)
+
+    def prefetch(self, jobs):
+        """Start fetching the details of every job in the background"""
+        for job in jobs:
+            if job.get('url'):
+                self.submit(job['url'])
+
+    def enrich(self, jobs, timeout=None):
+        """
+        Jobs with their full description, fetched in parallel
+
+        Jobs whose details aren't in within the timeout (or the request's
+        deadline) keep their search snippet; their fetches carry on in the
+        background and land in the cache.
+
+        Args:
+            jobs (list): Job dictionaries
+            timeout (float): Seconds to wait for the details
+
+        Returns:
+            list: Job dictionaries (copies) with 'description' and the section fields filled in
+        """
+        futures = {id(job): self.submit(job['url']) for job in jobs if job.get('url')}
+        wait(futures.values(), timeout=time_left(timeout))
+        enriched = []
+        for job in jobs:
+            future = futures.get(id(job))
+            details = future.result() if future is not None and future.done() else None
+            enriched.append(self.merge(job, details) if details else job)
+        return enriched
+
+    @staticmethod
+    def merge(job, details):
+        """Job dictionary with its details filled in"""
+        enriched = dict(job, **{name: text for name, text in details.items() if text})
+        enriched['snippet'] = job.get('description')
+        return enriched
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        with self._lock:
+            pending = len(self._pending)
+        return {'workers': self.max_workers, 'pending': pending, 'fetched': self.fetched, 'failed': self.failed}
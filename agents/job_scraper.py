@@ -1,14 +1,379 @@
 import logging
 import requests
-from bs4 import BeautifulSoup
 import json
 import time
 import random
-from datetime import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import datetime, timedelta
+from agents.dedup import DedupIndex, canonical_job_url
+from agents.search_cache import SearchCache, MemoryBackend, HighWaterMarks
+from agents.single_flight import SingleFlight
+from agents.selector_plan import SelectorPlan
+from agents.parser_backends import make_soup, full_parser, resolve_backend
+from agents.card_text import CardLineIndex
+from agents.stream_parser import ResultCardStream
+from agents.rate_limiter import RateLimitTimeout, get_detail_rate_limiter, get_rate_limiter
+from agents.circuit_breaker import CircuitBreaker, CircuitBreakerAdapter, CircuitOpenError, get_circuit_breakers
+from agents.job_store import JobStore
+from agents.seen_urls import SeenURLFilter
+from agents.job_details import JobDetailFetcher
+from agents.deadline import DeadlineExceeded, deadline_expired, request_timeout, submit_in_context, time_left
+
+# Scraper settings come from the config module when available
+try:
+    from config.config import SCRAPER_CONFIG
+except ImportError:
+    SCRAPER_CONFIG = {}
+
+# Path segment of the made-up URLs of sample jobs
+SAMPLE_URL_MARKER = '/sample/'
+
+# Browser-like headers sent with every USAJobs request
+USAJOBS_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'DNT': '1',
+    'Sec-Fetch-Dest': 'document',
+    'Sec-Fetch-Mode': 'navigate',
+    'Sec-Fetch-Site': 'none',
+    'Sec-Fetch-User': '?1'
+}
+
+class USAJobsAPIAdapter:
+    """
+    Job source backed by the USAJobs JSON Search API
+    
+    Returns the same job dictionaries as the HTML scraper, a whole page of up to
+    500 records per request, without any HTML parsing.
+    """
+    
+    # PositionScheduleTypeCode values understood by the API
+    SCHEDULE_CODES = {'full-time': '1', 'part-time': '2'}
+    
+    def __init__(self, session, api_key, email, url=None, results_per_page=None, rate_limiter=None):
+        self.logger = logging.getLogger(__name__)
+        self.session = session
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.url = url or SCRAPER_CONFIG.get('USAJOBS_API_URL', 'https://data.usajobs.gov/api/search')
+        self.results_per_page = min(results_per_page or SCRAPER_CONFIG.get('API_RESULTS_PER_PAGE', 500), 500)
+        # The API identifies callers by the registered email in User-Agent
+        self.headers = {
+            'User-Agent': email,
+            'Authorization-Key': api_key,
+            'Accept': 'application/json'
+        }
+        
+    @classmethod
+    def from_config(cls, session, rate_limiter=None):
+        """Adapter built from the configured credentials, or None when they are missing"""
+        api_key = SCRAPER_CONFIG.get('USAJOBS_API_KEY')
+        email = SCRAPER_CONFIG.get('USAJOBS_API_EMAIL')
+        if not (api_key and email):
+            return None
+        return cls(session, api_key, email, rate_limiter=rate_limiter)
+        
+    def build_params(self, keywords, location, job_type="full-time", page=1):
+        """Query parameters of one API page"""
+        params = {'ResultsPerPage': self.results_per_page, 'Page': page, 'SortField': 'opendate',
+                  'SortDirection': 'desc'}
+        if keywords:
+            params['Keyword'] = keywords
+        if location:
+            params['LocationName'] = location
+        if job_type in self.SCHEDULE_CODES:
+            params['PositionScheduleTypeCode'] = self.SCHEDULE_CODES[job_type]
+        elif job_type == "internship":
+            params['HiringPath'] = 'student'
+        return params
+        
+    def fetch_page(self, keywords, location, job_type="full-time", page=1, max_retries=3):
+        """
+        Fetch one page of API results
+        
+        Args:
+            keywords (str): Job title, keywords, or agency name
+            location (str): City, state, ZIP, or country
+            job_type (str): Type of job (full-time, part-time, etc.)
+            page (int): Page number, starting at 1
+            max_retries (int): Attempts before giving up
+            
+        Returns:
+            list: List of job dictionaries (empty on failure or past the last page)
+        """
+        params = self.build_params(keywords, location, job_type, page)
+        self.logger.info(f"Querying USAJobs API - Keywords: {keywords}, Location: {location}, Page: {page}")
+        
+        for retry in range(max_retries):
+            try:
+                response = self.session.get(self.url, params=params, headers=self.headers, timeout=request_timeout(15))
+                if response.status_code == 200:
+                    items = response.json().get('SearchResult', {}).get('SearchResultItems', [])
+                    job_listings = [self.to_job(item.get('MatchedObjectDescriptor', {})) for item in items]
+                    self.logger.info(f"Got {len(job_listings)} jobs from the USAJobs API")
+                    return job_listings
+                self.logger.error(f"Error querying USAJobs API: Status code {response.status_code}")
+            except (RateLimitTimeout, CircuitOpenError, DeadlineExceeded) as e:
+                self.logger.warning(f"USAJobs API request not sent: {str(e)}")
+                return []
+            except (requests.RequestException, ValueError) as e:
+                self.logger.error(f"USAJobs API error: {str(e)}")
+                
+            if retry < max_retries - 1:
+                wait_time = (retry + 1) * 2  # Exponential backoff
+                self.logger.info(f"Retrying in {wait_time} seconds...")
+                # Every caller holds off the API, not just this thread
+                self.rate_limiter.backoff(self.rate_limiter.host_key(self.url), wait_time)
+        return []
+        
+    def to_job(self, record):
+        """
+        Map an API MatchedObjectDescriptor to the scraper's job dictionary
+        
+        Args:
+            record (dict): One search result record
+            
+        Returns:
+            dict: Job dictionary
+        """
+        company = record.get('OrganizationName') or record.get('DepartmentName') or "U.S. Government"
+        
+        location = record.get('PositionLocationDisplay')
+        if not location:
+            names = [loc.get('LocationName') for loc in record.get('PositionLocation', []) if loc.get('LocationName')]
+            location = '; '.join(names) or "Various Locations"
+            
+        details = record.get('UserArea', {}).get('Details', {})
+        description = details.get('JobSummary') or record.get('QualificationSummary') or "Position at " + company
+        description = ' '.join(description.split())
+        if len(description) > 500:  # Truncate very long descriptions, like the HTML scraper
+            description = description[:497] + "..."
+            
+        salary = "Salary not specified"
+        remuneration = record.get('PositionRemuneration') or []
+        if remuneration:
+            pay = remuneration[0]
+            try:
+                low = f"${float(pay.get('MinimumRange')):,.0f}"
+                high = f"${float(pay.get('MaximumRange')):,.0f}"
+                interval = (pay.get('Description') or '').lower()
+                salary = f"{low} - {high} {interval}".strip()
+            except (TypeError, ValueError):
+                pass
+                
+        try:
+            date_posted = datetime.fromisoformat(record.get('PublicationStartDate') or '')
+        except (TypeError, ValueError):
+            date_posted = datetime.utcnow()
+            
+        return {
+            'title': ' '.join((record.get('PositionTitle') or "Untitled Position").split()),
+            'company': ' '.join(company.split()),
+            'location': ' '.join(location.split()),
+            'description': description,
+            'salary': salary,
+            'url': record.get('PositionURI') or "https://www.usajobs.gov/Search/Results",
+            'source': 'USAJobs.gov',
+            'date_posted': date_posted
+        }
 
 class JobScraperAgent:
-    def __init__(self):
+    # USAJobs search results page
+    SEARCH_URL = "https://www.usajobs.gov/Search/Results"
+
+    # Job card containers, most specific first. USAJobs has changed its class
+    # names over time, so the cascade also covers older and generic layouts
+    CONTAINER_SELECTORS = [
+        # Standard USAJobs selectors (historical)
+        '.usajobs-search-result--core, .usajobs-search-result, article.usajobs-search-result',
+        # Common job result containers
+        'div.job-search-result, div[data-job-id], div[data-search-result-item]',
+        # Sections that could be job listings
+        'section.usajobs-search-result-card',
+        # Recent USAJobs selectors
+        '.usajobs-search-result-card',
+        # Table rows that might contain jobs
+        'table.usajobs-search-results-table tr.usajobs-search-result-row',
+        # Very generic job-like containers
+        'div.job-listing, div.vacancy-listing, div.position-listing',
+        # List items that might be jobs
+        'ul.search-results li, ul.job-list li'
+    ]
+
+    # Last-resort result containers, tried after every selector above on every page
+    # (never remembered as the page's container selector). Substring matches also
+    # catch the wrappers around the cards, so one page that needs them must not
+    # make them the first choice for the next
+    CONTAINER_GENERIC_SELECTORS = [
+        # USAJobs v3 class patterns
+        'div[class*="search-result"], div[class*="job-result"]',
+        # Any div with an ID pattern that looks like a job listing
+        'div[id*="job-"], div[id*="position-"], div[id*="vacancy-"]',
+        # Generic article tags
+        'article',
+        # Absolutely last resort - any div with content that suggests it's a job
+        'div:has(h3), div:has(span.position-title)'
+    ]
+
+    # Job title link inside a card
+    TITLE_SELECTORS = [
+        '.usajobs-search-result__title a',
+        'h3.usajobs-search-result__title a',
+        'h3 a',
+        'a[data-test="job-title"]',
+        'a.usa-link',
+        '.position-title',
+        'h3.job-title a',
+        '.job-title a',
+        'span[class*="title"]',
+        'div[class*="title"] a',
+        'a[href*="job-announcement"]',
+        'a[href*="vacancy"]',
+        'a[href*="job-details"]',
+        'a[title*="job"]',
+        'a.title'
+    ]
+
+    # Last-resort title elements, tried after every selector above on every card
+    TITLE_GENERIC_SELECTORS = [
+        'h3',
+        'h4'
+    ]
+
+    # Company/agency inside a card
+    AGENCY_SELECTORS = [
+        '.usajobs-search-result__department',
+        '.agency',
+        '.department',
+        '[data-test="agency-name"]',
+        'div.usajobs-search-result__header span',
+        '.agency-name',
+        '.company',
+        '.organization',
+        'span[class*="agency"]',
+        'span[class*="department"]',
+        'div[class*="agency"]',
+        'div[class*="employer"]'
+    ]
+
+    # Location inside a card
+    LOCATION_SELECTORS = [
+        '.usajobs-search-result__location',
+        '.location',
+        '[data-test="location"]',
+        'div[itemprop="jobLocation"]',
+        '.job-location',
+        'span[class*="location"]',
+        'div[class*="location"]',
+        'span.location-text',
+        'p[class*="location"]'
+    ]
+
+    # Description inside a card
+    DESCRIPTION_SELECTORS = [
+        '.usajobs-search-result__body',
+        '.summary',
+        '[data-test="job-description"]',
+        'div[itemprop="description"]',
+        'p.usa-prose',
+        '.job-description',
+        '.vacancy-description',
+        'p[class*="description"]',
+        'div[class*="description"]',
+        'span[class*="description"]'
+    ]
+
+    # Salary inside a card
+    SALARY_SELECTORS = [
+        '.usajobs-search-result__salary',
+        '.salary',
+        '[data-test="salary"]',
+        'div[itemprop="baseSalary"]',
+        'div.salary',
+        'span[class*="salary"]',
+        'div[class*="salary"]',
+        'span[class*="pay"]',
+        'div[class*="pay"]',
+        'span[class*="compensation"]'
+    ]
+
+    def __init__(self, session=None, pool_size=None, cache=None, parser=None, rate_limiter=None, breakers=None,
+                 detail_rate_limiter=None):
         self.logger = logging.getLogger(__name__)
+        self.pool_size = pool_size or SCRAPER_CONFIG.get('POOL_SIZE', 10)
+        # Per-host request budget, shared by every scraper in the process (and
+        # across processes with a shared backend)
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        # Per-host circuit breakers, so a failing upstream is given up on quickly
+        self.breakers = breakers or get_circuit_breakers()
+        # One pooled session per agent, shared by every thread that uses the agent
+        self.session = session or self.create_session(self.pool_size, self.rate_limiter, self.breakers)
+        # Results of recent searches, keyed by the normalized query
+        self.cache = cache or SearchCache()
+        # Concurrent identical searches share one upstream fetch
+        self.single_flight = SingleFlight()
+        # Stale searches currently being refreshed in the background
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+        self.lease_ttl = SCRAPER_CONFIG.get('LEASE_TTL', 30)
+        # Newest posting seen per search, so refreshes only read what is new
+        self.high_water_marks = HighWaterMarks(self.cache.backend)
+        self.incremental = SCRAPER_CONFIG.get('INCREMENTAL_REFRESH', True)
+        # Postings seen so far, to merge copies across searches, cascade steps and sources
+        self.dedup = DedupIndex()
+        # Bloom filter of URLs (and posting versions) already fetched or saved, kept on disk
+        self.seen_urls = SeenURLFilter()
+        # Database engines the filter has been checked against (see _check_seen_urls)
+        self._seen_urls_checked = set()
+        # Full announcement text, fetched on a small pool and cached by URL. Detail fetches
+        # go through their own session and lower rate, so searches keep their budget
+        detail_workers = SCRAPER_CONFIG.get('DETAIL_WORKERS', 4)
+        self.detail_session = self.create_session(detail_workers, detail_rate_limiter or get_detail_rate_limiter(),
+                                                  self.breakers)
+        self.details = JobDetailFetcher(self.detail_session, seen=self.seen_urls, max_workers=detail_workers)
+        self.enrich_details = SCRAPER_CONFIG.get('ENRICH_DETAILS', False)
+        # JSON Search API, used instead of the result pages when credentials are configured
+        self.api = USAJobsAPIAdapter.from_config(self.session, self.rate_limiter)
+        # HTML parser backend used for search result pages
+        self.parser = resolve_backend(parser or SCRAPER_CONFIG.get('PARSER_BACKEND'))
+        # Selector cascades that remember which selector matched the last card
+        self.selector_plans = {
+            'container': SelectorPlan('container', self.CONTAINER_SELECTORS, self.CONTAINER_GENERIC_SELECTORS),
+            'title': SelectorPlan('title', self.TITLE_SELECTORS, self.TITLE_GENERIC_SELECTORS),
+            'agency': SelectorPlan('agency', self.AGENCY_SELECTORS),
+            'location': SelectorPlan('location', self.LOCATION_SELECTORS),
+            'description': SelectorPlan('description', self.DESCRIPTION_SELECTORS),
+            'salary': SelectorPlan('salary', self.SALARY_SELECTORS)
+        }
+
+    @staticmethod
+    def create_session(pool_size=10, rate_limiter=None, breakers=None):
+        """
+        Build a keep-alive HTTP session with a bounded connection pool
+        
+        Args:
+            pool_size (int): Maximum connections kept open per host
+            rate_limiter (RateLimiter): Limiter every request waits on (defaults to the shared one)
+            breakers (CircuitBreakerRegistry): Per-host circuit breakers (defaults to the shared ones)
+            
+        Returns:
+            requests.Session: Session with the USAJobs headers pre-set
+        """
+        session = requests.Session()
+        adapter = CircuitBreakerAdapter(rate_limiter or get_rate_limiter(), breakers or get_circuit_breakers(),
+                                        pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update(USAJOBS_HEADERS)
+        return session
+
+    def close(self):
+        """Close the pooled connections held by this agent"""
+        self.session.close()
+        self.detail_session.close()
 
     def get_sample_jobs(self):
         """Return sample jobs without database dependencies"""
@@ -98,6 +463,10 @@ class JobScraperAgent:
             }
         ]
         
+        # Marked so they are never saved as real postings
+        for job in sample_jobs:
+            job['sample'] = True
+        
         self.logger.info(f"Returning {len(sample_jobs)} sample jobs")
         return sample_jobs
         
@@ -140,6 +509,9 @@ class JobScraperAgent:
         """
         Scrape jobs from USAJobs.gov using their search API
         
+        Recent results are served from the search cache; only non-empty results
+        are cached so a failed fetch is retried on the next request.
+        
         Args:
             keywords (str): Job title, keywords, or agency name
             location (str): City, state, ZIP, or country
@@ -148,48 +520,350 @@ class JobScraperAgent:
         Returns:
             list: List of job dictionaries
         """
-        self.logger.info(f"Scraping USAJobs - Keywords: {keywords}, Location: {location}, Type: {job_type}")
+        return self.search_usajobs(keywords, location, job_type)[0]
         
-        try:
-            # Format search parameters (ensure not None)
-            keyword_param = keywords.replace(" ", "+") if keywords else ""
-            location_param = location.replace(" ", "+") if location else ""
+    def search_usajobs(self, keywords, location, job_type="full-time"):
+        """
+        Scrape jobs from USAJobs.gov and report how fresh the results are
+        
+        Cached results past the soft TTL are returned immediately and refreshed
+        in a background thread. USAJobs is only called synchronously when the
+        search isn't cached at all (or is past the hard TTL).
+        
+        Args:
+            keywords (str): Job title, keywords, or agency name
+            location (str): City, state, ZIP, or country
+            job_type (str): Type of job (full-time, part-time, etc.)
             
-            # Base URL for USA Jobs search
-            base_url = "https://www.usajobs.gov/Search/Results"
+        Returns:
+            tuple: (list of job dictionaries, freshness dict with 'status'
+                   ('live', 'fresh' or 'stale'), 'age' in seconds, 'updated_at'
+                   and 'refreshing')
+        """
+        entry = self.cache.get_entry(keywords, location, job_type)
+        if entry is not None:
+            cached_jobs, age = entry
+            self.logger.info(f"Using cached USAJobs results ({int(age)}s old) - Keywords: {keywords}, Location: {location}, Type: {job_type}")
+            refreshing = False
+            if self.cache.is_stale(age):
+                refreshing = self.refresh_in_background(keywords, location, job_type)
+            return cached_jobs, self._freshness('stale' if self.cache.is_stale(age) else 'fresh', age, refreshing)
             
-            # Construct search URL - using their URL pattern
-            search_url = f"{base_url}?k={keyword_param}"
+        # Threads asking for the same search while it is being fetched wait for that
+        # fetch, for as long as their own deadline allows
+        try:
+            job_listings = self.single_flight.do(
+                self.cache.key(keywords, location, job_type),
+                lambda: self._fetch_and_cache(keywords, location, job_type)
+            )
+        except DeadlineExceeded as e:
+            self.logger.warning(f"USAJobs search not finished in time: {str(e)}")
+            job_listings = []
+        # Every caller gets its own copies of the shared result
+        return [dict(job) for job in job_listings], self._freshness('live', 0.0, False)
+        
+    def _freshness(self, status, age, refreshing):
+        return {
+            'status': status,
+            'age': int(age),
+            'updated_at': datetime.utcnow() - timedelta(seconds=age),
+            'refreshing': refreshing
+        }
+        
+    def refresh_in_background(self, keywords, location, job_type="full-time"):
+        """
+        Re-fetch a cached search on a background thread
+        
+        Returns:
+            bool: True if a refresh was started, False if one is already running
+        """
+        key = self.cache.key(keywords, location, job_type)
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return True
+            self._refreshing.add(key)
             
-            # Only add location if provided
-            if location_param:
-                search_url += f"&l={location_param}"
+        def refresh():
+            try:
+                self.refresh_search(keywords, location, job_type)
+            except Exception as e:
+                self.logger.error(f"Error refreshing cached search: {str(e)}")
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(key)
+                    
+        threading.Thread(target=refresh, name='search-refresh', daemon=True).start()
+        return True
+        
+    def refresh_search(self, keywords, location, job_type="full-time"):
+        """
+        Re-fetch a search from upstream and cache it, whatever is cached now
+        
+        Returns:
+            list: Fresh job dictionaries (empty if another worker is already refreshing)
+        """
+        return self.single_flight.do(
+            self.cache.key(keywords, location, job_type),
+            lambda: self._fetch_and_cache(keywords, location, job_type, refresh=True)
+        )
+        
+    def _fetch_and_cache(self, keywords, location, job_type, refresh=False):
+        """
+        Fetch a search once across processes sharing the cache backend, then cache it
+        
+        A refresh skips the cached copy and gives up if another worker holds the lease.
+        """
+        # With a shared backend, only the worker holding the lease goes upstream;
+        # the others poll until its result is cached or the lease is given up
+        shared = not isinstance(self.cache.backend, MemoryBackend)
+        while shared and not self.cache.acquire_lease(keywords, location, job_type, self.lease_ttl):
+            if refresh or deadline_expired():
+                return []
+            cached_jobs = self.cache.peek(keywords, location, job_type)
+            if cached_jobs is not None:
+                return cached_jobs
+            time.sleep(0.2)
+            
+        try:
+            # The cache may have been filled just before this caller took over
+            cached_jobs = None if refresh else self.cache.peek(keywords, location, job_type)
+            if cached_jobs is not None:
+                return cached_jobs
                 
-            # Add sorting parameter to get newest jobs first
-            search_url += "&sd=desc"
-            
-            # Add job type parameter if specified
-            if job_type and job_type != "all":
-                if job_type == "full-time":
-                    search_url += "&ft=1"  # Full-time parameter
-                elif job_type == "part-time":
-                    search_url += "&ft=2"  # Part-time parameter
-                elif job_type == "internship":
-                    search_url += "&hp=student"  # Student/internship parameter
-            
-            # Make request with different user agent (mimicking a regular browser more effectively)
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.9',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-                'DNT': '1',
-                'Sec-Fetch-Dest': 'document',
-                'Sec-Fetch-Mode': 'navigate',
-                'Sec-Fetch-Site': 'none',
-                'Sec-Fetch-User': '?1'
-            }
+            if refresh and self.incremental:
+                return self.cache_search(keywords, location, job_type,
+                                         self.refresh_incrementally(keywords, location, job_type))
+            job_listings = self.fetch_usajobs(keywords, location, job_type)
+            return self.cache_search(keywords, location, job_type, job_listings, advance_mark=True)
+        finally:
+            if shared:
+                self.cache.release_lease(keywords, location, job_type)
+        
+    def cache_search(self, keywords, location, job_type, job_listings, advance_mark=False):
+        """
+        Deduplicate a freshly fetched search and cache it
+        
+        Every fetch path (sync, incremental, async) stores its results through here.
+        
+        Args:
+            keywords (str): Job title, keywords, or agency name
+            location (str): City, state, ZIP, or country
+            job_type (str): Type of job (full-time, part-time, etc.)
+            job_listings (list): Fetched job dictionaries, newest first
+            advance_mark (bool): Also mark the newest posting as seen (full fetches)
+            
+        Returns:
+            list: The deduplicated job dictionaries (empty if nothing was fetched)
+        """
+        if not job_listings:
+            return job_listings
+        if advance_mark:
+            self.advance_high_water_mark(keywords, location, job_type, job_listings[0])
+        job_listings = self.dedup.dedupe(job_listings)
+        self.cache.set(keywords, location, job_type, job_listings)
+        if self.enrich_details:
+            self.details.prefetch(job_listings)
+        return job_listings
+        
+    def refresh_incrementally(self, keywords, location, job_type="full-time"):
+        """
+        Bring a cached search up to date by fetching only its new postings
+        
+        The new postings are put in front of the cached ones, keeping the result
+        as long as it was. Searches without a cached copy or a high-water mark,
+        and searches whose mark is no longer within reach, are fetched in full.
+        
+        Returns:
+            list: Up-to-date job dictionaries, newest first (empty on failure)
+        """
+        cached_jobs = self.cache.peek(keywords, location, job_type)
+        if cached_jobs is None or self.high_water_marks.get(keywords, location, job_type) is None:
+            job_listings = self.fetch_usajobs(keywords, location, job_type)
+            if job_listings:
+                self.advance_high_water_mark(keywords, location, job_type, job_listings[0])
+            return job_listings
+        
+        try:
+            new_jobs, reached = self.crawl_new_usajobs(keywords, location, job_type)
+        except requests.RequestException as e:
+            # A page cut off part way can't be joined on the cached copy
+            self.logger.error(f"Incremental refresh failed, fetching in full: {str(e)}")
+            new_jobs, reached = [], False
+        if not new_jobs and not reached:
+            # Nothing readable upstream; the full fetch has its own retries and fallbacks
+            job_listings = self.fetch_usajobs(keywords, location, job_type)
+            if job_listings:
+                self.advance_high_water_mark(keywords, location, job_type, job_listings[0])
+            return job_listings
+        if not reached:
+            # Too much is new (or the marked posting was withdrawn): the cached copy can't be joined on
+            return new_jobs
+        
+        self.logger.info(f"Incremental refresh found {len(new_jobs)} new jobs - Keywords: {keywords}, Location: {location}")
+        new_urls = {canonical_job_url(job['url']) for job in new_jobs}
+        kept = [job for job in cached_jobs if canonical_job_url(job['url']) not in new_urls]
+        return (new_jobs + kept)[:max(len(cached_jobs), len(new_jobs))]
+        
+    def crawl_new_usajobs(self, keywords, location, job_type="full-time", max_pages=None):
+        """
+        Fetch only the postings added to a search since its high-water mark
+        
+        Results are read newest first, page by page, and reading stops at the first
+        posting at or below the mark (the marked URL, or one posted before the
+        marked date). On the result pages that also stops the download. The mark
+        then moves to the newest posting, once every page was read through.
+        
+        Args:
+            keywords (str): Job title, keywords, or agency name
+            location (str): City, state, ZIP, or country
+            job_type (str): Type of job (full-time, part-time, etc.)
+            max_pages (int): Most result pages to read before giving up on the mark
+            
+        Returns:
+            tuple: (new job dictionaries newest first, whether the mark was reached)
+            
+        Raises:
+            requests.RequestException: When a page fails part way (the mark is left as it was)
+        """
+        mark = self.high_water_marks.get(keywords, location, job_type)
+        max_pages = max_pages or SCRAPER_CONFIG.get('INCREMENTAL_MAX_PAGES', 5)
+        new_jobs = []
+        reached = False
+        
+        for page in range(1, max_pages + 1):
+            if self.api is not None:
+                page_jobs = iter(self.api.fetch_page(keywords, location, job_type, page))
+            else:
+                page_jobs = self.iter_usajobs_page(keywords, location, job_type, page)
+            page_empty = True
+            try:
+                for job in page_jobs:
+                    page_empty = False
+                    if mark is not None and self.below_high_water_mark(job, mark):
+                        reached = True
+                        break
+                    new_jobs.append(job)
+            except requests.RequestException as e:
+                self.logger.error(f"Error reading USAJobs page {page}: {str(e)}")
+                raise
+            finally:
+                # Stops reading the rest of the response
+                if hasattr(page_jobs, 'close'):
+                    page_jobs.close()
+            if reached or page_empty:
+                break
+        
+        if new_jobs:
+            self.advance_high_water_mark(keywords, location, job_type, new_jobs[0])
+        return new_jobs, reached
+        
+    @staticmethod
+    def below_high_water_mark(job, mark):
+        """Whether a posting was already seen when the mark was set"""
+        if canonical_job_url(job['url']) == mark['url']:
+            return True
+        posted = job.get('date_posted')
+        return bool(mark.get('date_posted') and isinstance(posted, datetime) and posted < mark['date_posted'])
+        
+    def advance_high_water_mark(self, keywords, location, job_type, newest_job):
+        """Mark the newest posting of a search as seen"""
+        # Result page cards carry the time they were scraped rather than a posting
+        # date, so only API dates are worth comparing against
+        if not newest_job.get('url'):
+            return
+        date_posted = newest_job.get('date_posted') if self.api is not None else None
+        self.high_water_marks.set(keywords, location, job_type, canonical_job_url(newest_job['url']), date_posted)
+        
+    def crawl_usajobs(self, keywords, location, job_type="full-time", max_pages=None,
+                      max_results=None, time_budget=None):
+        """
+        Scrape several USAJobs result pages, fetching the pages after the first concurrently
+        
+        The first page goes through search_usajobs (and its cache). Later pages are
+        fetched in parallel over the pooled session and merged in page order, with
+        duplicate postings (by canonical URL) dropped. The crawl stops at the first
+        empty page, once max_results jobs are collected, or when the time budget
+        runs out, returning what it has so far.
+        
+        Args:
+            keywords (str): Job title, keywords, or agency name
+            location (str): City, state, ZIP, or country
+            job_type (str): Type of job (full-time, part-time, etc.)
+            max_pages (int): Most result pages to read
+            max_results (int): Stop after this many jobs (0 or None for no limit)
+            time_budget (float): Seconds the whole crawl may take
+            
+        Returns:
+            list: List of job dictionaries in result order
+        """
+        max_pages = max_pages or SCRAPER_CONFIG.get('MAX_PAGES', 1)
+        max_results = max_results if max_results is not None else SCRAPER_CONFIG.get('MAX_RESULTS', 0)
+        # A crawl never runs past the deadline of the request it serves
+        time_budget = time_left(time_budget or SCRAPER_CONFIG.get('CRAWL_TIME_BUDGET', 20))
+        deadline = time.monotonic() + time_budget
+        
+        job_listings = []
+        seen_urls = set()
+        
+        def merge(page_jobs):
+            """Add a page's new postings; True once enough jobs are collected"""
+            for job in page_jobs:
+                url = canonical_job_url(job['url'])
+                if url in seen_urls:
+                    continue
+                seen_urls.add(url)
+                job_listings.append(job)
+                if max_results and len(job_listings) >= max_results:
+                    return True
+            return False
+        
+        first_page, _ = self.search_usajobs(keywords, location, job_type)
+        if not first_page or merge(first_page) or max_pages <= 1:
+            return job_listings
+        
+        executor = ThreadPoolExecutor(max_workers=min(self.pool_size, max_pages - 1),
+                                      thread_name_prefix='usajobs-page')
+        try:
+            futures = [submit_in_context(executor, self.fetch_usajobs, keywords, location, job_type, page)
+                       for page in range(2, max_pages + 1)]
+            for page, future in enumerate(futures, start=2):
+                try:
+                    page_jobs = future.result(timeout=max(0, deadline - time.monotonic()))
+                except FutureTimeoutError:
+                    self.logger.info(f"Crawl time budget of {time_budget}s used up at page {page}")
+                    break
+                if not page_jobs:
+                    self.logger.info(f"Page {page} is empty, stopping the crawl")
+                    break
+                if merge(page_jobs):
+                    break
+        finally:
+            # Pages that aren't needed any more are never requested
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        self.logger.info(f"Crawled {len(job_listings)} unique jobs from USAJobs")
+        return job_listings
+        
+    def fetch_usajobs(self, keywords, location, job_type="full-time", page=1):
+        """
+        Fetch and parse a USAJobs search from upstream, bypassing the cache
+        
+        Args:
+            keywords (str): Job title, keywords, or agency name
+            location (str): City, state, ZIP, or country
+            job_type (str): Type of job (full-time, part-time, etc.)
+            page (int): Results page number, starting at 1
+            
+        Returns:
+            list: List of job dictionaries
+        """
+        if self.api is not None:
+            return self.api.fetch_page(keywords, location, job_type, page)
+            
+        self.logger.info(f"Scraping USAJobs - Keywords: {keywords}, Location: {location}, Type: {job_type}")
+        
+        try:
+            search_url = self.build_search_url(keywords, location, job_type, page)
             
             self.logger.info(f"Making request to USAJobs: {search_url}")
             
@@ -197,7 +871,8 @@ class JobScraperAgent:
             max_retries = 3
             for retry in range(max_retries):
                 try:
-                    response = requests.get(search_url, headers=headers, timeout=15)
+                    # Reuse pooled keep-alive connections (headers are set on the session)
+                    response = self.session.get(search_url, timeout=request_timeout(15))
                     
                     # Check response status
                     if response.status_code != 200:
@@ -205,7 +880,8 @@ class JobScraperAgent:
                         if retry < max_retries - 1:
                             wait_time = (retry + 1) * 2  # Exponential backoff
                             self.logger.info(f"Retrying in {wait_time} seconds...")
-                            time.sleep(wait_time)
+                            # Every caller holds off USAJobs, not just this thread
+                            self.rate_limiter.backoff(self.rate_limiter.host_key(search_url), wait_time)
                             continue
                         return []
                     
@@ -228,12 +904,15 @@ class JobScraperAgent:
                     # If successful, break retry loop
                     break
                     
+                except (RateLimitTimeout, CircuitOpenError, DeadlineExceeded) as e:
+                    self.logger.warning(f"USAJobs request not sent: {str(e)}")
+                    return []
                 except requests.RequestException as e:
                     self.logger.error(f"Request error: {str(e)}")
                     if retry < max_retries - 1:
                         wait_time = (retry + 1) * 2  # Exponential backoff
                         self.logger.info(f"Retrying in {wait_time} seconds...")
-                        time.sleep(wait_time)
+                        self.rate_limiter.backoff(self.rate_limiter.host_key(search_url), wait_time)
                     else:
                         return []
             
@@ -241,336 +920,477 @@ class JobScraperAgent:
             # with open('/tmp/usajobs_debug.html', 'w') as f:
             #     f.write(response.text)
                 
-            # Parse HTML content
-            soup = BeautifulSoup(response.text, 'html.parser')
+            return self.parse_search_results(response.text)
             
-            # Find job listings
-            job_listings = []
+        except Exception as e:
+            self.logger.error(f"Error scraping USAJobs: {str(e)}")
+            return []
             
-            # Try multiple selector patterns to find job listings
-            # USAJobs may have updated their class names, try different selectors
-            job_divs = []
-            
-            # Try a wide range of selectors to find jobs
-            selectors = [
-                # Standard USAJobs selectors (historical)
-                '.usajobs-search-result--core, .usajobs-search-result, article.usajobs-search-result',
-                # Generic article tags
-                'article',
-                # Common job result containers
-                'div.job-search-result, div[data-job-id], div[data-search-result-item]',
-                # Sections that could be job listings
-                'section.usajobs-search-result-card',
-                # Recent USAJobs selectors
-                '.usajobs-search-result-card',
-                # Table rows that might contain jobs
-                'table.usajobs-search-results-table tr.usajobs-search-result-row',
-                # Very generic job-like containers
-                'div.job-listing, div.vacancy-listing, div.position-listing',
-                # USAJobs v3 class patterns 
-                'div[class*="search-result"], div[class*="job-result"]',
-                # List items that might be jobs
-                'ul.search-results li, ul.job-list li',
-                # Any div with an ID pattern that looks like a job listing
-                'div[id*="job-"], div[id*="position-"], div[id*="vacancy-"]',
-                # Absolutely last resort - any div with content that suggests it's a job
-                'div:has(h3), div:has(span.position-title)'
-            ]
-            
-            # Try each selector in order
-            job_divs = []
-            for i, selector in enumerate(selectors):
-                job_divs = soup.select(selector)
-                self.logger.info(f"Selector {i+1}: Found {len(job_divs)} job divs with '{selector}'")
-                if job_divs:
-                    break
-                    
-            # If we still don't have results, look for any divs with job-like content
-            if not job_divs:
-                self.logger.info("Trying content-based detection for job listings")
-                # Look for job title elements
-                title_elements = soup.select('h3.job-title, h3[class*="title"], h4[class*="title"], span[class*="title"], h3 a, h4 a')
-                if title_elements:
-                    # Use parent elements of these title elements
-                    self.logger.info(f"Found {len(title_elements)} potential job title elements, using their parent containers")
-                    job_divs = [title.parent.parent for title in title_elements[:10]]  # Limit to first 10 to avoid weird matches
-            
-            for job_div in job_divs:
+    def stream_usajobs(self, keywords, location, job_type="full-time", chunk_size=16384):
+        """
+        Yield USAJobs results as each result card arrives, without waiting for the whole page
+
+        Cached searches are replayed from the cache. Otherwise the response body is
+        read in chunks and every card is parsed as soon as it closes; the complete
+        result is cached once the page has been read to the end. Errors before
+        the body arrives fall back to scrape_usajobs, with its retries.
+
+        Args:
+            keywords (str): Job title, keywords, or agency name
+            location (str): City, state, ZIP, or country
+            job_type (str): Type of job (full-time, part-time, etc.)
+            chunk_size (int): Bytes read from the socket at a time
+
+        Yields:
+            dict: Job dictionaries in page order
+        """
+        # API pages arrive as one JSON document; there is nothing to stream
+        if self.api is not None:
+            yield from self.scrape_usajobs(keywords, location, job_type)
+            return
+
+        cached_jobs = self.cache.get(keywords, location, job_type)
+        if cached_jobs is not None:
+            yield from cached_jobs
+            return
+
+        job_listings = []
+        try:
+            for job in self.iter_usajobs_page(keywords, location, job_type, chunk_size=chunk_size):
+                job_listings.append(job)
+                yield job
+        except requests.RequestException as e:
+            if job_listings:
+                raise
+            self.logger.error(f"Error streaming USAJobs: {str(e)}")
+            yield from self.scrape_usajobs(keywords, location, job_type)
+            return
+
+        if job_listings:
+            self.cache.set(keywords, location, job_type, self.dedup.dedupe(job_listings))
+            self.advance_high_water_mark(keywords, location, job_type, job_listings[0])
+
+    def iter_usajobs_page(self, keywords, location, job_type="full-time", page=1, chunk_size=16384):
+        """
+        Yield the jobs of one result page as each card arrives
+
+        Closing the generator early stops reading the response, so callers that
+        only need the top of the page never download the rest.
+
+        Raises:
+            requests.RequestException: When the page can't be fetched
+        """
+        search_url = self.build_search_url(keywords, location, job_type, page)
+        self.logger.info(f"Streaming USAJobs results: {search_url}")
+
+        response = self.session.get(search_url, timeout=request_timeout(15), stream=True)
+        with response:
+            if response.status_code != 200:
+                raise requests.HTTPError(f"Status code {response.status_code}", response=response)
+
+            # Servers that don't declare a charset are decoded as UTF-8
+            if not response.encoding:
+                response.encoding = 'utf-8'
+            chunks = response.iter_content(chunk_size=chunk_size, decode_unicode=True)
+            yield from self.iter_search_results(chunks)
+
+    def iter_search_results(self, chunks):
+        """
+        Parse a search results page incrementally
+
+        Args:
+            chunks (iterable): Pieces of the page HTML, in order
+
+        Yields:
+            dict: Job dictionaries, each as soon as its card has been read
+        """
+        stream = ResultCardStream()
+        found = 0
+
+        def parse_cards(cards):
+            for card_html in cards:
+                # Card fragments always start with the card itself
+                card = make_soup(card_html, 'strainer').find(True)
                 try:
-                    # Set of all possible title selectors to try
-                    title_selectors = [
-                        '.usajobs-search-result__title a', 
-                        'h3.usajobs-search-result__title a', 
-                        'h3 a', 
-                        'a[data-test="job-title"]', 
-                        'a.usa-link',
-                        '.position-title',
-                        'h3.job-title a',
-                        '.job-title a',
-                        'span[class*="title"]',
-                        'div[class*="title"] a',
-                        'h3', 
-                        'h4',
-                        'a[href*="job-announcement"]',
-                        'a[href*="vacancy"]',
-                        'a[href*="job-details"]',
-                        'a[title*="job"]',
-                        'a.title'
-                    ]
-                    
-                    # Try each title selector
-                    title_elem = None
-                    for selector in title_selectors:
-                        title_elem = job_div.select_one(selector)
-                        if title_elem:
-                            break
-                    
-                    # Company/agency selectors
-                    agency_selectors = [
-                        '.usajobs-search-result__department', 
-                        '.agency', 
-                        '.department',
-                        '[data-test="agency-name"]',
-                        'div.usajobs-search-result__header span',
-                        '.agency-name',
-                        '.company',
-                        '.organization',
-                        'span[class*="agency"]',
-                        'span[class*="department"]',
-                        'div[class*="agency"]',
-                        'div[class*="employer"]'
-                    ]
-                    
-                    # Try each agency selector
-                    company_elem = None
-                    for selector in agency_selectors:
-                        company_elem = job_div.select_one(selector)
-                        if company_elem:
-                            break
-                    
-                    # Location selectors
-                    location_selectors = [
-                        '.usajobs-search-result__location',
-                        '.location',
-                        '[data-test="location"]',
-                        'div[itemprop="jobLocation"]',
-                        '.job-location',
-                        'span[class*="location"]',
-                        'div[class*="location"]',
-                        'span.location-text',
-                        'p[class*="location"]'
-                    ]
-                    
-                    # Try each location selector
-                    location_elem = None
-                    for selector in location_selectors:
-                        location_elem = job_div.select_one(selector)
-                        if location_elem:
-                            break
-                    
-                    # Skip if we can't find a title 
-                    if not title_elem:
-                        self.logger.warning(f"Skipping job: unable to find title element")
-                        continue
-                        
-                    # Extract job title text, with fallback
-                    if hasattr(title_elem, 'text'):
-                        title = title_elem.text.strip()
-                    elif hasattr(title_elem, 'string') and title_elem.string:
-                        title = title_elem.string.strip()
-                    else:
-                        title = "Untitled Position"
-                        
-                    # Handle different URL formats
-                    if title_elem.has_attr('href'):
-                        href = title_elem['href']
-                        if href.startswith('http'):
-                            job_url = href
-                        elif href.startswith('//'):
-                            job_url = "https:" + href
-                        else:
-                            job_url = "https://www.usajobs.gov" + href
-                    else:
-                        # Look for any nearby link
-                        parent_links = job_div.select('a[href]')
-                        if parent_links:
-                            href = parent_links[0]['href']
-                            if href.startswith('http'):
-                                job_url = href
-                            elif href.startswith('//'):
-                                job_url = "https:" + href 
-                            else:
-                                job_url = "https://www.usajobs.gov" + href
-                        else:
-                            job_url = "https://www.usajobs.gov/Search/Results"
-                    
-                    # Get company/agency with aggressive text extraction
-                    if company_elem:
-                        if hasattr(company_elem, 'text'):
-                            company = company_elem.text.strip()
-                        else:
-                            company = str(company_elem).strip()
-                    else:
-                        # Try to find text that looks like an agency name
-                        all_text = job_div.get_text()
-                        agency_indicators = ["Department of", "Bureau of", "Office of", "Agency for", "U.S.", "Federal"]
-                        for line in all_text.split('\n'):
-                            line = line.strip()
-                            if any(indicator in line for indicator in agency_indicators) and len(line) < 100:
-                                company = line
-                                break
-                        else:
-                            company = "U.S. Government"
-                    
-                    # Remove excessive whitespace from company name
-                    company = ' '.join(company.split())
-                    
-                    # Get location with fallback to content analysis if not found
-                    if location_elem:
-                        if hasattr(location_elem, 'text'):
-                            location = location_elem.text.strip()
-                        else:
-                            location = str(location_elem).strip()
-                    else:
-                        # Try to find text that looks like a location
-                        all_text = job_div.get_text()
-                        location_candidates = []
-                        common_locations = ["Washington", "DC", "New York", "Virginia", "California", "Remote", "Telework"]
-                        for line in all_text.split('\n'):
-                            line = line.strip()
-                            if any(loc in line for loc in common_locations) and len(line) < 50:
-                                location_candidates.append(line)
-                        
-                        if location_candidates:
-                            location = location_candidates[0]
-                        else:
-                            location = "Various Locations"
-                    
-                    # Clean up location text
-                    location = ' '.join(location.split())
-                    
-                    # Description selectors
-                    description_selectors = [
-                        '.usajobs-search-result__body',
-                        '.summary',
-                        '[data-test="job-description"]',
-                        'div[itemprop="description"]',
-                        'p.usa-prose',
-                        '.job-description',
-                        '.vacancy-description',
-                        'p[class*="description"]',
-                        'div[class*="description"]',
-                        'span[class*="description"]'
-                    ]
-                    
-                    # Try each description selector
-                    description_elem = None
-                    for selector in description_selectors:
-                        description_elem = job_div.select_one(selector)
-                        if description_elem:
-                            break
-                            
-                    # Get description with aggressive fallback
-                    if description_elem:
-                        description = description_elem.text.strip()
-                    else:
-                        # Use all text from the job div, excluding title and company
-                        all_text = job_div.get_text()
-                        exclude_texts = [title, company, location]
-                        description_lines = []
-                        
-                        for line in all_text.split('\n'):
-                            line = line.strip()
-                            if line and not any(exclude in line for exclude in exclude_texts):
-                                description_lines.append(line)
-                                
-                        if description_lines:
-                            # Limit to a reasonable length
-                            description = ' '.join(description_lines[:5])
-                        else:
-                            description = "Position at " + company
-                            
-                    # Clean up description (remove excess whitespace)
-                    description = ' '.join(description.split())
-                    if len(description) > 500:  # Truncate very long descriptions
-                        description = description[:497] + "..."
-                    
-                    # Salary selectors
-                    salary_selectors = [
-                        '.usajobs-search-result__salary',
-                        '.salary',
-                        '[data-test="salary"]',
-                        'div[itemprop="baseSalary"]',
-                        'div.salary',
-                        'span[class*="salary"]',
-                        'div[class*="salary"]',
-                        'span[class*="pay"]',
-                        'div[class*="pay"]',
-                        'span[class*="compensation"]'
-                    ]
-                    
-                    # Try each salary selector
-                    salary_elem = None
-                    for selector in salary_selectors:
-                        salary_elem = job_div.select_one(selector)
-                        if salary_elem:
-                            break
-                            
-                    # Extract salary information
-                    if salary_elem:
-                        salary = salary_elem.text.strip()
-                    else:
-                        # Look for salary-like text (numbers with dollar signs or "per")
-                        all_text = job_div.get_text()
-                        salary_candidates = []
-                        for line in all_text.split('\n'):
-                            line = line.strip()
-                            if ('$' in line or ' per ' in line.lower()) and len(line) < 100:
-                                salary_candidates.append(line)
-                                
-                        if salary_candidates:
-                            salary = salary_candidates[0]
-                        else:
-                            salary = "Salary not specified"
-                            
-                    # Clean up salary text
-                    salary = ' '.join(salary.split())
-                    
-                    # Create job dictionary
-                    job = {
-                        'title': title,
-                        'company': company,
-                        'location': location,
-                        'description': description,
-                        'salary': salary,
-                        'url': job_url,
-                        'source': 'USAJobs.gov',
-                        'date_posted': datetime.utcnow()
-                    }
-                    
-                    job_listings.append(job)
-                    
+                    job = self.parse_job_card(card) if card else None
                 except Exception as e:
                     self.logger.error(f"Error parsing job listing: {str(e)}")
                     continue
+                if job:
+                    yield job
+
+        for chunk in chunks:
+            for job in parse_cards(stream.feed(chunk)):
+                found += 1
+                yield job
+        for job in parse_cards(stream.close()):
+            found += 1
+            yield job
+
+        # Pages in another layout have no result cards; parse the buffered page in full
+        if stream.buffered_page is not None:
+            self.logger.info("No result cards while streaming, parsing the whole page")
+            yield from self.parse_search_results(stream.buffered_page)
+        else:
+            self.logger.info(f"Streamed {found} jobs from USAJobs")
+
+    def invalidate_cache(self, keywords=None, location=None, job_type=None):
+        """Drop cached results for one search, or for every search when called without arguments"""
+        return self.cache.invalidate(keywords, location, job_type)
+        
+    def cache_stats(self):
+        """Hit/miss counters of the search result cache"""
+        return self.cache.stats()
+        
+    def upstream_host(self):
+        """Host USAJobs searches are sent to (the API when configured, else the result pages)"""
+        return self.rate_limiter.host_key(self.api.url if self.api is not None else self.SEARCH_URL)
+        
+    def circuit_open(self):
+        """Whether USAJobs requests are currently being refused by the circuit breaker"""
+        return self.breakers.get(self.upstream_host()).state == CircuitBreaker.OPEN
+        
+    def circuit_stats(self):
+        """Circuit breaker state of every upstream host contacted so far"""
+        return self.breakers.stats()
+        
+    def selector_stats(self):
+        """Hit/fallback counters of each selector plan used by the HTML parser"""
+        return {name: plan.stats() for name, plan in self.selector_plans.items()}
+        
+    def build_search_url(self, keywords, location, job_type="full-time", page=1):
+        """
+        Build the USAJobs search results URL for a query
+        
+        Args:
+            keywords (str): Job title, keywords, or agency name
+            location (str): City, state, ZIP, or country
+            job_type (str): Type of job (full-time, part-time, etc.)
+            page (int): Results page number, starting at 1
             
-            self.logger.info(f"Scraped {len(job_listings)} jobs from USAJobs")
-            return job_listings
+        Returns:
+            str: Search results URL
+        """
+        # Format search parameters (ensure not None)
+        keyword_param = keywords.replace(" ", "+") if keywords else ""
+        location_param = location.replace(" ", "+") if location else ""
+        
+        # Construct search URL - using their URL pattern
+        search_url = f"{self.SEARCH_URL}?k={keyword_param}"
+        
+        # Only add location if provided
+        if location_param:
+            search_url += f"&l={location_param}"
             
-        except Exception as e:
-            self.logger.error(f"Error scraping USAJobs: {str(e)}")
-            return []
+        # Add sorting parameter to get newest jobs first
+        search_url += "&sd=desc"
+        
+        # Add job type parameter if specified
+        if job_type and job_type != "all":
+            if job_type == "full-time":
+                search_url += "&ft=1"  # Full-time parameter
+            elif job_type == "part-time":
+                search_url += "&ft=2"  # Part-time parameter
+            elif job_type == "internship":
+                search_url += "&hp=student"  # Student/internship parameter
+        
+        # Later result pages
+        if page > 1:
+            search_url += f"&p={page}"
+        
+        return search_url
+        
+    def parse_search_results(self, html):
+        """
+        Parse a USAJobs search results page into job dictionaries
+        
+        Args:
+            html (str): Search results page HTML
             
-    def save_scraped_jobs(self, jobs):
+        Returns:
+            list: List of job dictionaries
+        """
+        # Parse HTML content with the configured backend
+        soup = make_soup(html, self.parser)
+        
+        # Find job listings
+        job_listings = []
+        
+        # Try the container selector that matched last time first, then the
+        # full cascade (USAJobs may have updated their class names)
+        container_plan = self.selector_plans['container']
+        job_divs = container_plan.select(soup)
+        
+        # The strainer only keeps USAJobs result cards; other layouts need the whole page
+        if not job_divs and self.parser == 'strainer':
+            soup = make_soup(html, full_parser(self.parser))
+            job_divs = container_plan.select(soup)
+        if job_divs:
+            self.logger.info(f"Found {len(job_divs)} job divs with '{container_plan.last_selector}'")
+                
+        # If we still don't have results, look for any divs with job-like content
+        if not job_divs:
+            self.logger.info("Trying content-based detection for job listings")
+            # Look for job title elements
+            title_elements = soup.select('h3.job-title, h3[class*="title"], h4[class*="title"], span[class*="title"], h3 a, h4 a')
+            if title_elements:
+                # Use parent elements of these title elements
+                self.logger.info(f"Found {len(title_elements)} potential job title elements, using their parent containers")
+                job_divs = [title.parent.parent for title in title_elements[:10]]  # Limit to first 10 to avoid weird matches
+        
+        for job_div in job_divs:
+            try:
+                job = self.parse_job_card(job_div)
+                if job:
+                    job_listings.append(job)
+                    
+            except Exception as e:
+                self.logger.error(f"Error parsing job listing: {str(e)}")
+                continue
+        
+        self.logger.info(f"Scraped {len(job_listings)} jobs from USAJobs")
+        return job_listings
+        
+    def parse_job_card(self, job_div):
         """
-        Save scraped jobs (simplified version that doesn't use database)
+        Extract one job dictionary from a result card
+        
+        Args:
+            job_div: BeautifulSoup element of the card
+            
+        Returns:
+            dict: Job dictionary, or None when the card has no title
+        """
+        # Try each title selector, starting with the last one that matched
+        title_elem = self.selector_plans['title'].select_one(job_div)
+        
+        # Try each agency selector, starting with the last one that matched
+        company_elem = self.selector_plans['agency'].select_one(job_div)
+        
+        # Try each location selector, starting with the last one that matched
+        location_elem = self.selector_plans['location'].select_one(job_div)
+        
+        # Skip if we can't find a title 
+        if not title_elem:
+            self.logger.warning(f"Skipping job: unable to find title element")
+            return None
+            
+        # Extract job title text, with fallback
+        if hasattr(title_elem, 'text'):
+            title = title_elem.text.strip()
+        elif hasattr(title_elem, 'string') and title_elem.string:
+            title = title_elem.string.strip()
+        else:
+            title = "Untitled Position"
+            
+        # Handle different URL formats
+        if title_elem.has_attr('href'):
+            href = title_elem['href']
+            if href.startswith('http'):
+                job_url = href
+            elif href.startswith('//'):
+                job_url = "https:" + href
+            else:
+                job_url = "https://www.usajobs.gov" + href
+        else:
+            # Look for any nearby link
+            parent_links = job_div.select('a[href]')
+            if parent_links:
+                href = parent_links[0]['href']
+                if href.startswith('http'):
+                    job_url = href
+                elif href.startswith('//'):
+                    job_url = "https:" + href 
+                else:
+                    job_url = "https://www.usajobs.gov" + href
+            else:
+                job_url = "https://www.usajobs.gov/Search/Results"
+        
+        # Card text for the fallback heuristics, split into lines at most once
+        card_text = CardLineIndex(job_div)
+        
+        # Get company/agency with aggressive text extraction
+        if company_elem:
+            if hasattr(company_elem, 'text'):
+                company = company_elem.text.strip()
+            else:
+                company = str(company_elem).strip()
+        else:
+            # Try to find text that looks like an agency name
+            company = card_text.agency() or "U.S. Government"
+        
+        # Remove excessive whitespace from company name
+        company = ' '.join(company.split())
+        
+        # Get location with fallback to content analysis if not found
+        if location_elem:
+            if hasattr(location_elem, 'text'):
+                location = location_elem.text.strip()
+            else:
+                location = str(location_elem).strip()
+        else:
+            # Try to find text that looks like a location
+            location = card_text.location() or "Various Locations"
+        
+        # Clean up location text
+        location = ' '.join(location.split())
+        
+        # Try each description selector, starting with the last one that matched
+        description_elem = self.selector_plans['description'].select_one(job_div)
+                
+        # Get description with aggressive fallback
+        if description_elem:
+            description = description_elem.text.strip()
+        else:
+            # Use all text from the job div, excluding title and company
+            # (limited to a reasonable length)
+            description_lines = card_text.description([title, company, location], limit=5)
+            if description_lines:
+                description = ' '.join(description_lines)
+            else:
+                description = "Position at " + company
+                
+        # Clean up description (remove excess whitespace)
+        description = ' '.join(description.split())
+        if len(description) > 500:  # Truncate very long descriptions
+            description = description[:497] + "..."
+        
+        # Try each salary selector, starting with the last one that matched
+        salary_elem = self.selector_plans['salary'].select_one(job_div)
+                
+        # Extract salary information
+        if salary_elem:
+            salary = salary_elem.text.strip()
+        else:
+            # Look for salary-like text (numbers with dollar signs or "per")
+            salary = card_text.salary() or "Salary not specified"
+                
+        # Clean up salary text
+        salary = ' '.join(salary.split())
+        
+        # Create job dictionary
+        job = {
+            'title': title,
+            'company': company,
+            'location': location,
+            'description': description,
+            'salary': salary,
+            'url': job_url,
+            'source': 'USAJobs.gov',
+            'date_posted': datetime.utcnow()
+        }
+        
+        return job
+            
+    def save_scraped_jobs(self, jobs, session=None, model=None):
+        """
+        Save scraped jobs to the job table
+        
+        Sample jobs are never saved. Copies of one posting are merged first, and
+        copies of postings seen in earlier searches are dropped. Jobs are upserted
+        on their canonical URL in batches of JOB_UPSERT_BATCH_SIZE, one transaction
+        per batch. Postings whose current version is in the seen-URL filter are
+        skipped, and rows whose content hasn't changed are left alone.
         
         Args:
             jobs (list): List of job dictionaries
+            session: SQLAlchemy session (defaults to the app's db.session)
+            model: Job model or table (defaults to models.Job)
+            
+        Returns:
+            dict: Number of jobs 'inserted', 'updated' and 'unchanged'
+        """
+        # Sample and fallback jobs have made-up URLs and don't belong in the table
+        jobs = [job for job in jobs if not job.get('sample')]
+        if not jobs:
+            return {'inserted': 0, 'updated': 0, 'unchanged': 0}
+        session, model = self._job_table(session, model)
+        store = JobStore(session, model)
+        self._check_seen_urls(store)
+        return store.upsert(self.dedup.dedupe(jobs), canonical_job_url, seen=self.seen_urls)
+        
+    def full_description(self, url, snippet="", timeout=None):
+        """
+        Full text of a job announcement, waiting a bounded time for it unless it is cached
+        
+        A fetch that isn't done within the timeout (or the request's deadline)
+        carries on in the background and lands in the cache, so a later call
+        finds it. Sample jobs (whose URLs are made up) are never fetched.
+        
+        Args:
+            url (str): Job posting URL
+            snippet (str): Description to fall back on if the page can't be read in time
+            timeout (float): Seconds to wait for the page (defaults to DETAIL_TIMEOUT)
             
         Returns:
-            int: Number of jobs saved
+            str: Duties, qualifications and the rest of the posting text, or the snippet
         """
-        # In the simplified version, we just log and return the count
-        self.logger.info(f"Would save {len(jobs)} jobs (database-free mode)")
-        return len(jobs)
\ No newline at end of file
+        if not url or not url.startswith(('http://', 'https://')) or SAMPLE_URL_MARKER in url:
+            return snippet
+        details = self.details.cached(url)
+        if details is None:
+            future = self.details.submit(url)
+            try:
+                details = future.result(timeout=time_left(timeout or SCRAPER_CONFIG.get('DETAIL_TIMEOUT', 10)))
+            except FutureTimeoutError:
+                self.logger.info(f"Job details from {url} not in yet, using the snippet")
+        return details.get('description') or snippet if details else snippet
+        
+    def prefetch_details(self, jobs):
+        """Start fetching the announcements of search results (sample jobs excepted) in the background"""
+        self.details.prefetch([job for job in jobs if not job.get('sample')])
+        
+    def enrich_jobs(self, jobs, timeout=None):
+        """
+        Jobs with their full announcement text, fetched in parallel
+        
+        Args:
+            jobs (list): Job dictionaries
+            timeout (float): Seconds to wait (jobs not enriched by then keep their snippet)
+            
+        Returns:
+            list: Enriched copies of the job dictionaries
+        """
+        return self.details.enrich(jobs, timeout or SCRAPER_CONFIG.get('DETAIL_TIMEOUT', 10))
+        
+    def rebuild_seen_urls(self, session=None, model=None):
+        """
+        Refill the seen-URL filter from the job table
+        
+        Args:
+            session: SQLAlchemy session (defaults to the app's db.session)
+            model: Job model or table (defaults to models.Job)
+            
+        Returns:
+            int: Keys added to the filter
+        """
+        session, model = self._job_table(session, model)
+        store = JobStore(session, model)
+        return self.seen_urls.rebuild(store.seen_keys((self.details.PREFIX,)), store.generation())
+        
+    def _check_seen_urls(self, store):
+        """
+        Rebuild the seen-URL filter if it was built from another database
+        
+        Checked once per database per agent; the filter file records the
+        generation it was built from, so a leftover file is caught at startup.
+        """
+        database = store.session.get_bind()
+        if database in self._seen_urls_checked:
+            return
+        generation = store.generation()
+        if self.seen_urls.generation != generation:
+            self.logger.info("Seen-URL filter is from another database, rebuilding it from the job table")
+            self.seen_urls.rebuild(store.seen_keys((self.details.PREFIX,)), generation)
+        self._seen_urls_checked.add(database)
+        
+    @staticmethod
+    def _job_table(session, model):
+        """Session and job model to use, defaulting to the app's"""
+        if session is None or model is None:
+            # Imported here: the app imports this module through its routes
+            from app import db
+            from models import Job
+            session = session or db.session
+            model = model or Job
+        return session, model
\ No newline at end of file
@@ -0,0 +1,227 @@
+import abc
+import html
+import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+
+from agents.job_scraper import JobScraperAgent, SCRAPER_CONFIG
+from agents.dedup import DedupIndex
+from agents.deadline import request_timeout, submit_in_context, time_left
+
+class JobSource(abc.ABC):
+    """
+    A place jobs can be searched
+
+    Subclasses implement fetch (one upstream request) and parse (raw payload to
+    job dictionaries in the scraper's schema); search chains the two. Each
+    source gets its own timeout and concurrency budget in the registry.
+    """
+
+    name = 'source'
+
+    def __init__(self, timeout=None, max_concurrency=None, enabled=True):
+        self.logger = logging.getLogger(__name__)
+        self.timeout = timeout or SCRAPER_CONFIG.get('SOURCE_TIMEOUT', 20)
+        self.max_concurrency = max_concurrency or SCRAPER_CONFIG.get('SOURCE_MAX_CONCURRENCY', 2)
+        self.enabled = enabled
+
+    @abc.abstractmethod
+    def fetch(self, keywords, location, job_type="full-time"):
+        """Fetch the raw search result from upstream"""
+
+    @abc.abstractmethod
+    def parse(self, raw, keywords="", location=""):
+        """Turn a raw search result into job dictionaries"""
+
+    def search(self, keywords, location, job_type="full-time"):
+        """
+        Search this source
+
+        Returns:
+            list: List of job dictionaries
+        """
+        return self.parse(self.fetch(keywords, location, job_type), keywords, location)
+
+class USAJobsSource(JobSource):
+    """USAJobs.gov through the shared scraper (result pages or the JSON API, with caching)"""
+
+    name = 'usajobs'
+
+    def __init__(self, scraper=None, **kwargs):
+        super().__init__(**kwargs)
+        self.scraper = scraper or JobScraperAgent()
+
+    def fetch(self, keywords, location, job_type="full-time"):
+        return self.scraper.scrape_usajobs(keywords, location, job_type)
+
+    def parse(self, raw, keywords="", location=""):
+        # The scraper already returns job dictionaries
+        return raw
+
+class GreenhouseSource(JobSource):
+    """
+    Public job board of a company hosted on Greenhouse
+
+    The board API returns every open posting at once, so keywords and location
+    are matched locally.
+    """
+
+    API_URL = "https://boards-api.greenhouse.io/v1/boards/{board}/jobs"
+
+    def __init__(self, board, company=None, session=None, **kwargs):
+        super().__init__(**kwargs)
+        self.board = board
+        self.company = company or board.replace('-', ' ').title()
+        self.name = f"greenhouse:{board}"
+        self.session = session or JobScraperAgent.create_session()
+
+    def fetch(self, keywords, location, job_type="full-time"):
+        response = self.session.get(self.API_URL.format(board=self.board),
+                                    params={'content': 'true'}, timeout=request_timeout(self.timeout))
+        response.raise_for_status()
+        return response.json()
+
+    def parse(self, raw, keywords="", location=""):
+        terms = keywords.lower().split()
+        job_listings = []
+        for posting in raw.get('jobs', []):
+            title = ' '.join((posting.get('title') or '').split())
+            place = ' '.join(((posting.get('location') or {}).get('name') or "Various Locations").split())
+            # content is escaped HTML; keep the text only
+            description = re.sub(r'<[^>]+>', ' ', html.unescape(posting.get('content') or ''))
+            description = ' '.join(description.split()) or "Position at " + self.company
+
+            if terms and not any(term in title.lower() or term in description.lower() for term in terms):
+                continue
+            if location and location.lower() not in place.lower():
+                continue
+
+            if len(description) > 500:
+                description = description[:497] + "..."
+            try:
+                date_posted = datetime.fromisoformat(posting.get('updated_at') or '').replace(tzinfo=None)
+            except (TypeError, ValueError):
+                date_posted = datetime.utcnow()
+
+            job_listings.append({
+                'title': title,
+                'company': self.company,
+                'location': place,
+                'description': description,
+                'salary': "Salary not specified",
+                'url': posting.get('absolute_url', ''),
+                'source': f"{self.company} Careers",
+                'date_posted': date_posted
+            })
+        return job_listings
+
+class SourceRegistry:
+    """Enabled job sources, searched concurrently"""
+
+    def __init__(self, dedup=None):
+        self.logger = logging.getLogger(__name__)
+        self.dedup = dedup or DedupIndex()
+        self._sources = {}
+        # One small pool per source, so a slow source only ever queues behind itself
+        self._executors = {}
+
+    def register(self, source):
+        """Add (or replace) a source"""
+        old = self._executors.pop(source.name, None)
+        if old is not None:
+            old.shutdown(wait=False)
+        self._sources[source.name] = source
+        self._executors[source.name] = ThreadPoolExecutor(max_workers=source.max_concurrency,
+                                                          thread_name_prefix=f"source-{source.name}")
+        return source
+
+    def get(self, name):
+        """Registered source by name, or None"""
+        return self._sources.get(name)
+
+    def enabled(self):
+        """Sources that take part in searches, in registration order"""
+        return [source for source in self._sources.values() if source.enabled]
+
+    def iter_search(self, keywords, location, job_type="full-time"):
+        """
+        Search every enabled source at once, yielding each source's jobs as it finishes
+
+        A source that fails or runs past its own timeout (or the request's deadline)
+        is skipped; waiting for it never delays the results of the other sources.
+
+        Yields:
+            tuple: (source name, list of job dictionaries) in completion order
+        """
+        start = time.monotonic()
+        pending = {}
+        for source in self.enabled():
+            future = submit_in_context(self._executors[source.name], source.search, keywords, location, job_type)
+            pending[future] = (source, start + time_left(source.timeout))
+
+        try:
+            while pending:
+                now = time.monotonic()
+                for future, (source, deadline) in list(pending.items()):
+                    if deadline <= now and not future.done():
+                        self.logger.warning(f"Source '{source.name}' timed out after {deadline - start:.1f}s")
+                        future.cancel()
+                        del pending[future]
+                if not pending:
+                    break
+
+                next_deadline = min(deadline for _, deadline in pending.values())
+                done, _ = wait(pending, timeout=max(0, next_deadline - time.monotonic()),
+                               return_when=FIRST_COMPLETED)
+                for future in done:
+                    source, _ = pending.pop(future)
+                    try:
+                        jobs = future.result()
+                    except Exception as e:
+                        self.logger.error(f"Source '{source.name}' failed: {str(e)}")
+                        continue
+                    self.logger.info(f"Source '{source.name}' returned {len(jobs)} jobs")
+                    yield source.name, jobs
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def search(self, keywords, location, job_type="full-time"):
+        """
+        Search every enabled source and merge the results
+
+        Results are merged in registration order, whichever source answers first,
+        so postings listed by more than one source (same canonical URL or
+        near-identical content) are always kept as the earlier source's copy.
+
+        Returns:
+            list: List of job dictionaries
+        """
+        results = dict(self.iter_search(keywords, location, job_type))
+        merged = []
+        for source in self.enabled():
+            merged.extend(results.get(source.name, []))
+        return self.dedup.dedupe(merged)
+
+    def shutdown(self):
+        """Stop every source pool and drop queued searches"""
+        for executor in self._executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+
+def create_source_registry(scraper=None):
+    """
+    Registry with USAJobs plus the Greenhouse boards listed in SCRAPER_CONFIG['GREENHOUSE_BOARDS']
+
+    Args:
+        scraper (JobScraperAgent): Scraper shared with the USAJobs source
+
+    Returns:
+        SourceRegistry: Registry of enabled sources
+    """
+    registry = SourceRegistry(dedup=scraper.dedup if scraper else None)
+    registry.register(USAJobsSource(scraper))
+    for board in SCRAPER_CONFIG.get('GREENHOUSE_BOARDS', []):
+        registry.register(GreenhouseSource(board, session=scraper.session if scraper else None))
+    return registry
@@ -0,0 +1,251 @@
+import hashlib
+import json
+import logging
+import time
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, Table, inspect, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects import postgresql, sqlite
+
+# Scraper settings come from the config module when available
+try:
+    from config.config import SCRAPER_CONFIG
+except ImportError:
+    SCRAPER_CONFIG = {}
+
+# Job columns filled from scraped job dictionaries, and their defaults
+JOB_FIELDS = {
+    'title': '',
+    'company': 'U.S. Government',
+    'description': '',
+    'location': None,
+    'url': '',
+    'source': None,
+    'applicants_count': None,
+    'contact_info': None
+}
+
+# Dialects with INSERT ... ON CONFLICT
+INSERT_BY_DIALECT = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert
+}
+
+def job_content_hash(row):
+    """
+    Fingerprint of the stored fields of a job, to tell changed postings from unchanged ones
+
+    date_posted is left out (result page cards carry the time they were scraped),
+    and so is the raw URL, whose tracking parameters change from scrape to scrape.
+    """
+    content = json.dumps([row[field] for field in JOB_FIELDS if field != 'url'], default=str)
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+# Columns added to the job table after its first release, with their DDL types
+UPSERT_COLUMNS = {'url_key': 'VARCHAR(500)', 'content_hash': 'VARCHAR(40)'}
+
+def upgrade_job_table(engine, table_name='job'):
+    """
+    Add the upsert columns to a job table created before they existed
+
+    db.create_all() never alters existing tables, so databases from before bulk
+    upserts lack url_key and content_hash. The unique constraint on url_key is
+    added as a unique index, which is what ON CONFLICT (url_key) needs and works
+    on both SQLite and PostgreSQL.
+
+    Args:
+        engine: SQLAlchemy engine of the app database
+        table_name (str): Name of the job table
+
+    Returns:
+        list: Names of the columns that were added
+    """
+    inspector = inspect(engine)
+    if not inspector.has_table(table_name):
+        return []
+    existing = {column['name'] for column in inspector.get_columns(table_name)}
+    added = [name for name in UPSERT_COLUMNS if name not in existing]
+    if not added:
+        return []
+    with engine.begin() as connection:
+        for name in added:
+            connection.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {name} {UPSERT_COLUMNS[name]}"))
+        if 'url_key' in added:
+            connection.execute(text(f"CREATE UNIQUE INDEX IF NOT EXISTS ix_{table_name}_url_key ON {table_name} (url_key)"))
+    logging.getLogger(__name__).info(f"Added columns {', '.join(added)} to the {table_name} table")
+    return added
+
+def generation_table(metadata):
+    """
+    Table holding the generation of the job table's database: a token made once per database
+
+    It is declared in the job table's metadata, so create_all()/drop_all() create
+    and drop it along with the job table, and a recreated database gets a new token.
+    """
+    if 'job_generation' in metadata.tables:
+        return metadata.tables['job_generation']
+    return Table('job_generation', metadata,
+                 Column('id', Integer, primary_key=True),
+                 Column('token', String(32), nullable=False))
+
+def version_key(url_key, content_hash):
+    """Seen-URL filter key of one version of a posting"""
+    return f"{url_key}#{content_hash}"
+
+class JobStore:
+    """
+    Writes scraped jobs to the job table in bulk
+
+    Jobs are keyed by their canonical URL (the url_key column). Each batch is
+    one transaction: a single SELECT of the stored fingerprints, then one
+    INSERT ... ON CONFLICT DO UPDATE for the whole batch that only rewrites
+    rows whose content changed.
+    """
+
+    def __init__(self, session, table, batch_size=None):
+        """
+        Args:
+            session: SQLAlchemy session (e.g. db.session)
+            table: Job table, or a model class with a __table__
+            batch_size (int): Jobs written per transaction
+        """
+        self.logger = logging.getLogger(__name__)
+        self.session = session
+        self.table = getattr(table, '__table__', table)
+        self.batch_size = batch_size or SCRAPER_CONFIG.get('JOB_UPSERT_BATCH_SIZE', 1000)
+
+    def insert(self):
+        """INSERT construct of the session's dialect"""
+        dialect = self.session.get_bind().dialect.name
+        if dialect not in INSERT_BY_DIALECT:
+            raise ValueError(f"Bulk upsert is not supported on {dialect} databases")
+        return INSERT_BY_DIALECT[dialect](self.table)
+
+    def upsert_statement(self):
+        """Upsert keyed on url_key that leaves unchanged rows alone"""
+        statement = self.insert()
+        excluded = statement.excluded
+        return statement.on_conflict_do_update(
+            index_elements=[self.table.c.url_key],
+            set_={field: excluded[field] for field in list(JOB_FIELDS) + ['content_hash']},
+            # Rows written before upgrade_job_table have no hash yet and are always updated
+            where=self.table.c.content_hash.is_distinct_from(excluded.content_hash)
+        )
+
+    def rows(self, jobs, canonical_url):
+        """
+        Table rows for scraped jobs, one per canonical URL (the first copy wins)
+
+        Near-duplicates of a posting seen earlier (duplicate_of set) are left out,
+        so a copy never overwrites the original's URL or source.
+        """
+        rows = {}
+        for job in jobs:
+            if not job.get('url') or job.get('duplicate_of'):
+                continue
+            url_key = canonical_url(job['url'])
+            if url_key in rows:
+                continue
+            row = {field: job.get(field) or default for field, default in JOB_FIELDS.items()}
+            row['url_key'] = url_key
+            row['content_hash'] = job_content_hash(row)
+            posted = job.get('date_posted')
+            row['date_posted'] = posted if isinstance(posted, datetime) else datetime.utcnow()
+            rows[url_key] = row
+        return list(rows.values())
+
+    def upsert(self, jobs, canonical_url, seen=None):
+        """
+        Insert new jobs and update changed ones
+
+        With a seen-URL filter, jobs whose current version was already written
+        are counted as unchanged without touching the database.
+
+        Args:
+            jobs (list): Job dictionaries
+            canonical_url (callable): Maps a job URL to its natural key
+            seen (SeenURLFilter): Filter of URLs and versions already written
+
+        Returns:
+            dict: Number of jobs 'inserted', 'updated' and 'unchanged'
+        """
+        counts = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+        rows = self.rows(jobs, canonical_url)
+        if seen is not None:
+            unseen = [row for row in rows if version_key(row['url_key'], row['content_hash']) not in seen]
+            counts['unchanged'] += len(rows) - len(unseen)
+            rows = unseen
+        statement = self.upsert_statement()
+        start = time.monotonic()
+
+        for offset in range(0, len(rows), self.batch_size):
+            batch = rows[offset:offset + self.batch_size]
+            try:
+                stored = dict(self.session.execute(
+                    select(self.table.c.url_key, self.table.c.content_hash)
+                    .where(self.table.c.url_key.in_([row['url_key'] for row in batch]))
+                ).all())
+                self.session.execute(statement, batch)
+                self.session.commit()
+            except Exception:
+                self.session.rollback()
+                raise
+            if seen is not None:
+                for row in batch:
+                    seen.add(row['url_key'])
+                    seen.add(version_key(row['url_key'], row['content_hash']))
+
+            for row in batch:
+                if row['url_key'] not in stored:
+                    counts['inserted'] += 1
+                elif stored[row['url_key']] != row['content_hash']:
+                    counts['updated'] += 1
+                else:
+                    counts['unchanged'] += 1
+
+        self.logger.info(f"Saved {len(rows)} jobs in {time.monotonic() - start:.3f}s: "
+                         f"{counts['inserted']} inserted, {counts['updated']} updated, {counts['unchanged']} unchanged")
+        return counts
+
+    def generation(self):
+        """
+        Generation token of the database, created on first use
+
+        Returns:
+            str: 32 hex characters, the same for every process using the database
+        """
+        table = generation_table(self.table.metadata)
+        table.create(self.session.get_bind(), checkfirst=True)
+        token = self.session.execute(select(table.c.token).where(table.c.id == 1)).scalar()
+        if token is not None:
+            return token
+        try:
+            self.session.execute(table.insert().values(id=1, token=uuid.uuid4().hex))
+            self.session.commit()
+        except IntegrityError:
+            # Another worker created it first
+            self.session.rollback()
+        return self.session.execute(select(table.c.token).where(table.c.id == 1)).scalar()
+
+    def seen_keys(self, url_prefixes=()):
+        """
+        Seen-URL filter keys of every stored job: its URL and its current version
+
+        Args:
+            url_prefixes (tuple): Prefixes whose keys are also added for every URL
+                (e.g. the job details cache's, so its entries aren't skipped after a rebuild)
+
+        Yields:
+            str: Filter keys, read from the table in batches
+        """
+        query = (select(self.table.c.url_key, self.table.c.content_hash)
+                 .where(self.table.c.url_key.is_not(None))
+                 .execution_options(yield_per=self.batch_size))
+        for url_key, content_hash in self.session.execute(query):
+            yield url_key
+            for prefix in url_prefixes:
+                yield prefix + url_key
+            if content_hash:
+                yield version_key(url_key, content_hash)
@@ -0,0 +1,74 @@
+import logging
+from bs4 import BeautifulSoup, SoupStrainer
+
+# lxml is optional; without it the scraper falls back to the pure-Python parser
+try:
+    import lxml  # noqa: F401
+except ImportError:
+    lxml = None
+
+logger = logging.getLogger(__name__)
+
+# Classes of the result cards on a USAJobs search results page
+RESULT_CARD_CLASSES = frozenset([
+    'usajobs-search-result',
+    'usajobs-search-result--core',
+    'usajobs-search-result-card'
+])
+
+def _is_result_card(class_value):
+    return class_value is not None and not RESULT_CARD_CLASSES.isdisjoint(class_value.split())
+
+# Only build the result cards (and everything inside them), skipping page chrome
+RESULT_CARDS = SoupStrainer(class_=_is_result_card)
+
+# Backends selectable with SCRAPER_CONFIG['PARSER_BACKEND']
+PARSER_BACKENDS = ('html.parser', 'lxml', 'strainer')
+
+def available_backends():
+    """Parser backends usable in this environment"""
+    return [name for name in PARSER_BACKENDS if name != 'lxml' or lxml is not None]
+
+def resolve_backend(name=None):
+    """
+    Validate a configured parser backend name
+
+    Args:
+        name (str): One of PARSER_BACKENDS (None means html.parser)
+
+    Returns:
+        str: The backend to use, html.parser when the requested one is unavailable
+    """
+    name = name or 'html.parser'
+    if name not in PARSER_BACKENDS:
+        logger.warning(f"Unknown parser backend '{name}', using html.parser")
+        return 'html.parser'
+    if name == 'lxml' and lxml is None:
+        logger.warning("lxml is not installed, using html.parser")
+        return 'html.parser'
+    return name
+
+def full_parser(backend):
+    """Tree builder that parses the whole document for a backend"""
+    if backend == 'strainer':
+        return 'lxml' if lxml is not None else 'html.parser'
+    return backend
+
+def make_soup(html, backend='html.parser'):
+    """
+    Parse HTML with the given backend
+
+    The strainer backend only builds the result cards, so the soup it returns is
+    empty for pages that don't use the USAJobs result layout; callers should
+    re-parse with full_parser(backend) in that case.
+
+    Args:
+        html (str): Page HTML
+        backend (str): One of PARSER_BACKENDS
+
+    Returns:
+        BeautifulSoup: Parsed document
+    """
+    if backend == 'strainer':
+        return BeautifulSoup(html, full_parser(backend), parse_only=RESULT_CARDS)
+    return BeautifulSoup(html, backend)
@@ -0,0 +1,154 @@
+import logging
+import os
+import threading
+import time
+from collections import Counter, deque
+
+from agents.search_cache import normalize_query
+
+# Scraper settings come from the config module when available
+try:
+    from config.config import SCRAPER_CONFIG
+except ImportError:
+    SCRAPER_CONFIG = {}
+
+class SearchLog:
+    """Searches made in the last `window` seconds, for finding the popular ones"""
+
+    def __init__(self, window=None, max_entries=10000):
+        self.window = window or SCRAPER_CONFIG.get('SEARCH_LOG_WINDOW', 3600)
+        # (searched_at, normalized query), oldest first
+        self._entries = deque(maxlen=max_entries)
+        self._lock = threading.Lock()
+
+    def record(self, keywords, location, job_type="full-time"):
+        """Log one search (searches without keywords or location are not logged)"""
+        query = normalize_query(keywords, location, job_type)
+        if not (query[0] or query[1]):
+            return
+        with self._lock:
+            self._entries.append((time.time(), query))
+
+    def hot(self, limit=10):
+        """
+        Most searched queries within the window
+
+        Returns:
+            list: (keywords, location, job_type) tuples, most searched first
+        """
+        with self._lock:
+            cutoff = time.time() - self.window
+            while self._entries and self._entries[0][0] < cutoff:
+                self._entries.popleft()
+            counts = Counter(query for _, query in self._entries)
+        return [query for query, _ in counts.most_common(limit)]
+
+class PrefetchCrawler:
+    """
+    Background thread that keeps popular searches in the search cache
+
+    Every interval it refreshes a fixed set of queries plus the most searched
+    ones from the search log. Entries are re-fetched before they reach the
+    cache's soft TTL, so page views for these searches are always served warm.
+    """
+
+    def __init__(self, scraper, queries=None, search_log=None, interval=None, hot_limit=None):
+        self.logger = logging.getLogger(__name__)
+        self.scraper = scraper
+        self.queries = list(queries or [])
+        self.search_log = search_log or SearchLog()
+        self.interval = interval or SCRAPER_CONFIG.get('PREFETCH_INTERVAL') or 240
+        self.hot_limit = SCRAPER_CONFIG.get('PREFETCH_HOT_QUERIES', 10) if hot_limit is None else hot_limit
+        self.runs = 0
+        self.refreshed = 0
+        self._stop = threading.Event()
+        self._thread = None
+        # Process the thread was started in (threads don't survive a fork)
+        self._pid = None
+        self._start_lock = threading.Lock()
+
+    def hot_queries(self):
+        """Fixed queries first, then logged ones, without duplicates"""
+        seen = set()
+        queries = []
+        for query in [normalize_query(*query) for query in self.queries] + self.search_log.hot(self.hot_limit):
+            if query not in seen:
+                seen.add(query)
+                queries.append(query)
+        return queries
+
+    def run_once(self):
+        """
+        Refresh every hot query that is missing from the cache or due soon
+
+        Returns:
+            int: Number of queries fetched from upstream
+        """
+        cache = self.scraper.cache
+        # Fetch early enough that no entry goes stale before the next run
+        refresh_age = max(0, cache.soft_ttl - self.interval)
+        fetched = 0
+        for keywords, location, job_type in self.hot_queries():
+            if self._stop.is_set():
+                break
+            entry = cache.peek_entry(keywords, location, job_type)
+            if entry is not None and entry[1] < refresh_age:
+                continue
+            try:
+                jobs = self.scraper.refresh_search(keywords, location, job_type)
+            except Exception as e:
+                self.logger.error(f"Error prefetching '{keywords}' / '{location}': {str(e)}")
+                continue
+            fetched += 1
+            self.logger.info(f"Prefetched {len(jobs)} jobs for '{keywords}' / '{location}'")
+        self.runs += 1
+        self.refreshed += fetched
+        return fetched
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                self.logger.error(f"Prefetch run failed: {str(e)}")
+            self._stop.wait(self.interval)
+
+    def start(self):
+        """Start the background thread (once per process)"""
+        with self._start_lock:
+            if self._pid != os.getpid() or self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._loop, name='search-prefetch', daemon=True)
+                self._thread.start()
+                self.logger.info(f"Prefetching popular searches every {self.interval}s")
+        return self
+
+    def init_app(self, app):
+        """
+        Start the crawler on the first request each process of a Flask app serves
+
+        This works under the dev server's reloader (only the child process serves),
+        under gunicorn (every forked worker starts its own thread) and under any
+        other WSGI server. Apps in testing mode never start it.
+        """
+        @app.before_request
+        def start_prefetcher():
+            if self._pid != os.getpid() and not app.testing:
+                self.start()
+        return self
+
+    def stop(self, timeout=None):
+        """Stop the background thread after the query it is fetching"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self):
+        return {
+            'running': self._thread is not None and self._thread.is_alive(),
+            'interval': self.interval,
+            'runs': self.runs,
+            'refreshed': self.refreshed,
+            'hot_queries': [list(query) for query in self.hot_queries()]
+        }
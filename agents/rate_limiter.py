@@ -0,0 +1,254 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from agents.search_cache import RedisBackend
+from agents.deadline import time_left
+
+# Scraper settings come from the config module when available
+try:
+    from config.config import SCRAPER_CONFIG
+except ImportError:
+    SCRAPER_CONFIG = {}
+
+class RateLimitTimeout(requests.RequestException):
+    """A request could not get a slot from the rate limiter before its deadline"""
+
+def next_slot(tat, now, interval, tolerance, max_wait):
+    """
+    One step of the generic cell rate algorithm (a token bucket kept as a single timestamp)
+
+    Args:
+        tat (float): Stored theoretical arrival time for the host, or None
+        now (float): Current time
+        interval (float): Seconds per request at the configured rate
+        tolerance (float): Seconds of burst allowed ahead of the rate
+        max_wait (float): Longest the caller will queue for a slot
+
+    Returns:
+        tuple: (wait, new tat); wait is None, and tat unchanged, when the slot is too far off
+    """
+    tat = max(tat or now, now)
+    wait = max(0.0, tat - tolerance - now)
+    if wait > max_wait:
+        return None, tat
+    return wait, tat + interval
+
+class MemoryBucketStore:
+    """Bucket state for the threads of one process"""
+
+    def __init__(self):
+        self._tats = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, key, interval, tolerance, max_wait):
+        with self._lock:
+            wait, self._tats[key] = next_slot(self._tats.get(key), time.time(), interval, tolerance, max_wait)
+            return wait
+
+    def defer(self, key, until):
+        with self._lock:
+            self._tats[key] = max(self._tats.get(key) or 0, until)
+
+class SQLiteBucketStore:
+    """Bucket state shared by every worker on a host through a local SQLite file"""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS rate_limits (key TEXT PRIMARY KEY, tat REAL NOT NULL)"
+        )
+
+    def _connect(self):
+        # Autocommit mode, so each reservation is its own BEGIN IMMEDIATE transaction
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _update(self, key, step):
+        conn = self._connect()
+        # The write lock is taken up front so concurrent workers can't book the same slot
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tat FROM rate_limits WHERE key = ?", (key,)).fetchone()
+            result, tat = step(row[0] if row else None)
+            conn.execute("INSERT OR REPLACE INTO rate_limits (key, tat) VALUES (?, ?)", (key, tat))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return result
+
+    def reserve(self, key, interval, tolerance, max_wait):
+        return self._update(key, lambda tat: next_slot(tat, time.time(), interval, tolerance, max_wait))
+
+    def defer(self, key, until):
+        self._update(key, lambda tat: (None, max(tat or 0, until)))
+
+class RedisBucketStore:
+    """Bucket state shared across hosts through a Redis-protocol store"""
+
+    # next_slot, run atomically on the server
+    RESERVE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local interval = tonumber(ARGV[2])
+local tolerance = tonumber(ARGV[3])
+local max_wait = tonumber(ARGV[4])
+local tat = tonumber(redis.call('GET', KEYS[1]) or ARGV[1])
+if tat < now then tat = now end
+local wait = tat - tolerance - now
+if wait < 0 then wait = 0 end
+if wait > max_wait then return {0, tostring(wait)} end
+tat = tat + interval
+redis.call('SET', KEYS[1], tostring(tat), 'PX', math.ceil((tat - now) * 1000) + 1000)
+return {1, tostring(wait)}
+"""
+
+    DEFER_SCRIPT = """
+local now = tonumber(ARGV[1])
+local target = math.max(tonumber(redis.call('GET', KEYS[1]) or ARGV[2]), tonumber(ARGV[2]))
+redis.call('SET', KEYS[1], tostring(target), 'PX', math.ceil((target - now) * 1000) + 1000)
+return 1
+"""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def _key(self, key):
+        return f"{self.backend.namespace}ratelimit:{key}"
+
+    def reserve(self, key, interval, tolerance, max_wait):
+        granted, wait = self.backend.execute('EVAL', self.RESERVE_SCRIPT, 1, self._key(key),
+                                             repr(time.time()), repr(interval), repr(tolerance), repr(max_wait))
+        return float(wait) if granted else None
+
+    def defer(self, key, until):
+        self.backend.execute('EVAL', self.DEFER_SCRIPT, 1, self._key(key), repr(time.time()), repr(until))
+
+def create_bucket_store(name=None, url=None):
+    """
+    Build the rate limiter state store, shared the same way as the search cache
+
+    Args:
+        name (str): 'memory', 'sqlite' or 'redis' (defaults to the cache backend)
+        url (str): SQLite file path or redis:// URL
+
+    Returns:
+        Bucket store instance
+    """
+    name = (name or SCRAPER_CONFIG.get('RATE_LIMIT_BACKEND') or SCRAPER_CONFIG.get('CACHE_BACKEND', 'memory')).lower()
+    url = url or SCRAPER_CONFIG.get('CACHE_URL', '')
+
+    if name == 'sqlite':
+        return SQLiteBucketStore(url or os.path.join('instance', 'search_cache.db'))
+    if name == 'redis':
+        return RedisBucketStore(RedisBackend(url or 'redis://localhost:6379/0'))
+    return MemoryBucketStore()
+
+class RateLimiter:
+    """
+    Token bucket per upstream host
+
+    Each request books the next free slot for its host and waits only until that
+    slot; callers queue in booking order instead of sleeping for a fixed time. A
+    caller whose slot would come after its deadline is turned away without
+    booking anything. Limiters with different prefixes keep separate buckets
+    for the same host in a shared store.
+    """
+
+    def __init__(self, rate=None, burst=None, max_wait=None, store=None, prefix=''):
+        self.logger = logging.getLogger(__name__)
+        self.rate = SCRAPER_CONFIG.get('RATE_LIMIT', 4.0) if rate is None else rate
+        self.burst = max(1, burst or SCRAPER_CONFIG.get('RATE_LIMIT_BURST', 4))
+        self.max_wait = SCRAPER_CONFIG.get('RATE_LIMIT_MAX_WAIT', 10.0) if max_wait is None else max_wait
+        self.store = store or MemoryBucketStore()
+        self.prefix = prefix
+
+    @staticmethod
+    def host_key(url):
+        """Bucket key for a URL: its host and port"""
+        return urlsplit(url).netloc.lower()
+
+    def reserve(self, host, timeout=None):
+        """
+        Book the next request slot for a host without waiting for it
+
+        Args:
+            host (str): Bucket key, as returned by host_key
+            timeout (float): Longest the caller will wait (defaults to max_wait); never
+                past the deadline of the current request
+
+        Returns:
+            float: Seconds until the booked slot, or None if it is past the deadline
+        """
+        # With no rate set only backoffs delay requests
+        interval = 1.0 / self.rate if self.rate else 0.0
+        max_wait = time_left(self.max_wait if timeout is None else timeout)
+        return self.store.reserve(self.prefix + host, interval, (self.burst - 1) * interval, max_wait)
+
+    def acquire(self, host, timeout=None):
+        """
+        Wait for a request slot for a host
+
+        Raises:
+            RateLimitTimeout: When no slot is free before the deadline
+        """
+        wait = self.reserve(host, timeout)
+        if wait is None:
+            raise RateLimitTimeout(f"No request slot for {host} within {self.max_wait if timeout is None else timeout}s")
+        if wait > 0:
+            time.sleep(wait)
+
+    def backoff(self, host, seconds):
+        """Hold every caller's next request to a host for a number of seconds"""
+        tolerance = (self.burst - 1) / self.rate if self.rate else 0.0
+        self.store.defer(self.prefix + host, time.time() + seconds + tolerance)
+
+class RateLimitedAdapter(HTTPAdapter):
+    """Connection pool adapter that takes a rate limiter slot before every request"""
+
+    def __init__(self, rate_limiter, **kwargs):
+        self.rate_limiter = rate_limiter
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        self.rate_limiter.acquire(self.rate_limiter.host_key(request.url))
+        return super().send(request, **kwargs)
+
+_default_limiter = None
+_detail_limiter = None
+_default_lock = threading.Lock()
+
+def get_rate_limiter():
+    """Rate limiter shared by every scraper in this process"""
+    global _default_limiter
+    with _default_lock:
+        if _default_limiter is None:
+            _default_limiter = RateLimiter(store=create_bucket_store())
+        return _default_limiter
+
+def get_detail_rate_limiter():
+    """
+    Rate limiter for background job detail fetches, shared by every scraper in this process
+
+    Detail fetches take slots from their own bucket per host, at DETAIL_RATE_LIMIT,
+    so prefetching announcements never uses up the slots live searches need.
+    """
+    global _detail_limiter
+    with _default_lock:
+        if _detail_limiter is None:
+            _detail_limiter = RateLimiter(rate=SCRAPER_CONFIG.get('DETAIL_RATE_LIMIT', 1.0), burst=1,
+                                          max_wait=SCRAPER_CONFIG.get('DETAIL_RATE_LIMIT_MAX_WAIT', 60.0),
+                                          store=create_bucket_store(), prefix='detail:')
+        return _detail_limiter
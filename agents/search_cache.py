@@ -0,0 +1,597 @@
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+from urllib.parse import urlparse
+
+# Scraper settings come from the config module when available
+try:
+    from config.config import SCRAPER_CONFIG
+except ImportError:
+    SCRAPER_CONFIG = {}
+
+def normalize_query(keywords, location, job_type="full-time"):
+    """
+    Build the cache key for a search
+
+    Case and extra whitespace don't change USAJobs results, so "Data  Analyst"
+    and "data analyst" share an entry.
+
+    Returns:
+        tuple: (keywords, location, job_type) normalized
+    """
+    def clean(value):
+        return ' '.join((value or '').lower().split())
+
+    return (clean(keywords), clean(location), clean(job_type))
+
+def serialize_jobs(jobs, stored_at=None):
+    """Pack a job list into compressed JSON, keeping when it was stored"""
+    payload = {'stored_at': stored_at or time.time(), 'jobs': jobs}
+    data = json.dumps(payload, separators=(',', ':'),
+                      default=lambda value: value.isoformat() if isinstance(value, datetime) else str(value))
+    return zlib.compress(data.encode('utf-8'))
+
+def deserialize_jobs(blob):
+    """
+    Unpack a payload written by serialize_jobs
+
+    Returns:
+        tuple: (stored_at, jobs) with date_posted restored to datetime
+    """
+    payload = json.loads(zlib.decompress(blob).decode('utf-8'))
+    jobs = payload['jobs']
+    for job in jobs:
+        if isinstance(job.get('date_posted'), str):
+            try:
+                job['date_posted'] = datetime.fromisoformat(job['date_posted'])
+            except ValueError:
+                pass
+    return payload['stored_at'], jobs
+
+def key_namespace(key):
+    """Namespace of a backend key: its prefix up to and including the first ':'"""
+    prefix, sep, _ = key.partition(':')
+    return prefix + sep if sep else ''
+
+class MemoryBackend:
+    """
+    Per-process backend: LRU-ordered dicts of serialized entries
+
+    Each key namespace (search:, hwm:, fallback:, ...) has its own LRU order and
+    its own max_entries limit, so one kind of entry never evicts another.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        # namespace -> key -> (expires_at, value), least recently used first
+        self._namespaces = {}
+        # key -> expires_at of leases held by threads of this process
+        self._leases = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entries = self._namespaces.get(key_namespace(key), {})
+            entry = entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del entries[key]
+                return None
+            entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            entries = self._namespaces.setdefault(key_namespace(key), OrderedDict())
+            entries[key] = (time.time() + ttl, value)
+            entries.move_to_end(key)
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            return self._namespaces.get(key_namespace(key), {}).pop(key, None) is not None
+
+    def _matching(self, prefix):
+        return [(entries, key) for entries in self._namespaces.values() for key in entries if key.startswith(prefix)]
+
+    def clear(self, prefix=''):
+        with self._lock:
+            matching = self._matching(prefix)
+            for entries, key in matching:
+                del entries[key]
+            return len(matching)
+
+    def size(self, prefix=''):
+        with self._lock:
+            return len(self._matching(prefix))
+
+    def acquire_lease(self, key, ttl):
+        with self._lock:
+            now = time.time()
+            if self._leases.get(key, 0) > now:
+                return False
+            self._leases[key] = now + ttl
+            return True
+
+    def release_lease(self, key):
+        with self._lock:
+            self._leases.pop(key, None)
+
+class SQLiteBackend:
+    """
+    Backend shared by every worker on a host through a local SQLite file
+
+    Several backends (the search cache's, the job details cache's) may share one
+    file with different limits. Each only trims the key namespaces it writes,
+    to its own max_entries.
+    """
+
+    def __init__(self, path, max_entries=256):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._writes = 0
+        # Key namespaces written through this backend, the ones its purge trims
+        self._namespaces = set()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS search_cache ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS search_leases ("
+                "key TEXT PRIMARY KEY, expires_at REAL NOT NULL)"
+            )
+
+    def _connect(self):
+        # sqlite3 connections can't be shared across threads, so keep one per thread
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = self._connect().execute(
+            "SELECT value FROM search_cache WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key, value, ttl):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO search_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, time.time() + ttl)
+            )
+            self._namespaces.add(key_namespace(key))
+            self._writes += 1
+            if self._writes % 50 == 0:
+                self._purge(conn)
+
+    def _purge(self, conn):
+        """Drop expired rows, then the soonest-expiring rows beyond max_entries in each namespace written here"""
+        conn.execute("DELETE FROM search_cache WHERE expires_at <= ?", (time.time(),))
+        # Namespaces are key prefixes up to the first ':' (see key_namespace)
+        namespace = "substr(key, 1, instr(key, ':'))"
+        for prefix in sorted(self._namespaces):
+            conn.execute(
+                "DELETE FROM search_cache WHERE key IN ("
+                f"SELECT key FROM search_cache WHERE {namespace} = ? "
+                "ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                (prefix, self.max_entries)
+            )
+
+    def delete(self, key):
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM search_cache WHERE key = ?", (key,)).rowcount > 0
+
+    def clear(self, prefix=''):
+        with self._connect() as conn:
+            return conn.execute(
+                "DELETE FROM search_cache WHERE substr(key, 1, ?) = ?", (len(prefix), prefix)
+            ).rowcount
+
+    def size(self, prefix=''):
+        return self._connect().execute(
+            "SELECT COUNT(*) FROM search_cache WHERE substr(key, 1, ?) = ? AND expires_at > ?",
+            (len(prefix), prefix, time.time())
+        ).fetchone()[0]
+
+    def acquire_lease(self, key, ttl):
+        now = time.time()
+        with self._connect() as conn:
+            # Expired leases (from a crashed worker) are taken over
+            conn.execute("DELETE FROM search_leases WHERE key = ? AND expires_at <= ?", (key, now))
+            return conn.execute(
+                "INSERT OR IGNORE INTO search_leases (key, expires_at) VALUES (?, ?)", (key, now + ttl)
+            ).rowcount == 1
+
+    def release_lease(self, key):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM search_leases WHERE key = ?", (key,))
+
+class RedisError(Exception):
+    """Error reply from a Redis-protocol server"""
+
+class RedisBackend:
+    """Backend shared across hosts through any Redis-protocol (RESP) store"""
+
+    def __init__(self, url='redis://localhost:6379/0', namespace='jobhunter:', timeout=2):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or 'localhost'
+        self.port = parsed.port or 6379
+        self.db = int(parsed.path.lstrip('/') or 0)
+        self.password = parsed.password
+        self.namespace = namespace
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        # One socket per thread keeps request/reply pairs from interleaving
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+            conn = (sock, sock.makefile('rb'))
+            self._local.conn = conn
+            if self.password:
+                self.execute('AUTH', self.password)
+            if self.db:
+                self.execute('SELECT', self.db)
+        return conn
+
+    def execute(self, *args):
+        """Send one command and return its decoded reply"""
+        sock, reader = self._connection()
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode('utf-8')
+            parts.append(f"${len(data)}\r\n".encode() + data + b"\r\n")
+        try:
+            sock.sendall(b''.join(parts))
+            return self._read_reply(reader)
+        except (OSError, ConnectionError):
+            # Drop the broken socket so the next call reconnects
+            self._local.conn = None
+            raise
+
+    def _read_reply(self, reader):
+        line = reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by Redis server")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b'+':
+            return rest.decode('utf-8')
+        if kind == b'-':
+            raise RedisError(rest.decode('utf-8'))
+        if kind == b':':
+            return int(rest)
+        if kind == b'$':
+            length = int(rest)
+            if length < 0:
+                return None
+            return reader.read(length + 2)[:-2]
+        if kind == b'*':
+            count = int(rest)
+            if count < 0:
+                return None
+            return [self._read_reply(reader) for _ in range(count)]
+        raise RedisError(f"Unexpected reply: {line!r}")
+
+    def _scan(self, prefix):
+        cursor = b'0'
+        while True:
+            cursor, keys = self.execute('SCAN', cursor, 'MATCH', f"{self.namespace}{prefix}*", 'COUNT', 500)
+            yield from keys
+            if cursor == b'0':
+                break
+
+    def get(self, key):
+        return self.execute('GET', self.namespace + key)
+
+    def set(self, key, value, ttl):
+        self.execute('SET', self.namespace + key, value, 'PX', max(1, int(ttl * 1000)))
+
+    def delete(self, key):
+        return self.execute('DEL', self.namespace + key) > 0
+
+    def clear(self, prefix=''):
+        keys = list(self._scan(prefix))
+        return self.execute('DEL', *keys) if keys else 0
+
+    def size(self, prefix=''):
+        return sum(1 for _ in self._scan(prefix))
+
+    def acquire_lease(self, key, ttl):
+        reply = self.execute('SET', f"{self.namespace}lease:{key}", os.getpid(), 'NX', 'PX', max(1, int(ttl * 1000)))
+        return reply == 'OK'
+
+    def release_lease(self, key):
+        self.execute('DEL', f"{self.namespace}lease:{key}")
+
+def create_cache_backend(name=None, url=None, max_entries=None):
+    """
+    Build the cache backend named in the scraper config
+
+    Args:
+        name (str): 'memory', 'sqlite' or 'redis'
+        url (str): SQLite file path or redis:// URL
+        max_entries (int): Entry limit for the memory and SQLite backends
+
+    Returns:
+        Backend instance
+    """
+    name = (name or SCRAPER_CONFIG.get('CACHE_BACKEND', 'memory')).lower()
+    url = url or SCRAPER_CONFIG.get('CACHE_URL', '')
+    max_entries = max_entries or SCRAPER_CONFIG.get('CACHE_MAX_ENTRIES', 256)
+
+    if name == 'sqlite':
+        return SQLiteBackend(url or os.path.join('instance', 'search_cache.db'), max_entries)
+    if name == 'redis':
+        return RedisBackend(url or 'redis://localhost:6379/0')
+    return MemoryBackend(max_entries)
+
+class SearchCache:
+    """
+    Search result cache with a TTL, LRU eviction and a pluggable storage backend
+
+    Entries younger than soft_ttl are fresh. Between soft_ttl and ttl (the hard
+    TTL) they are stale: still served, but due for a background refresh.
+    """
+
+    # Key prefix for search results in the backend
+    PREFIX = 'search:'
+
+    def __init__(self, ttl=None, max_entries=None, backend=None, soft_ttl=None):
+        self.logger = logging.getLogger(__name__)
+        self.ttl = SCRAPER_CONFIG.get('CACHE_TTL', 900) if ttl is None else ttl
+        self.soft_ttl = SCRAPER_CONFIG.get('CACHE_SOFT_TTL', 300) if soft_ttl is None else soft_ttl
+        self.max_entries = max_entries or SCRAPER_CONFIG.get('CACHE_MAX_ENTRIES', 256)
+        self.backend = backend or create_cache_backend(max_entries=self.max_entries)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, keywords, location, job_type="full-time"):
+        """Backend key of a search"""
+        return self.PREFIX + '|'.join(normalize_query(keywords, location, job_type))
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, keywords, location, job_type="full-time"):
+        """
+        Look up cached results for a search
+
+        Returns:
+            list: Cached job dictionaries, or None on a miss or expired entry
+        """
+        entry = self.get_entry(keywords, location, job_type)
+        return entry[0] if entry else None
+
+    def get_entry(self, keywords, location, job_type="full-time"):
+        """
+        Look up cached results for a search along with their age
+
+        Returns:
+            tuple: (jobs, age in seconds), or None on a miss or expired entry
+        """
+        entry = self._read(keywords, location, job_type)
+        self._count(entry is not None)
+        return entry
+
+    def peek(self, keywords, location, job_type="full-time"):
+        """Like get, but without touching the hit/miss counters"""
+        entry = self._read(keywords, location, job_type)
+        return entry[0] if entry else None
+
+    def peek_entry(self, keywords, location, job_type="full-time"):
+        """Like get_entry, but without touching the hit/miss counters"""
+        return self._read(keywords, location, job_type)
+
+    def is_stale(self, age):
+        """Whether an entry of this age should be refreshed"""
+        return age >= self.soft_ttl
+
+    def _read(self, keywords, location, job_type):
+        try:
+            blob = self.backend.get(self.key(keywords, location, job_type))
+        except Exception as e:
+            # A broken shared store degrades to a miss rather than failing the search
+            self.logger.error(f"Error reading search cache: {str(e)}")
+            return None
+        if blob is None:
+            return None
+        # Every hit is decoded afresh, so callers can't modify the cached jobs
+        stored_at, jobs = deserialize_jobs(blob)
+        return jobs, max(0.0, time.time() - stored_at)
+
+    def set(self, keywords, location, job_type, jobs):
+        """Store results for a search, evicting the least recently used entries"""
+        if self.ttl <= 0:
+            return
+        try:
+            self.backend.set(self.key(keywords, location, job_type), serialize_jobs(jobs), self.ttl)
+        except Exception as e:
+            self.logger.error(f"Error writing search cache: {str(e)}")
+
+    def acquire_lease(self, keywords, location, job_type, ttl):
+        """
+        Claim the right to fetch a search, across every worker sharing the backend
+
+        Returns:
+            bool: True if this caller should fetch, False if another worker already is
+        """
+        try:
+            return self.backend.acquire_lease(self.key(keywords, location, job_type), ttl)
+        except Exception as e:
+            # Without a working lease store every worker simply fetches for itself
+            self.logger.error(f"Error acquiring search lease: {str(e)}")
+            return True
+
+    def release_lease(self, keywords, location, job_type):
+        """Give up a lease taken with acquire_lease"""
+        try:
+            self.backend.release_lease(self.key(keywords, location, job_type))
+        except Exception as e:
+            self.logger.error(f"Error releasing search lease: {str(e)}")
+
+    def invalidate(self, keywords=None, location=None, job_type=None):
+        """
+        Drop cached results
+
+        With no arguments every entry is dropped, otherwise only the given search.
+
+        Returns:
+            int: Number of entries removed
+        """
+        if keywords is None and location is None and job_type is None:
+            removed = self.backend.clear(self.PREFIX)
+        else:
+            removed = int(self.backend.delete(self.key(keywords, location, job_type or "full-time")))
+        self.logger.info(f"Invalidated {removed} cached searches")
+        return removed
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        try:
+            entries = self.backend.size(self.PREFIX)
+        except Exception as e:
+            self.logger.error(f"Error reading search cache size: {str(e)}")
+            entries = None
+        lookups = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / lookups, 3) if lookups else 0.0,
+            'entries': entries,
+            'max_entries': self.max_entries,
+            'ttl': self.ttl,
+            'soft_ttl': self.soft_ttl,
+            'backend': type(self.backend).__name__
+        }
+
+class FallbackCache:
+    """
+    Negative cache for searches that come back empty
+
+    Records which fallback step finally produced results for a search (or that
+    none did), so repeats of the search can skip the steps that are known to
+    return nothing.
+    """
+
+    # Key prefix for fallback steps in the backend
+    PREFIX = 'fallback:'
+
+    def __init__(self, backend=None, ttl=None):
+        self.logger = logging.getLogger(__name__)
+        self.backend = backend or create_cache_backend()
+        self.ttl = SCRAPER_CONFIG.get('NEGATIVE_CACHE_TTL', 600) if ttl is None else ttl
+
+    def key(self, keywords, location, job_type="full-time"):
+        """Backend key of a search"""
+        return self.PREFIX + '|'.join(normalize_query(keywords, location, job_type))
+
+    def get(self, keywords, location, job_type="full-time"):
+        """
+        Look up the step that answered this search last time
+
+        Returns:
+            str: Label of the fallback step, or None if nothing is remembered
+        """
+        try:
+            value = self.backend.get(self.key(keywords, location, job_type))
+        except Exception as e:
+            self.logger.error(f"Error reading fallback cache: {str(e)}")
+            return None
+        return value.decode('utf-8') if value is not None else None
+
+    def set(self, keywords, location, job_type, step):
+        """Remember the step that answered this search"""
+        if self.ttl <= 0:
+            return
+        try:
+            self.backend.set(self.key(keywords, location, job_type), step.encode('utf-8'), self.ttl)
+        except Exception as e:
+            self.logger.error(f"Error writing fallback cache: {str(e)}")
+
+    def invalidate(self, keywords, location, job_type="full-time"):
+        """Forget the remembered step for a search"""
+        try:
+            self.backend.delete(self.key(keywords, location, job_type))
+        except Exception as e:
+            self.logger.error(f"Error invalidating fallback cache: {str(e)}")
+
+class HighWaterMarks:
+    """
+    Newest posting seen for each search, for incremental refreshes
+
+    Results come newest first, so a refresh can stop at the first posting at or
+    below the mark: everything after it was already seen.
+    """
+
+    # Key prefix for high-water marks in the backend
+    PREFIX = 'hwm:'
+
+    def __init__(self, backend=None, ttl=None):
+        self.logger = logging.getLogger(__name__)
+        self.backend = backend or create_cache_backend()
+        self.ttl = SCRAPER_CONFIG.get('HIGH_WATER_TTL', 86400) if ttl is None else ttl
+
+    def key(self, keywords, location, job_type="full-time"):
+        """Backend key of a search"""
+        return self.PREFIX + '|'.join(normalize_query(keywords, location, job_type))
+
+    def get(self, keywords, location, job_type="full-time"):
+        """
+        Look up the mark of a search
+
+        Returns:
+            dict: 'url' (canonical) and 'date_posted' (datetime or None) of the newest
+                  posting seen, or None if the search has no mark
+        """
+        try:
+            value = self.backend.get(self.key(keywords, location, job_type))
+        except Exception as e:
+            self.logger.error(f"Error reading high-water mark: {str(e)}")
+            return None
+        if value is None:
+            return None
+        mark = json.loads(value.decode('utf-8'))
+        if mark.get('date_posted'):
+            mark['date_posted'] = datetime.fromisoformat(mark['date_posted'])
+        return mark
+
+    def set(self, keywords, location, job_type, url, date_posted=None):
+        """Move the mark of a search to the given posting"""
+        if self.ttl <= 0:
+            return
+        mark = {'url': url, 'date_posted': date_posted.isoformat() if isinstance(date_posted, datetime) else None}
+        try:
+            self.backend.set(self.key(keywords, location, job_type), json.dumps(mark).encode('utf-8'), self.ttl)
+        except Exception as e:
+            self.logger.error(f"Error writing high-water mark: {str(e)}")
+
+    def invalidate(self, keywords, location, job_type="full-time"):
+        """Forget the mark of a search, so its next refresh is a full one"""
+        try:
+            self.backend.delete(self.key(keywords, location, job_type))
+        except Exception as e:
+            self.logger.error(f"Error invalidating high-water mark: {str(e)}")
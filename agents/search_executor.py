@@ -0,0 +1,78 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from agents.deadline import submit_in_context, time_left
+
+# Scraper settings come from the config module when available
+try:
+    from config.config import SCRAPER_CONFIG
+except ImportError:
+    SCRAPER_CONFIG = {}
+
+class SearchExecutor:
+    """Run candidate job searches concurrently under a bounded worker pool"""
+
+    def __init__(self, max_workers=None):
+        self.logger = logging.getLogger(__name__)
+        self.max_workers = max_workers or SCRAPER_CONFIG.get('MAX_CONCURRENT_SEARCHES', 4)
+        # The pool is shared by every request, so the bound holds across Flask threads too
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                           thread_name_prefix='job-search')
+
+    def first_non_empty(self, searches):
+        """
+        Run searches in parallel and return the first non-empty result in priority order
+
+        Lower-priority searches that finish early are held until every search ahead of
+        them has come back empty. Once a winner is found the remaining searches are
+        cancelled (searches already running are left to finish in the background).
+
+        Args:
+            searches (list): (label, callable) pairs in priority order
+
+        Returns:
+            tuple: (label, results) of the winning search, or (None, []) if all were empty
+        """
+        results_by_step = self.iter_results(searches)
+        try:
+            for label, results in results_by_step:
+                if results:
+                    self.logger.info(f"Search '{label}' returned {len(results)} jobs")
+                    return label, results
+            return None, []
+        finally:
+            results_by_step.close()
+
+    def iter_results(self, searches):
+        """
+        Run searches in parallel and yield each result in priority order
+
+        A failed search yields an empty result, and so does a search still running
+        when the request's deadline passes. Closing the generator cancels the
+        searches that haven't started yet.
+
+        Args:
+            searches (list): (label, callable) pairs in priority order
+
+        Yields:
+            tuple: (label, results) for each search, in the order given
+        """
+        futures = [(label, submit_in_context(self.executor, search)) for label, search in searches]
+        try:
+            for label, future in futures:
+                try:
+                    results = future.result(timeout=time_left())
+                except FutureTimeoutError:
+                    self.logger.warning(f"Search '{label}' ran past the request deadline")
+                    results = []
+                except Exception as e:
+                    self.logger.error(f"Search '{label}' failed: {str(e)}")
+                    results = []
+                yield label, results
+        finally:
+            for _, future in futures:
+                future.cancel()
+
+    def shutdown(self):
+        """Stop accepting searches and drop queued ones"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,224 @@
+import hashlib
+import logging
+import math
+import mmap
+import os
+import struct
+import threading
+from contextlib import contextmanager
+
+# Cross-process write locking is POSIX-only; elsewhere only threads are serialized
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Scraper settings come from the config module when available
+try:
+    from config.config import SCRAPER_CONFIG
+except ImportError:
+    SCRAPER_CONFIG = {}
+
+# File header: magic, format version, number of bits, number of hashes, items added,
+# generation of the database the filter was built from
+HEADER = struct.Struct('<4sIQIQ32s4x')
+MAGIC = b'JHBF'
+VERSION = 2
+
+def bloom_size(capacity, error_rate):
+    """
+    Bits and hash functions for a Bloom filter
+
+    Args:
+        capacity (int): Items the filter is sized for
+        error_rate (float): False-positive rate at that many items
+
+    Returns:
+        tuple: (number of bits, number of hash functions)
+    """
+    bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+    # Whole bytes, since the bits are stored bytewise
+    bits = max(8, bits + -bits % 8)
+    hashes = max(1, round(bits / capacity * math.log(2)))
+    return bits, hashes
+
+class SeenURLFilter:
+    """
+    Bloom filter of seen job URLs, memory-mapped from a file
+
+    Membership tests can give false positives (at about error_rate once
+    capacity items are in) but never false negatives. The bit array lives in
+    the mapped file, so opening the filter after a restart costs nothing and
+    every process mapping the same file sees the same bits. Without a path
+    the filter is kept in anonymous memory.
+
+    The header records the generation of the database the filter was built
+    from, so a filter left over from another (or a recreated) database can be
+    told apart and rebuilt. Writes hold an exclusive flock on the file, so
+    processes sharing it don't lose each other's bits or counts.
+    """
+
+    def __init__(self, path=None, capacity=None, error_rate=None):
+        self.logger = logging.getLogger(__name__)
+        self.path = SCRAPER_CONFIG.get('SEEN_URLS_PATH', '') if path is None else path
+        capacity = capacity or SCRAPER_CONFIG.get('SEEN_URLS_CAPACITY', 1000000)
+        error_rate = error_rate or SCRAPER_CONFIG.get('SEEN_URLS_ERROR_RATE', 0.001)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._lock = threading.Lock()
+        self._file = None
+
+        bits, hashes = bloom_size(capacity, error_rate)
+        if self.path and self._open_existing():
+            return
+        self.bits, self.hashes = bits, hashes
+        size = HEADER.size + bits // 8
+        if self.path:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            self._file = open(self.path, 'w+b')
+            self._file.truncate(size)
+            self._mmap = mmap.mmap(self._file.fileno(), size)
+            self.logger.info(f"Created seen-URL filter at {self.path} ({size // 1024} KiB, {hashes} hashes)")
+        else:
+            self._mmap = mmap.mmap(-1, size)
+        self._write_header(0, '')
+
+    def _open_existing(self):
+        """Map an existing filter file; False if there is none (or it is unreadable)"""
+        try:
+            self._file = open(self.path, 'r+b')
+        except FileNotFoundError:
+            return False
+        try:
+            magic, version, bits, hashes, _, _ = HEADER.unpack(self._file.read(HEADER.size))
+            if magic != MAGIC or version != VERSION or os.path.getsize(self.path) != HEADER.size + bits // 8:
+                raise ValueError("not a seen-URL filter")
+        except (struct.error, ValueError) as e:
+            self.logger.error(f"Replacing unreadable seen-URL filter {self.path}: {str(e)}")
+            self._file.close()
+            self._file = None
+            return False
+
+        self.bits, self.hashes = bits, hashes
+        self._mmap = mmap.mmap(self._file.fileno(), 0)
+        if (bits, hashes) != bloom_size(self.capacity, self.error_rate):
+            self.logger.warning(f"Seen-URL filter {self.path} was sized for other settings; "
+                                f"rebuild it to apply the configured capacity and error rate")
+        return True
+
+    def _write_header(self, count, generation=None):
+        if generation is None:
+            generation = self.generation
+        self._mmap[:HEADER.size] = HEADER.pack(MAGIC, VERSION, self.bits, self.hashes, count,
+                                               generation.encode('ascii'))
+
+    @contextmanager
+    def _write_lock(self):
+        """Serialize writes across threads, and across processes sharing the file"""
+        with self._lock:
+            if self._file is None or fcntl is None:
+                yield
+                return
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    def __len__(self):
+        """Items added (approximate: false positives are not counted)"""
+        return HEADER.unpack(self._mmap[:HEADER.size])[4]
+
+    @property
+    def generation(self):
+        """Generation of the database the filter was built from ('' if never built)"""
+        return HEADER.unpack(self._mmap[:HEADER.size])[5].rstrip(b'\0').decode('ascii')
+
+    def _positions(self, key):
+        # Double hashing: k positions from the two halves of one digest
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        step = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * step) % self.bits for i in range(self.hashes)]
+
+    def __contains__(self, key):
+        data = self._mmap
+        return all(data[HEADER.size + position // 8] >> (position % 8) & 1 for position in self._positions(key))
+
+    def add(self, key):
+        """
+        Remember a key
+
+        Returns:
+            bool: True if the key was not in the filter before
+        """
+        with self._write_lock():
+            return self._add(key)
+
+    def _add(self, key):
+        data = self._mmap
+        new = False
+        for position in self._positions(key):
+            offset = HEADER.size + position // 8
+            bit = 1 << (position % 8)
+            if not data[offset] & bit:
+                data[offset] |= bit
+                new = True
+        if new:
+            self._write_header(len(self) + 1)
+        return new
+
+    def update(self, keys):
+        """Remember many keys; returns how many were new"""
+        with self._write_lock():
+            return sum(1 for key in keys if self._add(key))
+
+    def clear(self):
+        with self._write_lock():
+            self._mmap[HEADER.size:] = bytes(self.bits // 8)
+            self._write_header(0, '')
+
+    def rebuild(self, keys, generation=''):
+        """
+        Refill the filter from scratch (e.g. from the job table)
+
+        Args:
+            keys (iterable): Every key to remember
+            generation (str): Generation of the database the keys come from
+
+        Returns:
+            int: Keys added
+        """
+        with self._write_lock():
+            self._mmap[HEADER.size:] = bytes(self.bits // 8)
+            self._write_header(0, generation)
+            added = sum(1 for key in keys if self._add(key))
+        self.flush()
+        self.logger.info(f"Rebuilt seen-URL filter with {added} keys")
+        return added
+
+    def flush(self):
+        """Write the mapped bits back to the file"""
+        if self._file is not None:
+            self._mmap.flush()
+
+    def close(self):
+        self.flush()
+        self._mmap.close()
+        if self._file is not None:
+            self._file.close()
+
+    def false_positive_rate(self):
+        """Expected false-positive rate at the current fill"""
+        return (1 - math.exp(-self.hashes * len(self) / self.bits)) ** self.hashes
+
+    def stats(self):
+        return {
+            'path': self.path or None,
+            'items': len(self),
+            'size_kib': round((HEADER.size + self.bits // 8) / 1024, 1),
+            'hashes': self.hashes,
+            'generation': self.generation or None,
+            'false_positive_rate': round(self.false_positive_rate(), 6)
+        }
@@ -0,0 +1,115 @@
+import threading
+
+class SelectorPlan:
+    """
+    Ordered CSS selector cascade that remembers which selector matched last
+
+    USAJobs pages are built from the same template, so the selector that matched
+    the previous card almost always matches the next one. The plan tries that
+    selector first and only walks the full cascade, in its original order, when
+    it misses.
+
+    Generic selectors (last resorts such as "div:has(h3)") are never remembered.
+    They are tried after every specific selector on every lookup, so a card that
+    only they match can't put them ahead of the specific ones.
+    """
+
+    def __init__(self, name, selectors, generic=()):
+        self.name = name
+        self.selectors = list(selectors)
+        self.generic = list(generic)
+        self._preferred = None
+        # Selector that answered the latest lookup
+        self.last_selector = None
+        self._lock = threading.Lock()
+        self.hits = 0        # matched by the remembered selector
+        self.fallbacks = 0   # matched only after walking the cascade
+        self.misses = 0      # nothing in the cascade matched
+
+    def select_one(self, element):
+        """
+        First element matched by the plan inside element
+
+        Args:
+            element: BeautifulSoup element to search
+
+        Returns:
+            The matched element, or None
+        """
+        return self._run(lambda selector: element.select_one(selector))
+
+    def select(self, element):
+        """
+        All elements matched by the first selector in the plan that matches anything
+
+        Args:
+            element: BeautifulSoup element to search
+
+        Returns:
+            list: Matched elements (empty when no selector matches)
+        """
+        return self._run(lambda selector: element.select(selector)) or []
+
+    def _run(self, match):
+        preferred = self._preferred
+        if preferred is not None:
+            result = match(self.selectors[preferred])
+            if result:
+                with self._lock:
+                    self.hits += 1
+                    self.last_selector = self.selectors[preferred]
+                return result
+
+        for index, selector in enumerate(self.selectors):
+            if index == preferred:
+                continue
+            result = match(selector)
+            if result:
+                with self._lock:
+                    self._preferred = index
+                    self.fallbacks += 1
+                    self.last_selector = selector
+                return result
+
+        for selector in self.generic:
+            result = match(selector)
+            if result:
+                with self._lock:
+                    self.fallbacks += 1
+                    self.last_selector = selector
+                return result
+
+        with self._lock:
+            self.misses += 1
+            self.last_selector = None
+        return None
+
+    @property
+    def preferred_selector(self):
+        """Selector tried first on the next lookup, if one has matched yet"""
+        preferred = self._preferred
+        return self.selectors[preferred] if preferred is not None else None
+
+    def reset(self):
+        """Forget the remembered selector and zero the counters"""
+        with self._lock:
+            self._preferred = None
+            self.last_selector = None
+            self.hits = self.fallbacks = self.misses = 0
+
+    def stats(self):
+        """
+        Lookup counters for this plan
+
+        Returns:
+            dict: hits, fallbacks, misses, hit_rate and the preferred selector
+        """
+        with self._lock:
+            lookups = self.hits + self.fallbacks + self.misses
+            return {
+                'hits': self.hits,
+                'fallbacks': self.fallbacks,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'preferred': self.preferred_selector
+            }
@@ -0,0 +1,66 @@
+import threading
+
+from agents.deadline import DeadlineExceeded, time_left
+
+class _Call:
+    """One in-flight execution and the callers waiting on it"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into a single execution"""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        """
+        Run fn once for all threads asking for key at the same time
+
+        The first caller runs fn; callers arriving while it runs wait and receive
+        the same result (or exception). Once fn returns the key is free again.
+        Waiting callers give up when their request's deadline passes.
+
+        Args:
+            key: Hashable identifier of the work
+            fn (callable): Work to run
+
+        Returns:
+            The value returned by fn
+
+        Raises:
+            DeadlineExceeded: When a waiting caller's deadline passes before fn returns
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            if not call.done.wait(time_left()):
+                raise DeadlineExceeded("Request time budget used up waiting for a shared call")
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self):
+        """Number of keys currently being fetched"""
+        with self._lock:
+            return len(self._calls)
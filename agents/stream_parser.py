@@ -0,0 +1,106 @@
+from html.parser import HTMLParser
+
+from agents.parser_backends import RESULT_CARD_CLASSES
+
+# Elements that never have an end tag
+VOID_ELEMENTS = frozenset([
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr'
+])
+
+class ResultCardStream(HTMLParser):
+    """
+    Incremental splitter that cuts USAJobs result cards out of a page as it downloads
+
+    Feed the response body chunk by chunk; feed() returns the HTML of every result
+    card that closed within that chunk. Only the card being read is held in memory,
+    plus the page head until the first card appears so that pages in another
+    layout can still be parsed in full (see buffered_page).
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self._card = None         # raw HTML pieces of the card being read
+        self._card_tag = None
+        self._depth = 0
+        self._completed = []
+        self._head = []           # page read before the first card
+        self.cards_seen = 0
+
+    def feed(self, data):
+        """
+        Parse the next chunk of the page
+
+        Args:
+            data (str): Next piece of the response body
+
+        Returns:
+            list: HTML of each card that closed in this chunk
+        """
+        if not self.cards_seen:
+            self._head.append(data)
+        super().feed(data)
+        completed, self._completed = self._completed, []
+        return completed
+
+    def close(self):
+        """Flush the parser at the end of the body and return any remaining cards"""
+        super().close()
+        completed, self._completed = self._completed, []
+        return completed
+
+    @property
+    def buffered_page(self):
+        """The whole page when no result card was found, otherwise None"""
+        return None if self.cards_seen else ''.join(self._head)
+
+    def _is_card(self, attrs):
+        for name, value in attrs:
+            if name == 'class' and value and not RESULT_CARD_CLASSES.isdisjoint(value.split()):
+                return True
+        return False
+
+    def handle_starttag(self, tag, attrs):
+        if self._card is None:
+            if not self._is_card(attrs):
+                return
+            self._card = []
+            self._card_tag = tag
+            self._depth = 0
+            if not self.cards_seen:
+                self._head = []
+            self.cards_seen += 1
+
+        self._card.append(self.get_starttag_text())
+        if tag == self._card_tag and tag not in VOID_ELEMENTS:
+            self._depth += 1
+
+    def handle_startendtag(self, tag, attrs):
+        if self._card is not None:
+            self._card.append(self.get_starttag_text())
+
+    def handle_endtag(self, tag):
+        if self._card is None:
+            return
+        self._card.append(f"</{tag}>")
+        if tag == self._card_tag:
+            self._depth -= 1
+            if self._depth == 0:
+                self._completed.append(''.join(self._card))
+                self._card = None
+
+    def handle_data(self, data):
+        if self._card is not None:
+            self._card.append(data)
+
+    def handle_entityref(self, name):
+        if self._card is not None:
+            self._card.append(f"&{name};")
+
+    def handle_charref(self, name):
+        if self._card is not None:
+            self._card.append(f"&#{name};")
+
+    def handle_comment(self, data):
+        if self._card is not None:
+            self._card.append(f"<!--{data}-->")
@@ -84,6 +84,9 @@ with app.app_context():
             logger.info(f"Updated permissions on database file: {db_path}")
             
         db.create_all()
+        # create_all doesn't alter existing tables; add columns introduced since
+        from agents.job_store import upgrade_job_table
+        upgrade_job_table(db.engine)
         logger.info("Database tables created successfully")
     except Exception as e:
         logger.error(f"Error creating database tables: {str(e)}")
\ No newline at end of file
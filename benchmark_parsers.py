@@ -0,0 +1,56 @@
+"""
+Compare the scraper's HTML parser backends on recorded USAJobs result pages
+
+Usage:
+    python benchmark_parsers.py [--rounds N] [page.html ...]
+
+Defaults to the pages recorded in tests/fixtures.
+"""
+import argparse
+import glob
+import logging
+import os
+import time
+
+from agents.job_scraper import JobScraperAgent
+from agents.parser_backends import available_backends
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tests', 'fixtures', '*.html')
+
+def benchmark(pages, backend, rounds):
+    """
+    Parse every page rounds times with one backend
+
+    Returns:
+        tuple: (jobs parsed, seconds elapsed)
+    """
+    scraper = JobScraperAgent(parser=backend)
+    jobs = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for html in pages:
+            jobs += len(scraper.parse_search_results(html))
+    return jobs, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('pages', nargs='*', help='Recorded result pages (default: tests/fixtures/*.html)')
+    parser.add_argument('--rounds', type=int, default=20, help='Times each page is parsed per backend')
+    args = parser.parse_args()
+
+    # The scraper logs every page it parses; keep the benchmark output readable
+    logging.disable(logging.INFO)
+
+    paths = args.pages or sorted(glob.glob(FIXTURES))
+    pages = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            pages.append(f.read())
+    print(f"{len(pages)} pages, {sum(len(page) for page in pages) // 1024} KiB, {args.rounds} rounds")
+
+    for backend in available_backends():
+        jobs, elapsed = benchmark(pages, backend, args.rounds)
+        print(f"{backend:<12} {jobs / elapsed:10.0f} jobs/sec  ({elapsed:.2f}s for {jobs} jobs)")
+
+if __name__ == '__main__':
+    main()
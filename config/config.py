@@ -40,4 +40,117 @@ FLASK_CONFIG = {
 # OpenAI configuration
 OPENAI_MODEL = "gpt-3.5-turbo"
 MAX_TOKENS = 1000
-TEMPERATURE = 0.7
\ No newline at end of file
+TEMPERATURE = 0.7
+
+# Job scraper configuration
+SCRAPER_CONFIG = {
+    # Maximum keep-alive connections kept open per upstream host
+    "POOL_SIZE": int(os.getenv("SCRAPER_POOL_SIZE", "10")),
+    # Upper bound on fallback searches running at the same time
+    "MAX_CONCURRENT_SEARCHES": int(os.getenv("SCRAPER_MAX_CONCURRENT_SEARCHES", "4")),
+    # Seconds a search result stays cached (0 disables the cache)
+    "CACHE_TTL": int(os.getenv("SCRAPER_CACHE_TTL", "900")),
+    # Seconds before a cached result is refreshed in the background while still served
+    "CACHE_SOFT_TTL": int(os.getenv("SCRAPER_CACHE_SOFT_TTL", "300")),
+    # Most distinct searches kept in the cache before LRU eviction (high-water marks and
+    # fallback results each get the same limit of their own)
+    "CACHE_MAX_ENTRIES": int(os.getenv("SCRAPER_CACHE_MAX_ENTRIES", "256")),
+    # Where cached results live: "memory" (per process), "sqlite" (shared by the
+    # workers on one host) or "redis" (shared across hosts)
+    "CACHE_BACKEND": os.getenv("SCRAPER_CACHE_BACKEND", "memory"),
+    # SQLite file path or redis://host:port/db URL for the shared backends
+    "CACHE_URL": os.getenv("SCRAPER_CACHE_URL", ""),
+    # Seconds to remember which fallback step answered a search that found nothing
+    "NEGATIVE_CACHE_TTL": int(os.getenv("SCRAPER_NEGATIVE_CACHE_TTL", "600")),
+    # Seconds a worker may hold the fetch lease for a search before others take over
+    "LEASE_TTL": int(os.getenv("SCRAPER_LEASE_TTL", "30")),
+    # HTML parser for result pages: "html.parser" (pure Python), "lxml", or
+    # "strainer" (lxml limited to the result cards)
+    "PARSER_BACKEND": os.getenv("SCRAPER_PARSER_BACKEND", "html.parser"),
+    # Result pages read per search by crawl_usajobs
+    "MAX_PAGES": int(os.getenv("SCRAPER_MAX_PAGES", "1")),
+    # Jobs after which a crawl stops reading pages (0 for no limit)
+    "MAX_RESULTS": int(os.getenv("SCRAPER_MAX_RESULTS", "0")),
+    # Most result pages and jobs a search API request may ask for
+    "REQUEST_MAX_PAGES": int(os.getenv("SCRAPER_REQUEST_MAX_PAGES", "10")),
+    "REQUEST_MAX_RESULTS": int(os.getenv("SCRAPER_REQUEST_MAX_RESULTS", "500")),
+    # Seconds a multi-page crawl may take before returning what it has
+    "CRAWL_TIME_BUDGET": float(os.getenv("SCRAPER_CRAWL_TIME_BUDGET", "20")),
+    # USAJobs Search API credentials (https://developer.usajobs.gov); when both are
+    # set the scraper uses the JSON API instead of parsing result pages
+    "USAJOBS_API_KEY": os.getenv("USAJOBS_API_KEY", ""),
+    "USAJOBS_API_EMAIL": os.getenv("USAJOBS_API_EMAIL", ""),
+    "USAJOBS_API_URL": os.getenv("USAJOBS_API_URL", "https://data.usajobs.gov/api/search"),
+    # Records requested per API page (the API allows up to 500)
+    "API_RESULTS_PER_PAGE": int(os.getenv("USAJOBS_API_RESULTS_PER_PAGE", "500")),
+    # Seconds a job source may take before a multi-source search moves on without it
+    "SOURCE_TIMEOUT": float(os.getenv("SCRAPER_SOURCE_TIMEOUT", "20")),
+    # Concurrent searches allowed against any one job source
+    "SOURCE_MAX_CONCURRENCY": int(os.getenv("SCRAPER_SOURCE_MAX_CONCURRENCY", "2")),
+    # Requests per second allowed to any one upstream host, across all threads (0 for no
+    # limit; retry backoffs still apply)
+    "RATE_LIMIT": float(os.getenv("SCRAPER_RATE_LIMIT", "4")),
+    # Requests to a host that may go out back to back before the rate applies
+    "RATE_LIMIT_BURST": int(os.getenv("SCRAPER_RATE_LIMIT_BURST", "4")),
+    # Seconds a request may queue for a slot before it is given up
+    "RATE_LIMIT_MAX_WAIT": float(os.getenv("SCRAPER_RATE_LIMIT_MAX_WAIT", "10")),
+    # Where rate limiter state lives (same choices as CACHE_BACKEND, which it defaults
+    # to); "sqlite" or "redis" keep the limit across worker processes
+    "RATE_LIMIT_BACKEND": os.getenv("SCRAPER_RATE_LIMIT_BACKEND", ""),
+    # Circuit breaker per upstream host: it opens once at least CIRCUIT_MIN_CALLS requests
+    # were made in the last CIRCUIT_WINDOW seconds and CIRCUIT_FAILURE_RATE of them failed
+    # (or CIRCUIT_SLOW_CALL_RATE took over CIRCUIT_SLOW_CALL_SECONDS), then refuses
+    # requests for CIRCUIT_OPEN_SECONDS before letting a trial request through
+    "CIRCUIT_FAILURE_RATE": float(os.getenv("SCRAPER_CIRCUIT_FAILURE_RATE", "0.5")),
+    "CIRCUIT_SLOW_CALL_SECONDS": float(os.getenv("SCRAPER_CIRCUIT_SLOW_CALL_SECONDS", "10")),
+    "CIRCUIT_SLOW_CALL_RATE": float(os.getenv("SCRAPER_CIRCUIT_SLOW_CALL_RATE", "0.8")),
+    "CIRCUIT_MIN_CALLS": int(os.getenv("SCRAPER_CIRCUIT_MIN_CALLS", "5")),
+    "CIRCUIT_WINDOW": float(os.getenv("SCRAPER_CIRCUIT_WINDOW", "60")),
+    "CIRCUIT_OPEN_SECONDS": float(os.getenv("SCRAPER_CIRCUIT_OPEN_SECONDS", "30")),
+    # Seconds a job search request may take in total; upstream timeouts and retries are
+    # fitted into what is left, and the route answers with what it has when it runs out
+    "REQUEST_BUDGET": float(os.getenv("SCRAPER_REQUEST_BUDGET", "25")),
+    # Per-route overrides, as comma-separated view=seconds pairs (e.g. "search_jobs_api=40")
+    "ROUTE_BUDGETS": {name.strip(): float(seconds) for name, seconds in
+                      (pair.split("=", 1) for pair in os.getenv("SCRAPER_ROUTE_BUDGETS", "").split(",") if "=" in pair)},
+    # Refresh cached searches by reading only the postings newer than the newest one seen
+    "INCREMENTAL_REFRESH": os.getenv("SCRAPER_INCREMENTAL_REFRESH", "true").lower() in ("1", "true", "yes"),
+    # Result pages an incremental refresh reads looking for the newest seen posting
+    "INCREMENTAL_MAX_PAGES": int(os.getenv("SCRAPER_INCREMENTAL_MAX_PAGES", "5")),
+    # Seconds the newest seen posting of a search is remembered
+    "HIGH_WATER_TTL": int(os.getenv("SCRAPER_HIGH_WATER_TTL", "86400")),
+    # Seconds between background refreshes of popular searches (0, the default, disables
+    # prefetching; every worker process that serves requests runs its own prefetcher)
+    "PREFETCH_INTERVAL": int(os.getenv("SCRAPER_PREFETCH_INTERVAL", "0")),
+    # Most searched queries kept warm, on top of the default searches of the jobs page
+    "PREFETCH_HOT_QUERIES": int(os.getenv("SCRAPER_PREFETCH_HOT_QUERIES", "10")),
+    # Seconds of search history used to decide which queries are popular
+    "SEARCH_LOG_WINDOW": int(os.getenv("SCRAPER_SEARCH_LOG_WINDOW", "3600")),
+    # Fingerprint bits two postings may differ in and still count as copies of one posting
+    "DEDUP_MAX_DISTANCE": int(os.getenv("SCRAPER_DEDUP_MAX_DISTANCE", "3")),
+    # Postings remembered for spotting copies (the oldest are forgotten first)
+    "DEDUP_MAX_ENTRIES": int(os.getenv("SCRAPER_DEDUP_MAX_ENTRIES", "100000")),
+    # File holding the Bloom filter of seen job URLs (empty keeps it in memory only)
+    "SEEN_URLS_PATH": os.getenv("SCRAPER_SEEN_URLS_PATH", ""),
+    # URLs the seen-URL filter is sized for, and its false-positive rate at that size
+    "SEEN_URLS_CAPACITY": int(os.getenv("SCRAPER_SEEN_URLS_CAPACITY", "1000000")),
+    "SEEN_URLS_ERROR_RATE": float(os.getenv("SCRAPER_SEEN_URLS_ERROR_RATE", "0.001")),
+    # Fetch each result's announcement page in the background after a search, for its full text
+    "ENRICH_DETAILS": os.getenv("SCRAPER_ENRICH_DETAILS", "false").lower() in ("1", "true", "yes"),
+    # Announcement pages fetched at once
+    "DETAIL_WORKERS": int(os.getenv("SCRAPER_DETAIL_WORKERS", "4")),
+    # Announcement pages fetched per second from any one host. Detail fetches have their
+    # own budget, on top of RATE_LIMIT, so they never hold up searches
+    "DETAIL_RATE_LIMIT": float(os.getenv("SCRAPER_DETAIL_RATE_LIMIT", "1")),
+    # Seconds a background detail fetch may queue for a slot
+    "DETAIL_RATE_LIMIT_MAX_WAIT": float(os.getenv("SCRAPER_DETAIL_RATE_LIMIT_MAX_WAIT", "60")),
+    # Seconds enrich_jobs waits for announcement pages
+    "DETAIL_TIMEOUT": float(os.getenv("SCRAPER_DETAIL_TIMEOUT", "10")),
+    # Seconds and number of announcements whose full text is cached
+    "DETAIL_CACHE_TTL": int(os.getenv("SCRAPER_DETAIL_CACHE_TTL", "604800")),
+    "DETAIL_CACHE_ENTRIES": int(os.getenv("SCRAPER_DETAIL_CACHE_ENTRIES", "2048")),
+    # Scraped jobs written to the database per transaction
+    "JOB_UPSERT_BATCH_SIZE": int(os.getenv("SCRAPER_JOB_UPSERT_BATCH_SIZE", "1000")),
+    # Comma-separated Greenhouse board tokens searched alongside USAJobs
+    "GREENHOUSE_BOARDS": [board.strip() for board in os.getenv("SCRAPER_GREENHOUSE_BOARDS", "").split(",") if board.strip()],
+}
@@ -11,7 +11,9 @@ from datetime import datetime
 from flask import Flask, render_template, redirect, url_for, flash, request, jsonify
 from flask_login import LoginManager, UserMixin, login_user, logout_user, current_user, login_required
 from werkzeug.security import generate_password_hash, check_password_hash
-from agents.job_scraper import JobScraperAgent
+from agents.job_scraper import JobScraperAgent, SCRAPER_CONFIG
+from agents.deadline import with_deadline
+from agents.prefetch import SearchLog, PrefetchCrawler
 
 # Create the Flask application
 app = Flask(__name__)
@@ -42,6 +44,19 @@ logger = logging.getLogger(__name__)
 # Initialize job scraper
 job_scraper = JobScraperAgent()
 
+# Recent user searches; the most popular are kept warm in the cache
+search_log = SearchLog()
+prefetcher = PrefetchCrawler(job_scraper, search_log=search_log)
+if SCRAPER_CONFIG.get('PREFETCH_INTERVAL', 0) > 0:
+    prefetcher.init_app(app)
+
+# Async scraper for batch searches (optional, needs aiohttp)
+try:
+    from agents.async_job_scraper import AsyncJobScraperAgent
+    async_scraper = AsyncJobScraperAgent(scraper=job_scraper)
+except ImportError:
+    async_scraper = None
+
 # Define simple Job class
 class Job:
     def __init__(self, id, title, company, location, description, url="", source="Sample", date_posted=None):
@@ -138,6 +153,7 @@ def register():
 
 @app.route('/jobs')
 @login_required
+@with_deadline()
 def jobs():
     # Get search parameters
     keywords = request.args.get('keywords', '')
@@ -154,8 +170,9 @@ def jobs():
             global scraped_jobs, next_job_id
             scraped_jobs = []
             
-            # Search for jobs on USAJobs
-            usajobs_results = job_scraper.scrape_usajobs(keywords, location, job_type)
+            # Search for jobs on USAJobs (stale cached results are refreshed in the background)
+            search_log.record(keywords, location, job_type)
+            usajobs_results, freshness = job_scraper.search_usajobs(keywords, location, job_type)
             
             # Convert the dictionary results to Job objects
             for job_dict in usajobs_results:
@@ -180,7 +197,7 @@ def jobs():
                 flash("No jobs found matching your criteria. Try broadening your search.", "info")
                 return render_template('jobs.html', jobs=jobs_list, searched=True)
                 
-            return render_template('jobs.html', jobs=all_jobs, searched=True)
+            return render_template('jobs.html', jobs=all_jobs, searched=True, freshness=freshness)
             
         except Exception as e:
             logger.error(f"Error searching for jobs: {str(e)}")
@@ -192,6 +209,7 @@ def jobs():
     
 @app.route('/api/search-jobs', methods=['POST'])
 @login_required
+@with_deadline()
 def search_jobs_api():
     """API endpoint for job searches"""
     try:
@@ -201,7 +219,25 @@ def search_jobs_api():
         location = data.get('location', '')
         job_type = data.get('job_type', 'full-time')
         
+        # Several searches in one request are fetched concurrently
+        searches = data.get('searches')
+        if searches and async_scraper:
+            queries = [
+                (search.get('keywords', ''), search.get('location', ''), search.get('job_type', job_type))
+                for search in searches
+            ]
+            results = async_scraper.scrape_many_sync(queries)
+            return jsonify({
+                'success': True,
+                'results': [
+                    {'keywords': query[0], 'location': query[1], 'job_type': query[2],
+                     'jobs': jobs, 'count': len(jobs)}
+                    for query, jobs in zip(queries, results)
+                ]
+            })
+        
         # Search for jobs on USAJobs
+        search_log.record(keywords, location, job_type)
         usajobs_results = job_scraper.scrape_usajobs(keywords, location, job_type)
         
         # Return the results
@@ -20,6 +20,8 @@ class Job(db.Model):
     description = db.Column(db.Text, nullable=False)
     location = db.Column(db.String(200))
     url = db.Column(db.String(500), nullable=False)
+    url_key = db.Column(db.String(500), unique=True)  # Canonical URL, the key scraped jobs are upserted on
+    content_hash = db.Column(db.String(40))  # Fingerprint of the scraped fields, to skip unchanged rows
     date_posted = db.Column(db.DateTime, default=datetime.utcnow)
     source = db.Column(db.String(50))
     applicants_count = db.Column(db.Integer)
@@ -7,6 +7,7 @@ import io
 from app import app, db
 from models import User, Job, JobApplication
 from agents.job_scraper import JobScraperAgent
+from agents.deadline import with_deadline
 from agents.resume_optimizer import ResumeOptimizerAgent
 from agents.cover_letter_generator import CoverLetterGenerator
 from agents.application_submitter import ApplicationSubmitter
@@ -57,6 +58,7 @@ def jobs():
 
 @app.route('/search-jobs')
 @login_required
+@with_deadline()
 def search_jobs():
     if not current_user.resume_filename:
         flash('Please upload your resume before searching for jobs', 'warning')
@@ -77,6 +79,13 @@ def search_jobs():
         flash('No jobs found. Try different keywords or location.', 'info')
         return render_template('jobs.html', jobs=[])
 
+    try:
+        job_scraper.save_scraped_jobs(jobs, db.session, Job)
+    except Exception as e:
+        logging.error(f"Error saving scraped jobs: {str(e)}")
+    # Full announcements are fetched in the background, ready for resume optimization
+    job_scraper.prefetch_details(jobs)
+
     preferences = {'title': keywords, 'location': location}
     filtered_jobs = job_scraper.filter_jobs(jobs, preferences)
 
@@ -146,6 +155,7 @@ def download_resume():
 
 @app.route('/optimize-resume/<int:job_id>', methods=['GET', 'POST'])
 @login_required
+@with_deadline()
 def optimize_resume(job_id):
     job = Job.query.get_or_404(job_id)
 
@@ -164,7 +174,7 @@ def optimize_resume(job_id):
         logging.info(f"Starting resume optimization for job {job_id}")
         optimization_result = resume_optimizer.optimize_resume(
             current_user.resume_text,
-            job.description
+            job_scraper.full_description(job.url, job.description)
         )
 
         if optimization_result and 'optimized_resume' in optimization_result:
@@ -211,13 +221,14 @@ def applications():
 
 @app.route('/apply-job/<int:job_id>', methods=['POST'])
 @login_required
+@with_deadline()
 def apply_job(job_id):
     job = Job.query.get_or_404(job_id)
 
     try:
         # Generate cover letter
         cover_letter_result = cover_letter_generator.generate_cover_letter(
-            job.description, 
+            job_scraper.full_description(job.url, job.description), 
             current_user.resume_text,
             job.company
         )
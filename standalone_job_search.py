@@ -8,13 +8,20 @@ import time
 import logging
 import os
 import random
-import requests
-from bs4 import BeautifulSoup
+import json
 from datetime import datetime
+from functools import partial
 from dotenv import load_dotenv
-from flask import Flask, render_template, redirect, url_for, flash, request, jsonify
+from flask import Flask, render_template, redirect, url_for, flash, request, jsonify, Response, stream_with_context, get_template_attribute
 from flask_login import LoginManager, UserMixin, login_user, logout_user, current_user, login_required
 from werkzeug.security import generate_password_hash, check_password_hash
+from agents.job_scraper import JobScraperAgent as BaseJobScraperAgent, SCRAPER_CONFIG
+from agents.search_executor import SearchExecutor
+from agents.search_cache import FallbackCache
+from agents.job_sources import create_source_registry
+from agents.deadline import with_deadline, iter_with_deadline, route_budget, deadline_expired
+from agents.prefetch import SearchLog, PrefetchCrawler
+from agents.dedup import DedupIndex
 
 # Load environment variables
 load_dotenv()
@@ -46,11 +53,8 @@ class User(UserMixin):
         self.email = email
         self.password_hash = password_hash
 
-# Job Scraper implementation
-class JobScraperAgent:
-    def __init__(self):
-        self.logger = logging.getLogger(__name__)
-    
+# Job Scraper implementation - reuses the shared agent's pooled session and USAJobs parser
+class JobScraperAgent(BaseJobScraperAgent):
     def get_sample_jobs(self):
         """Return sample jobs without database dependencies"""
         self.logger.info("Returning sample jobs")
@@ -119,165 +123,181 @@ class JobScraperAgent:
             return filtered_jobs
         
         return jobs_from_api
+
+# Initialize scraper and the executor used for fallback searches
+job_scraper = JobScraperAgent()
+search_executor = SearchExecutor()
+# Remembers which fallback step answered searches that came back empty
+fallback_cache = FallbackCache(job_scraper.cache.backend)
+# USAJobs plus any other configured job sources, searched concurrently
+source_registry = create_source_registry(job_scraper)
+
+# Use a list of guaranteed popular jobs that exist on USAJobs frequently
+DEFAULT_SEARCHES = [
+    {"keywords": "analyst", "location": ""},             # Very common job title
+    {"keywords": "assistant", "location": ""},           # Very common job title
+    {"keywords": "specialist", "location": ""},          # Very common job title
+    {"keywords": "technician", "location": ""},          # Common technical job
+    {"keywords": "administrator", "location": ""},       # Common admin job
+    {"keywords": "clerk", "location": ""},               # Very common entry-level
+    {"keywords": "coordinator", "location": ""},         # Common job title
+    {"keywords": "program", "location": ""},             # Matches program manager/analyst
+    {"keywords": "IT ", "location": ""},                 # IT positions (note space to avoid matching "position")
+    {"keywords": "nursing", "location": ""},             # Healthcare positions
+    {"keywords": "security", "location": ""}             # Security positions
+]
+
+# Also try some location-specific searches if keyword searches fail
+LOCATION_SEARCHES = [
+    {"keywords": "", "location": "Washington DC"},      # DC has many federal jobs
+    {"keywords": "", "location": "Arlington VA"},       # VA has many federal jobs
+    {"keywords": "", "location": "Remote"}              # Remote jobs
+]
+
+# A few very basic terms that should always return results
+GENERIC_TERMS = ["job", "position", "vacancy", "career", "work"]
+
+# Fallback cache marker for searches that only sample data answers
+SAMPLE_DATA_STEP = "sample data"
+
+# Map of related job titles to try
+RELATED_TERMS = {
+    "engineer": ["engineering", "developer", "technical"],
+    "developer": ["engineer", "programmer", "software"],
+    "manager": ["director", "supervisor", "lead"],
+    "analyst": ["specialist", "consultant", "researcher"],
+    "assistant": ["aide", "support", "coordinator"],
+    "administrator": ["manager", "specialist", "coordinator"]
+}
+
+# Recent user searches; the most popular are kept warm in the cache along with
+# the default searches of the unfiltered jobs page
+search_log = SearchLog()
+prefetcher = PrefetchCrawler(
+    job_scraper,
+    queries=[(search['keywords'], search['location']) for search in DEFAULT_SEARCHES + LOCATION_SEARCHES],
+    search_log=search_log
+)
+if SCRAPER_CONFIG.get('PREFETCH_INTERVAL', 0) > 0:
+    prefetcher.init_app(app)
+
+def default_searches(job_type):
+    """Candidate searches for the unfiltered jobs page, in priority order"""
+    searches = []
+    for search in DEFAULT_SEARCHES + LOCATION_SEARCHES:
+        label = search['keywords'] or search['location']
+        searches.append((label, partial(job_scraper.scrape_usajobs, search['keywords'], search['location'], job_type)))
+    for term in GENERIC_TERMS:
+        searches.append((term, partial(job_scraper.scrape_usajobs, term, "", job_type)))
+    return searches
+
+def fallback_searches(keywords, location, job_type):
+    """Alternative searches for a query that returned nothing, in priority order"""
+    searches = []
     
-    def scrape_usajobs(self, keywords, location, job_type="full-time"):
-        """
-        Scrape jobs from USAJobs.gov using their search API
-        """
-        self.logger.info(f"Scraping USAJobs - Keywords: {keywords}, Location: {location}, Type: {job_type}")
-        
-        try:
-            # Format search parameters
-            keyword_param = keywords.replace(" ", "+") if keywords else ""
-            location_param = location.replace(" ", "+") if location else ""
-            
-            # Base URL for USA Jobs search
-            base_url = "https://www.usajobs.gov/Search/Results"
-            
-            # Construct search URL - using their URL pattern
-            search_url = f"{base_url}?k={keyword_param}&l={location_param}"
-            
-            # Add job type parameter if specified
-            if job_type and job_type != "all":
-                if job_type == "full-time":
-                    search_url += "&ft=1"  # Full-time parameter
-                elif job_type == "part-time":
-                    search_url += "&ft=2"  # Part-time parameter
-                elif job_type == "internship":
-                    search_url += "&hp=student"  # Student/internship parameter
-            
-            # Make request with appropriate headers
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Referer': 'https://www.usajobs.gov/'
-            }
-            
-            response = requests.get(search_url, headers=headers)
-            
-            # Check response status
-            if response.status_code != 200:
-                self.logger.error(f"Error scraping USAJobs: Status code {response.status_code}")
-                return []
-                
-            # Parse HTML content
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Find job listings
-            job_listings = []
-            
-            # USAJobs may have updated their class names, try different selectors
-            # Each job is in a div with either class 'usajobs-search-result--core' or similar
-            job_divs = soup.select('.usajobs-search-result--core, .usajobs-search-result, article.usajobs-search-result')
-            
-            # If we didn't find any jobs with the selectors, try looking for article tags
-            if not job_divs:
-                job_divs = soup.select('article')
-            
-            for job_div in job_divs:
-                try:
-                    # Extract job details - try multiple selectors to handle different HTML structures
-                    # Title selectors
-                    title_elem = (
-                        job_div.select_one('.usajobs-search-result__title a') or
-                        job_div.select_one('h3.usajobs-search-result__title a') or
-                        job_div.select_one('h3 a') or
-                        job_div.select_one('a[data-test="job-title"]') or
-                        job_div.select_one('a.usa-link')
-                    )
-                    
-                    # Company selectors
-                    company_elem = (
-                        job_div.select_one('.usajobs-search-result__department') or
-                        job_div.select_one('.agency') or
-                        job_div.select_one('.department') or
-                        job_div.select_one('[data-test="agency-name"]') or
-                        job_div.select_one('div.usajobs-search-result__header span')
-                    )
-                    
-                    # Location selectors
-                    location_elem = (
-                        job_div.select_one('.usajobs-search-result__location') or
-                        job_div.select_one('.location') or
-                        job_div.select_one('[data-test="location"]') or
-                        job_div.select_one('div[itemprop="jobLocation"]')
-                    )
-                    
-                    # Skip if essential elements are missing
-                    if not title_elem:
-                        self.logger.warning(f"Skipping job: unable to find title element")
-                        continue
-                        
-                    # Get job title and URL
-                    title = title_elem.text.strip()
-                    # Handle different URL formats
-                    if title_elem.has_attr('href'):
-                        href = title_elem['href']
-                        if href.startswith('http'):
-                            job_url = href
-                        else:
-                            job_url = "https://www.usajobs.gov" + href
-                    else:
-                        job_url = "https://www.usajobs.gov/Search/Results"
-                    
-                    # Get company/agency
-                    company = company_elem.text.strip() if company_elem else "Unknown Agency"
-                    
-                    # Get location
-                    location = location_elem.text.strip() if location_elem else "Various Locations"
-                    
-                    # Try to get description snippet with multiple selectors
-                    description_elem = (
-                        job_div.select_one('.usajobs-search-result__body') or
-                        job_div.select_one('.summary') or
-                        job_div.select_one('[data-test="job-description"]') or
-                        job_div.select_one('div[itemprop="description"]') or
-                        job_div.select_one('p.usa-prose')
-                    )
-                    description = description_elem.text.strip() if description_elem else "No description available."
-                    
-                    # Extract salary information if available - try multiple selectors
-                    salary_elem = (
-                        job_div.select_one('.usajobs-search-result__salary') or
-                        job_div.select_one('.salary') or
-                        job_div.select_one('[data-test="salary"]') or
-                        job_div.select_one('div[itemprop="baseSalary"]') or
-                        job_div.select_one('div.salary')
-                    )
-                    salary = salary_elem.text.strip() if salary_elem else "Salary not specified"
-                    
-                    # Create job dictionary
-                    job = {
-                        'title': title,
-                        'company': company,
-                        'location': location,
-                        'description': description,
-                        'salary': salary,
-                        'url': job_url,
-                        'source': 'USAJobs.gov',
-                        'date_posted': datetime.utcnow()
-                    }
-                    
-                    job_listings.append(job)
-                    
-                except Exception as e:
-                    self.logger.error(f"Error parsing job listing: {str(e)}")
-                    continue
-            
-            self.logger.info(f"Scraped {len(job_listings)} jobs from USAJobs")
-            return job_listings
-            
-        except Exception as e:
-            self.logger.error(f"Error scraping USAJobs: {str(e)}")
-            return []
+    # 1. Try without location constraint if one was provided
+    if location:
+        searches.append(("without location", partial(job_scraper.scrape_usajobs, keywords, "", job_type)))
     
-    def filter_jobs(self, jobs, preferences):
-        """Apply additional filtering if needed - currently returns all jobs as they're pre-filtered"""
-        return jobs if jobs else []
+    # 2. Try with broader keyword if specific keywords were provided
+    if keywords and len(keywords) > 3:
+        # Get the first word of the keywords as a more general search
+        broader_term = keywords.split()[0]
+        if broader_term != keywords:
+            searches.append((f"broader term {broader_term}", partial(job_scraper.scrape_usajobs, broader_term, "", job_type)))
+    
+    # 3. Try with similar/related keywords
+    if keywords:
+        for word in keywords.lower().split():
+            for related in RELATED_TERMS.get(word, []):
+                searches.append((f"related term {related}", partial(job_scraper.scrape_usajobs, related, "", job_type)))
+    
+    return searches
 
-# Initialize scraper
-job_scraper = JobScraperAgent()
+def sample_results(keywords, location):
+    """Sample data filtered with fuzzy keyword matching, the last fallback step"""
+    results = []
+    for job_dict in job_scraper.get_sample_jobs():
+        # More flexible keyword matching
+        keyword_match = True  # Default true if no keywords provided
+        if keywords:
+            # Break keywords into parts and check if ANY part matches
+            keyword_parts = keywords.lower().split()
+            keyword_match = any(
+                part in job_dict['title'].lower() or
+                part in job_dict['description'].lower() or
+                part in job_dict['company'].lower()
+                for part in keyword_parts
+            )
+        
+        location_match = not location or (
+            location.lower() in job_dict['location'].lower() or
+            location.lower() in job_dict['company'].lower()
+        )
+        
+        if keyword_match and location_match:
+            results.append(job_dict)
+    return results
+
+def search_with_fallbacks(keywords, location, job_type):
+    """
+    Search USAJobs, falling back to alternative searches and then sample data
+    
+    The step that finally answers a search is remembered in the fallback cache,
+    so repeating the search jumps straight to that step until the entry expires.
+    
+    Returns:
+        tuple: (list of job dictionaries, freshness dict or None)
+    """
+    search_log.record(keywords, location, job_type)
+    
+    # If no search parameters, use default searches that should return results
+    if not keywords and not location:
+        searches = default_searches(job_type)
+    else:
+        searches = fallback_searches(keywords, location, job_type)
+    
+    remembered = fallback_cache.get(keywords, location, job_type)
+    if remembered == SAMPLE_DATA_STEP:
+        logger.info("Fallback cache: no search answers this query, using sample data")
+        return sample_results(keywords, location), None
+    if remembered:
+        search = dict(searches).get(remembered)
+        results = search() if search else []
+        if results:
+            logger.info(f"Fallback cache: found {len(results)} jobs with remembered search '{remembered}'")
+            return results, None
+        # The remembered step stopped answering, run the whole cascade again
+        # (unless USAJobs is just unreachable or the request ran out of time)
+        if not (job_scraper.circuit_open() or deadline_expired()):
+            fallback_cache.invalidate(keywords, location, job_type)
+    
+    if keywords or location:
+        if len(source_registry.enabled()) > 1:
+            # Other job sources are configured, search them all at once
+            results, freshness = source_registry.search(keywords, location, job_type), None
+        else:
+            results, freshness = job_scraper.search_usajobs(keywords, location, job_type)
+        if results:
+            return results, freshness
+        logger.info("No USAJobs results, trying alternative searches")
+    
+    # Run the alternative searches concurrently, keeping the first one
+    # (in priority order) that returns jobs
+    label, results = search_executor.first_non_empty(searches)
+    if results:
+        logger.info(f"Found {len(results)} jobs with alternative search '{label}'")
+        fallback_cache.set(keywords, location, job_type, label)
+        return results, None
+    
+    # If absolutely everything failed, fall back to sample data
+    if job_scraper.circuit_open() or deadline_expired():
+        # USAJobs is down or slow rather than empty, so don't remember sample data for this search
+        logger.info("USAJobs is unavailable or the request ran out of time, falling back to sample data")
+        return sample_results(keywords, location), None
+    logger.info("All searches failed, falling back to sample data")
+    fallback_cache.set(keywords, location, job_type, SAMPLE_DATA_STEP)
+    return sample_results(keywords, location), None
 
 # Define Job class 
 class Job:
@@ -296,6 +316,24 @@ class Job:
 scraped_jobs = []
 next_job_id = 4  # Start after the sample jobs
 
+def add_scraped_job(job_dict):
+    """Convert a scraped job dictionary to a Job and keep it for the resume optimizer"""
+    global next_job_id
+    job = Job(
+        id=next_job_id,
+        title=job_dict['title'],
+        company=job_dict['company'],
+        location=job_dict['location'],
+        description=job_dict['description'],
+        url=job_dict['url'],
+        source=job_dict['source'],
+        date_posted=job_dict['date_posted'],
+        salary=job_dict.get('salary', 'Salary not specified')
+    )
+    scraped_jobs.append(job)
+    next_job_id += 1
+    return job
+
 # Sample job listings
 jobs_list = [
     Job(1, "Software Engineer", "Google", "Mountain View, CA", "Build amazing software.", 
@@ -376,6 +414,7 @@ def register():
 
 @app.route('/jobs')
 @login_required
+@with_deadline()
 def jobs():
     # Get search parameters
     keywords = request.args.get('keywords', '')
@@ -384,165 +423,16 @@ def jobs():
     
     try:
         # Clear previous scraped jobs
-        global scraped_jobs, next_job_id
+        global scraped_jobs
         scraped_jobs = []
         
-        # If no search parameters, use default searches that should return results
-        if not keywords and not location:
-            # Use a list of guaranteed popular jobs that exist on USAJobs frequently
-            default_searches = [
-                {"keywords": "analyst", "location": ""},             # Very common job title
-                {"keywords": "assistant", "location": ""},           # Very common job title
-                {"keywords": "specialist", "location": ""},          # Very common job title
-                {"keywords": "technician", "location": ""},          # Common technical job
-                {"keywords": "administrator", "location": ""},       # Common admin job
-                {"keywords": "clerk", "location": ""},               # Very common entry-level
-                {"keywords": "coordinator", "location": ""},         # Common job title
-                {"keywords": "program", "location": ""},             # Matches program manager/analyst
-                {"keywords": "IT ", "location": ""},                 # IT positions (note space to avoid matching "position")
-                {"keywords": "nursing", "location": ""},             # Healthcare positions
-                {"keywords": "security", "location": ""}             # Security positions
-            ]
-            
-            # Also try some location-specific searches if keyword searches fail
-            location_searches = [
-                {"keywords": "", "location": "Washington DC"},      # DC has many federal jobs
-                {"keywords": "", "location": "Arlington VA"},       # VA has many federal jobs
-                {"keywords": "", "location": "Remote"}              # Remote jobs
-            ]
-            
-            # First try keyword-based searches
-            usajobs_results = []
-            for search in default_searches:
-                # Try each default search until we get some results
-                logger.info(f"Trying default search - Keywords: {search['keywords']}, Location: {search['location']}")
-                results = job_scraper.scrape_usajobs(search['keywords'], search['location'], job_type)
-                if results and len(results) > 0:
-                    logger.info(f"Found {len(results)} jobs with default search")
-                    usajobs_results = results
-                    break
-                # Small delay to avoid rate limiting
-                time.sleep(0.5)
-            
-            # If all keyword searches failed, try location-based searches
-            if not usajobs_results:
-                logger.info("Keyword searches failed, trying location-based searches")
-                for search in location_searches:
-                    logger.info(f"Trying location search - Location: {search['location']}")
-                    results = job_scraper.scrape_usajobs(search['keywords'], search['location'], job_type)
-                    if results and len(results) > 0:
-                        logger.info(f"Found {len(results)} jobs with location search")
-                        usajobs_results = results
-                        break
-                    # Small delay to avoid rate limiting
-                    time.sleep(0.5)
-            
-            # If all searches failed, try one final broad search
-            if not usajobs_results:
-                logger.info("Trying generic searches")
-                # Try a few very basic terms that should always return results
-                for term in ["job", "position", "vacancy", "career", "work"]:
-                    results = job_scraper.scrape_usajobs(term, "", job_type)
-                    if results and len(results) > 0:
-                        logger.info(f"Found {len(results)} jobs with generic '{term}' search")
-                        usajobs_results = results
-                        break
-                    # Small delay to avoid rate limiting
-                    time.sleep(0.5)
-                    
-                # If absolutely everything failed, fall back to sample data
-                if not usajobs_results:
-                    logger.info("All searches failed, using sample data")
-                    usajobs_results = job_scraper.get_sample_jobs()
-        else:
-            # User provided search parameters
+        if keywords or location:
             logger.info(f"Searching jobs - Keywords: {keywords}, Location: {location}, Type: {job_type}")
-            usajobs_results = job_scraper.scrape_usajobs(keywords, location, job_type)
-            
-            # If no USAJobs results, try multiple alternative approaches
-            if not usajobs_results:
-                logger.info("No USAJobs results, trying alternative searches")
-                
-                # 1. Try without location constraint if one was provided
-                if location:
-                    logger.info(f"Trying search without location - Keywords: {keywords}")
-                    usajobs_results = job_scraper.scrape_usajobs(keywords, "", job_type)
-                
-                # 2. Try with broader keyword if specific keywords were provided
-                if not usajobs_results and keywords and len(keywords) > 3:
-                    # Get the first word of the keywords as a more general search
-                    broader_term = keywords.split()[0]
-                    if broader_term != keywords:
-                        logger.info(f"Trying broader search term: {broader_term}")
-                        usajobs_results = job_scraper.scrape_usajobs(broader_term, "", job_type)
-                
-                # 3. Try with similar/related keywords
-                if not usajobs_results and keywords:
-                    # Map of related job titles to try
-                    related_terms = {
-                        "engineer": ["engineering", "developer", "technical"],
-                        "developer": ["engineer", "programmer", "software"],
-                        "manager": ["director", "supervisor", "lead"],
-                        "analyst": ["specialist", "consultant", "researcher"],
-                        "assistant": ["aide", "support", "coordinator"],
-                        "administrator": ["manager", "specialist", "coordinator"]
-                    }
-                    
-                    # Check if any word in the keywords matches our related terms
-                    for word in keywords.lower().split():
-                        if word in related_terms:
-                            for related in related_terms[word]:
-                                logger.info(f"Trying related search term: {related}")
-                                related_results = job_scraper.scrape_usajobs(related, "", job_type)
-                                if related_results:
-                                    usajobs_results = related_results
-                                    break
-                            if usajobs_results:
-                                break
-                
-                # 4. If still no results, fall back to sample data with filtering
-                if not usajobs_results:
-                    logger.info("All alternative searches failed, falling back to sample data")
-                    sample_data = job_scraper.get_sample_jobs()
-                    
-                    # For sample data, apply fuzzy matching to keywords
-                    for job_dict in sample_data:
-                        # More flexible keyword matching
-                        keyword_match = True  # Default true if no keywords provided
-                        if keywords:
-                            # Break keywords into parts and check if ANY part matches
-                            keyword_parts = keywords.lower().split()
-                            keyword_match = any(
-                                part in job_dict['title'].lower() or
-                                part in job_dict['description'].lower() or
-                                part in job_dict['company'].lower()
-                                for part in keyword_parts
-                            )
-                        
-                        # Location matching (unchanged)
-                        location_match = not location or (
-                            location.lower() in job_dict['location'].lower() or
-                            location.lower() in job_dict['company'].lower()
-                        )
-                        
-                        if keyword_match and location_match:
-                            usajobs_results.append(job_dict)
+        usajobs_results, freshness = search_with_fallbacks(keywords, location, job_type)
         
         # Convert the dictionary results to Job objects
         for job_dict in usajobs_results:
-            job = Job(
-                id=next_job_id,
-                title=job_dict['title'],
-                company=job_dict['company'],
-                location=job_dict['location'],
-                description=job_dict['description'],
-                url=job_dict['url'],
-                source=job_dict['source'],
-                date_posted=job_dict['date_posted'],
-                salary=job_dict.get('salary', 'Salary not specified')
-            )
-            scraped_jobs.append(job)
-            next_job_id += 1
+            add_scraped_job(job_dict)
             
         # Use scraped jobs for display
         all_jobs = scraped_jobs
@@ -550,17 +440,41 @@ def jobs():
         # If no jobs were found, show a message
         if not all_jobs:
             flash("No jobs found matching your criteria. Try broadening your search.", "info")
-            return render_template('jobs.html', jobs=jobs_list, searched=True)
+            return render_template('jobs.html', jobs=jobs_list, searched=True,
+                                   stream_url=url_for('search_jobs_stream'))
             
-        return render_template('jobs.html', jobs=all_jobs, searched=True)
+        return render_template('jobs.html', jobs=all_jobs, searched=True, freshness=freshness,
+                               stream_url=url_for('search_jobs_stream'))
         
     except Exception as e:
         logger.error(f"Error searching for jobs: {str(e)}")
         flash("An error occurred while searching for jobs. Please try again.", "danger")
-        return render_template('jobs.html', jobs=jobs_list)
+        return render_template('jobs.html', jobs=jobs_list, stream_url=url_for('search_jobs_stream'))
+
+def crawl_limit(data, name, minimum, limit):
+    """
+    A page or result limit from a search request, capped at the configured limit
+
+    Returns:
+        int: The limit, or None when the request doesn't set it
+
+    Raises:
+        ValueError: When the value isn't an integer of at least minimum
+    """
+    value = data.get(name)
+    if value is None:
+        return None
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be an integer")
+    if value < minimum:
+        raise ValueError(f"{name} must be at least {minimum}")
+    return min(value, limit)
 
 @app.route('/api/search-jobs', methods=['POST'])
 @login_required
+@with_deadline()
 def search_jobs_api():
     """API endpoint for job searches"""
     try:
@@ -569,9 +483,21 @@ def search_jobs_api():
         keywords = data.get('keywords', '')
         location = data.get('location', '')
         job_type = data.get('job_type', 'full-time')
+        try:
+            max_pages = crawl_limit(data, 'max_pages', 1, SCRAPER_CONFIG.get('REQUEST_MAX_PAGES', 10))
+            max_results = crawl_limit(data, 'max_results', 1, SCRAPER_CONFIG.get('REQUEST_MAX_RESULTS', 500))
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
         
-        # Search for jobs on USAJobs
-        usajobs_results = job_scraper.scrape_usajobs(keywords, location, job_type)
+        # Search for jobs on USAJobs, reading several result pages when asked to
+        if max_pages or max_results:
+            usajobs_results = job_scraper.crawl_usajobs(keywords, location, job_type,
+                                                        max_pages=max_pages, max_results=max_results)
+        else:
+            usajobs_results = job_scraper.scrape_usajobs(keywords, location, job_type)
         
         # Return the results
         return jsonify({
@@ -587,6 +513,140 @@ def search_jobs_api():
             'error': str(e)
         }), 500
 
+def sse_event(event, data):
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def stream_search_events(keywords, location, job_type):
+    """
+    Run the same fallback cascade as search_with_fallbacks, as Server-Sent Events
+
+    Each fallback step reports a progress event, and every job is sent as a job
+    event (with its rendered card and details modal) as soon as it is parsed.
+
+    Yields:
+        str: Formatted events, ending with a done event
+    """
+    card = get_template_attribute('_job_card.html', 'job_card')
+    modal = get_template_attribute('_job_card.html', 'job_modal')
+    found = 0
+    # Cards already sent can't be merged, so later copies are just left out
+    sent = DedupIndex()
+
+    def progress(step, message, **extra):
+        return sse_event('progress', dict(step=step, message=message, **extra))
+
+    def job_events(job_dicts):
+        nonlocal found
+        for job_dict in job_dicts:
+            if sent.add(job_dict):
+                continue
+            job = add_scraped_job(job_dict)
+            found += 1
+            yield sse_event('job', {'id': job.id, 'title': job.title,
+                                    'card': str(card(job)), 'modal': str(modal(job))})
+
+    search_log.record(keywords, location, job_type)
+    if not keywords and not location:
+        searches = default_searches(job_type)
+    else:
+        searches = fallback_searches(keywords, location, job_type)
+
+    remembered = fallback_cache.get(keywords, location, job_type)
+    if remembered and remembered != SAMPLE_DATA_STEP:
+        search = dict(searches).get(remembered)
+        yield progress(remembered, f"Searching USAJobs.gov for {remembered}...")
+        yield from job_events(search() if search else [])
+        if found:
+            yield sse_event('done', {'count': found, 'step': remembered})
+            return
+        if not (job_scraper.circuit_open() or deadline_expired()):
+            fallback_cache.invalidate(keywords, location, job_type)
+        remembered = None
+
+    if remembered is None and (keywords or location):
+        if len(source_registry.enabled()) > 1:
+            # Every source is searched at once; jobs are sent as each one finishes
+            step = 'sources'
+            yield progress(step, "Searching all job sources...")
+            for name, jobs in source_registry.iter_search(keywords, location, job_type):
+                yield progress(name, f"{name}: {len(jobs)} jobs", count=len(jobs))
+                yield from job_events(jobs)
+        else:
+            step = 'usajobs'
+            yield progress(step, "Searching USAJobs.gov...")
+            yield from job_events(job_scraper.stream_usajobs(keywords, location, job_type))
+        if found:
+            yield sse_event('done', {'count': found, 'step': step})
+            return
+
+    if remembered is None:
+        yield progress('alternatives', "No exact matches, trying alternative searches...")
+        for label, results in search_executor.iter_results(searches):
+            yield progress(label, f"Tried {label}: {len(results)} jobs", count=len(results))
+            if results:
+                fallback_cache.set(keywords, location, job_type, label)
+                yield from job_events(results)
+                yield sse_event('done', {'count': found, 'step': label})
+                return
+        if not (job_scraper.circuit_open() or deadline_expired()):
+            fallback_cache.set(keywords, location, job_type, SAMPLE_DATA_STEP)
+
+    yield progress(SAMPLE_DATA_STEP, "No USAJobs results, showing sample jobs")
+    yield from job_events(sample_results(keywords, location))
+    yield sse_event('done', {'count': found, 'step': SAMPLE_DATA_STEP})
+
+@app.route('/api/search-jobs/stream')
+@login_required
+def search_jobs_stream():
+    """Job search that streams progress and results as Server-Sent Events"""
+    keywords = request.args.get('keywords', '')
+    location = request.args.get('location', '')
+    job_type = request.args.get('job_type', 'full-time')
+
+    # Each streamed search replaces the previous results, like the jobs page
+    global scraped_jobs
+    scraped_jobs = []
+
+    def generate():
+        try:
+            # The budget starts with the response body, which is generated after this view returns
+            yield from iter_with_deadline(route_budget('search_jobs_stream'),
+                                          stream_search_events(keywords, location, job_type))
+        except Exception as e:
+            logger.error(f"Error in streaming job search: {str(e)}")
+            yield sse_event('error', {'error': str(e)})
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/search-cache', methods=['GET', 'DELETE'])
+@login_required
+def search_cache_api():
+    """Search cache statistics (GET) and manual invalidation (DELETE)"""
+    if request.method == 'DELETE':
+        data = request.get_json(silent=True) or {}
+        removed = job_scraper.invalidate_cache(
+            data.get('keywords'), data.get('location'), data.get('job_type')
+        )
+        return jsonify({'success': True, 'removed': removed})
+    
+    return jsonify({'success': True, 'cache': job_scraper.cache_stats()})
+
+@app.route('/api/scraper-status')
+@login_required
+def scraper_status_api():
+    """Health counters of the USAJobs scraper"""
+    return jsonify({
+        'success': True,
+        'selectors': job_scraper.selector_stats(),
+        'upstream': job_scraper.upstream_host(),
+        'circuits': job_scraper.circuit_stats(),
+        'prefetch': prefetcher.stats(),
+        'seen_urls': job_scraper.seen_urls.stats(),
+        'details': job_scraper.details.stats()
+    })
+
 @app.route('/logout')
 def logout():
     # Logout functionality
@@ -596,12 +656,16 @@ def logout():
 
 @app.route('/optimize_resume/<int:job_id>')
 @login_required
+@with_deadline()
 def optimize_resume(job_id):
     # Find the job by id
     job = next((j for j in jobs_list + scraped_jobs if j.id == job_id), None)
     if not job:
         flash('Job not found', 'danger')
         return redirect(url_for('jobs'))
+    if job.source != 'Sample Data':
+        # The search snippet is too short to tailor a resume to
+        job.description = job_scraper.full_description(job.url, job.description)
     return render_template('optimize_resume.html', job=job)
 
 @app.route('/optimize-resume/<int:job_id>', methods=['POST'])
@@ -21,11 +21,7 @@ document.addEventListener('DOMContentLoaded', function() {
                 
                 // Only search if at least one field has content
                 if (searchParams.keywords || searchParams.location) {
-                    // Show loading state
-                    document.getElementById('job-listings').innerHTML = '<div class="text-center"><div class="spinner-border" role="status"></div></div>';
-                    
-                    // Perform the search
-                    window.location.href = '/jobs?' + new URLSearchParams(searchParams);
+                    performSearch(searchParams);
                 }
             }, 600); // Delay for typing
         }
@@ -45,12 +41,80 @@ document.addEventListener('DOMContentLoaded', function() {
                 'job-type': formData.get('job-type')
             };
 
-            // Show loading state
-            document.getElementById('job-listings').innerHTML = '<div class="text-center"><div class="spinner-border" role="status"></div></div>';
-
-            // Perform the search by redirecting to the URL with search parameters
-            window.location.href = '/jobs?' + new URLSearchParams(searchParams);
+            performSearch(searchParams);
         });
+
+        // Stream results into the page when the server supports it, otherwise
+        // reload the jobs page with the search parameters
+        const streamUrl = jobSearchForm.dataset.streamUrl;
+        let activeSearch = null;
+
+        function performSearch(searchParams) {
+            const listings = document.getElementById('job-listings');
+            if (!streamUrl || !window.EventSource) {
+                // Show loading state
+                listings.innerHTML = '<div class="text-center"><div class="spinner-border" role="status"></div></div>';
+                window.location.href = '/jobs?' + new URLSearchParams(searchParams);
+                return;
+            }
+
+            if (activeSearch) {
+                activeSearch.close();
+            }
+            document.querySelectorAll('.modal[data-streamed]').forEach(modal => modal.remove());
+            history.replaceState(null, '', '/jobs?' + new URLSearchParams(searchParams));
+
+            listings.innerHTML = '<div class="alert alert-info mb-3" id="search-progress">' +
+                '<span class="spinner-border spinner-border-sm me-2" role="status"></span>' +
+                '<span class="progress-message">Searching USAJobs.gov...</span></div>';
+            const progressMessage = listings.querySelector('.progress-message');
+            let count = 0;
+
+            const source = new EventSource(streamUrl + '?' + new URLSearchParams({
+                keywords: searchParams.keywords || '',
+                location: searchParams.location || '',
+                job_type: searchParams['job-type'] || 'full-time'
+            }));
+            activeSearch = source;
+
+            source.addEventListener('progress', function(e) {
+                progressMessage.textContent = JSON.parse(e.data).message;
+            });
+
+            source.addEventListener('job', function(e) {
+                const job = JSON.parse(e.data);
+                listings.insertAdjacentHTML('beforeend', job.card);
+
+                // Modals live outside the listing, like on the rendered page
+                const holder = document.createElement('div');
+                holder.innerHTML = job.modal.trim();
+                const modal = holder.firstElementChild;
+                modal.dataset.streamed = '';
+                document.body.appendChild(modal);
+
+                count += 1;
+                progressMessage.textContent = `${count} jobs found so far...`;
+            });
+
+            source.addEventListener('done', function(e) {
+                source.close();
+                const spinner = listings.querySelector('#search-progress .spinner-border');
+                if (spinner) {
+                    spinner.remove();
+                }
+                progressMessage.textContent = count
+                    ? `Showing ${count} results`
+                    : 'No jobs found for your search criteria. Try different keywords or location.';
+            });
+
+            source.addEventListener('error', function() {
+                source.close();
+                // Nothing arrived: fall back to the regular jobs page
+                if (!count) {
+                    window.location.href = '/jobs?' + new URLSearchParams(searchParams);
+                }
+            });
+        }
     }
 
     // Apply for Job
@@ -0,0 +1,28 @@
+import threading
+import unittest
+from http.server import ThreadingHTTPServer
+
+class StubServerTestCase(unittest.TestCase):
+    """
+    Test case that serves a stub upstream on a local port while its tests run
+
+    Subclasses set handler to a BaseHTTPRequestHandler class; the server is
+    shared by the class's tests and reachable at cls.base.
+    """
+
+    handler = None
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), cls.handler)
+        # Requests left hanging by a test must not keep the server from closing
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
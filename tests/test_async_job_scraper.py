@@ -0,0 +1,81 @@
+import unittest
+import sys
+import os
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.job_scraper import JobScraperAgent
+from stub_server import StubServerTestCase
+
+try:
+    from agents.async_job_scraper import AsyncJobScraperAgent
+except ImportError:
+    AsyncJobScraperAgent = None
+
+RESULT_HTML = """
+<div class="usajobs-search-result">
+    <h3 class="usajobs-search-result__title">
+        <a href="/job/{keyword}">{keyword} Specialist</a>
+    </h3>
+    <div class="usajobs-search-result__department">Department of Technology</div>
+    <div class="usajobs-search-result__location">Washington, DC</div>
+    <div class="usajobs-search-result__body">Support {keyword} programs.</div>
+    <div class="usajobs-search-result__salary">$80,000 to $120,000 per year</div>
+</div>
+"""
+
+class StubUSAJobsHandler(BaseHTTPRequestHandler):
+    """Serves one result card per search, titled after the keyword"""
+
+    def do_GET(self):
+        keyword = parse_qs(urlparse(self.path).query).get('k', ['none'])[0]
+        body = RESULT_HTML.format(keyword=keyword).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+@unittest.skipIf(AsyncJobScraperAgent is None, "aiohttp is not installed")
+class TestAsyncJobScraper(StubServerTestCase):
+    handler = StubUSAJobsHandler
+
+    def setUp(self):
+        self.scraper = JobScraperAgent()
+        self.scraper.SEARCH_URL = f"{self.base}/Search/Results"
+        self.async_scraper = AsyncJobScraperAgent(scraper=self.scraper, max_concurrency=2)
+
+    def test_scrape_many_keeps_query_order(self):
+        """Results come back one list per query, in query order"""
+        queries = [("analyst", ""), ("clerk", "Remote", "part-time"), ("nurse", "", "all")]
+        results = self.async_scraper.scrape_many_sync(queries)
+
+        self.assertEqual(len(results), 3)
+        self.assertEqual([jobs[0]['title'] for jobs in results],
+                         ["analyst Specialist", "clerk Specialist", "nurse Specialist"])
+
+    def test_same_schema_as_sync_scraper(self):
+        """The async scraper returns the same job dictionaries as scrape_usajobs"""
+        async_jobs = self.async_scraper.scrape_usajobs_sync("analyst", "")
+        sync_jobs = self.scraper.scrape_usajobs("analyst", "")
+
+        self.assertEqual(len(async_jobs), 1)
+        for job in (async_jobs[0], sync_jobs[0]):
+            job.pop('date_posted')
+        self.assertEqual(async_jobs[0], sync_jobs[0])
+
+    def test_results_are_stored_like_sync_fetches(self):
+        """Async results are cached and move the search's high-water mark"""
+        jobs = self.async_scraper.scrape_usajobs_sync("analyst", "")
+
+        self.assertEqual(self.scraper.cache.peek("analyst", "", "full-time"), jobs)
+        self.assertIsNotNone(self.scraper.high_water_marks.get("analyst", "", "full-time"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+import unittest
+import sys
+import os
+import shutil
+import socketserver
+import tempfile
+import threading
+import time
+from datetime import datetime
+from fnmatch import fnmatchcase
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.search_cache import SearchCache, SQLiteBackend, RedisBackend, MemoryBackend
+
+class FakeRedisHandler(socketserver.StreamRequestHandler):
+    """Just enough of the Redis protocol (RESP) to stand in for a real server"""
+
+    def read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        args = []
+        for _ in range(int(line[1:-2])):
+            length = int(self.rfile.readline()[1:-2])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def bulk(self, value):
+        if value is None:
+            return b"$-1\r\n"
+        return b"$" + str(len(value)).encode() + b"\r\n" + value + b"\r\n"
+
+    def handle(self):
+        store = self.server.store
+        while True:
+            args = self.read_command()
+            if args is None:
+                break
+            command = args[0].upper()
+            with self.server.lock:
+                now = time.time()
+                for key in [k for k, (_, expires) in store.items() if expires and expires <= now]:
+                    del store[key]
+
+                if command == b'GET':
+                    entry = store.get(args[1])
+                    reply = self.bulk(entry[0] if entry else None)
+                elif command == b'SET':
+                    options = [arg.upper() for arg in args[3:]]
+                    expires = None
+                    if b'PX' in options:
+                        expires = now + int(args[3 + options.index(b'PX') + 1]) / 1000
+                    if b'NX' in options and args[1] in store:
+                        reply = self.bulk(None)
+                    else:
+                        store[args[1]] = (args[2], expires)
+                        reply = b"+OK\r\n"
+                elif command == b'DEL':
+                    removed = sum(1 for key in args[1:] if store.pop(key, None) is not None)
+                    reply = b":" + str(removed).encode() + b"\r\n"
+                elif command == b'SCAN':
+                    pattern = args[args.index(b'MATCH') + 1].decode()
+                    keys = [key for key in store if fnmatchcase(key.decode(), pattern)]
+                    reply = b"*2\r\n" + self.bulk(b"0") + b"*" + str(len(keys)).encode() + b"\r\n"
+                    reply += b''.join(self.bulk(key) for key in keys)
+                else:
+                    reply = b"-ERR unknown command\r\n"
+            self.wfile.write(reply)
+
+class FakeRedisServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), FakeRedisHandler)
+        self.store = {}
+        self.lock = threading.Lock()
+
+class BackendContract:
+    """Checks every backend must pass"""
+
+    def test_round_trip_with_datetimes(self):
+        cache = SearchCache(ttl=60, backend=self.backend)
+        posted = datetime(2024, 5, 1, 12, 30)
+        cache.set("Clerk", "DC", "full-time", [{'title': 'Clerk', 'date_posted': posted}])
+
+        jobs = cache.get("clerk", "dc", "full-time")
+        self.assertEqual(jobs, [{'title': 'Clerk', 'date_posted': posted}])
+
+    def test_entries_expire(self):
+        cache = SearchCache(ttl=0.05, backend=self.backend)
+        cache.set("clerk", "", "full-time", [{'title': 'Clerk'}])
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("clerk", "", "full-time"))
+
+    def test_invalidate_and_size(self):
+        cache = SearchCache(ttl=60, backend=self.backend)
+        cache.set("a", "", "full-time", [{'title': 'A'}])
+        cache.set("b", "", "full-time", [{'title': 'B'}])
+        self.assertEqual(cache.stats()['entries'], 2)
+
+        self.assertEqual(cache.invalidate("a", ""), 1)
+        self.assertEqual(cache.invalidate(), 1)
+        self.assertEqual(cache.stats()['entries'], 0)
+
+    def test_shared_between_cache_instances(self):
+        """Two workers pointing at the same store see each other's entries"""
+        writer = SearchCache(ttl=60, backend=self.backend)
+        reader = SearchCache(ttl=60, backend=self.make_second_backend())
+        writer.set("nurse", "", "full-time", [{'title': 'Nurse'}])
+        self.assertEqual(reader.get("nurse", "", "full-time"), [{'title': 'Nurse'}])
+
+class TestMemoryBackend(BackendContract, unittest.TestCase):
+    def setUp(self):
+        self.backend = MemoryBackend()
+
+    def test_each_namespace_has_its_own_limit(self):
+        backend = MemoryBackend(max_entries=2)
+        backend.set("search:a", b'jobs', 60)
+        for n in range(5):
+            backend.set(f"hwm:{n}", b'mark', 60)
+        self.assertEqual(backend.get("search:a"), b'jobs')
+        self.assertEqual(backend.size('hwm:'), 2)
+        self.assertEqual(backend.size(), 3)
+
+    def make_second_backend(self):
+        return self.backend
+
+class TestSQLiteBackend(BackendContract, unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.test_dir, 'cache.db')
+        self.backend = SQLiteBackend(self.path)
+
+    def test_each_namespace_has_its_own_limit(self):
+        backend = SQLiteBackend(self.path, max_entries=2)
+        for n in range(3):
+            backend.set(f"search:{n}", b'jobs', 60)
+        # The 50th write purges
+        for n in range(47):
+            backend.set(f"hwm:{n}", b'mark', 60)
+        self.assertEqual(backend.size('search:'), 2)
+        self.assertEqual(backend.size('hwm:'), 2)
+        self.assertIsNotNone(backend.get("search:2"))
+
+    def test_backends_sharing_a_file_keep_their_own_limits(self):
+        details = SQLiteBackend(self.path, max_entries=100)
+        for n in range(60):
+            details.set(f"detail:{n}", b'text', 60)
+        searches = SQLiteBackend(self.path, max_entries=2)
+        for n in range(50):
+            searches.set(f"search:{n}", b'jobs', 60)
+        self.assertEqual(searches.size('search:'), 2)
+        self.assertEqual(details.size('detail:'), 60)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def make_second_backend(self):
+        return SQLiteBackend(self.path)
+
+class TestRedisBackend(BackendContract, unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeRedisServer()
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.store.clear()
+        self.backend = self.make_second_backend()
+
+    def make_second_backend(self):
+        return RedisBackend(f"redis://127.0.0.1:{self.server.server_address[1]}/0")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+import sys
+import os
+import time
+from http.server import BaseHTTPRequestHandler
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.circuit_breaker import CircuitBreaker, CircuitBreakerRegistry, CircuitOpenError
+from agents.job_scraper import JobScraperAgent
+from agents.rate_limiter import RateLimiter, MemoryBucketStore
+from stub_server import StubServerTestCase
+
+class TestCircuitBreaker(unittest.TestCase):
+    def breaker(self, **settings):
+        settings = dict(dict(failure_rate=0.5, slow_call_seconds=1, slow_call_rate=0.8,
+                             min_calls=4, window=60, open_seconds=0.1), **settings)
+        return CircuitBreaker('usajobs', **settings)
+
+    def test_opens_on_error_rate(self):
+        breaker = self.breaker()
+        for failed in (False, True, False):
+            self.assertTrue(breaker.allow())
+            breaker.record(failed, 0.1)
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        breaker.allow()
+        breaker.record(True, 0.1)
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(breaker.allow())
+
+    def test_opens_on_slow_calls(self):
+        breaker = self.breaker()
+        for _ in range(4):
+            breaker.allow()
+            breaker.record(False, 2.0)
+        self.assertEqual(breaker.stats()['state'], CircuitBreaker.OPEN)
+
+    def test_half_open_trial(self):
+        """After the open period one trial is let through; its outcome closes or reopens the circuit"""
+        breaker = self.breaker(min_calls=1)
+        breaker.allow()
+        breaker.record(True, 0.1)
+        time.sleep(0.15)
+
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+        breaker.record(True, 0.1)
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+        time.sleep(0.15)
+        self.assertTrue(breaker.allow())
+        breaker.record(False, 0.1)
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(breaker.allow())
+
+class UnavailableHandler(BaseHTTPRequestHandler):
+    """Answers every request with 503, counting them"""
+    hits = 0
+
+    def do_GET(self):
+        UnavailableHandler.hits += 1
+        self.send_response(503)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+class TestScraperCircuit(StubServerTestCase):
+    handler = UnavailableHandler
+
+    def setUp(self):
+        UnavailableHandler.hits = 0
+        self.breakers = CircuitBreakerRegistry(min_calls=3, open_seconds=60)
+        self.scraper = JobScraperAgent(rate_limiter=RateLimiter(rate=0, store=MemoryBucketStore()),
+                                       breakers=self.breakers)
+        self.scraper.SEARCH_URL = f"{self.base}/Search/Results"
+
+    @patch('agents.job_scraper.time.sleep')
+    def test_failing_upstream_fails_fast(self, mock_sleep):
+        """Once the circuit opens, searches return at once without reaching upstream"""
+        with patch.object(self.scraper.rate_limiter, 'backoff'):
+            self.assertEqual(self.scraper.fetch_usajobs("clerk", ""), [])
+        self.assertEqual(UnavailableHandler.hits, 3)
+        self.assertTrue(self.scraper.circuit_open())
+
+        start = time.monotonic()
+        self.assertEqual(self.scraper.fetch_usajobs("nurse", ""), [])
+        self.assertLess(time.monotonic() - start, 0.1)
+        self.assertEqual(UnavailableHandler.hits, 3)
+        with self.assertRaises(CircuitOpenError):
+            self.scraper.session.get(self.scraper.SEARCH_URL)
+
+        stats = self.scraper.circuit_stats()[self.scraper.upstream_host()]
+        self.assertEqual(stats['state'], 'open')
+        self.assertGreater(stats['retry_in'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+import sys
+import os
+import time
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.job_scraper import JobScraperAgent, canonical_job_url
+from agents.rate_limiter import RateLimiter, MemoryBucketStore
+from stub_server import StubServerTestCase
+
+CARD_HTML = """
+<div class="usajobs-search-result">
+    <h3 class="usajobs-search-result__title"><a href="{href}">{title}</a></h3>
+    <div class="usajobs-search-result__department">Department of Labor</div>
+</div>
+"""
+
+# Result pages served by the stub; page 2 repeats a page 1 posting with tracking parameters
+PAGES = {
+    1: [('/job/1', 'Analyst 1'), ('/job/2', 'Analyst 2'), ('/job/3', 'Analyst 3')],
+    2: [('/job/2?utm_source=search', 'Analyst 2'), ('/job/4', 'Analyst 4'), ('/job/5', 'Analyst 5')],
+    3: [('/job/6', 'Analyst 6')],
+    4: [],
+    5: [('/job/7', 'Analyst 7')],
+}
+
+class PagedUSAJobsHandler(BaseHTTPRequestHandler):
+    """Serves the PAGES above, optionally slowing page 2 down"""
+    slow_page_delay = 0
+    requested = []
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        page = int(query.get('p', ['1'])[0])
+        self.requested.append((query['k'][0], page))
+        if page == 2 and self.slow_page_delay:
+            time.sleep(self.slow_page_delay)
+        body = ''.join(CARD_HTML.format(href=href, title=title)
+                       for href, title in PAGES.get(page, [])).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class TestCrawlUSAJobs(StubServerTestCase):
+    handler = PagedUSAJobsHandler
+
+    def setUp(self):
+        PagedUSAJobsHandler.slow_page_delay = 0
+        PagedUSAJobsHandler.requested = []
+        # Page timing is under test here, so requests aren't rate limited
+        self.scraper = JobScraperAgent(rate_limiter=RateLimiter(rate=0, store=MemoryBucketStore()))
+        self.scraper.SEARCH_URL = f"{self.base}/Search/Results"
+
+    def titles(self, jobs):
+        return [job['title'] for job in jobs]
+
+    def test_merges_pages_in_order_without_duplicates(self):
+        """Pages are merged in order, duplicates dropped, and the crawl stops at an empty page"""
+        jobs = self.scraper.crawl_usajobs("analyst", "", max_pages=5)
+        self.assertEqual(self.titles(jobs), [f"Analyst {n}" for n in range(1, 7)])
+
+    def test_stops_at_max_results(self):
+        """The crawl returns exactly max_results jobs"""
+        jobs = self.scraper.crawl_usajobs("analyst", "", max_pages=5, max_results=4)
+        self.assertEqual(self.titles(jobs), ["Analyst 1", "Analyst 2", "Analyst 3", "Analyst 4"])
+
+        # A first page that already satisfies the request skips the other pages
+        jobs = self.scraper.crawl_usajobs("clerk", "", max_pages=5, max_results=2)
+        self.assertEqual(len(jobs), 2)
+        self.assertEqual([page for keyword, page in PagedUSAJobsHandler.requested if keyword == 'clerk'], [1])
+
+    def test_time_budget_returns_partial_results(self):
+        """A slow page is abandoned once the time budget runs out"""
+        PagedUSAJobsHandler.slow_page_delay = 1
+        start = time.monotonic()
+        jobs = self.scraper.crawl_usajobs("analyst", "", max_pages=3, time_budget=0.3)
+
+        self.assertLess(time.monotonic() - start, 0.9)
+        self.assertEqual(self.titles(jobs), ["Analyst 1", "Analyst 2", "Analyst 3"])
+
+    def test_canonical_job_url(self):
+        """Tracking parameters, fragments, trailing slashes and host case are ignored"""
+        self.assertEqual(canonical_job_url("HTTPS://WWW.USAJobs.gov/job/123/?utm_source=x#apply"),
+                         "https://www.usajobs.gov/job/123")
+
+if __name__ == '__main__':
+    unittest.main()
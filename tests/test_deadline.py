@@ -0,0 +1,103 @@
+import unittest
+import sys
+import os
+import time
+from http.server import BaseHTTPRequestHandler
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import agents.deadline as deadline_module
+from agents.deadline import (DeadlineExceeded, deadline_scope, request_timeout, time_left,
+                             with_deadline)
+from agents.search_executor import SearchExecutor
+from agents.job_scraper import JobScraperAgent
+from agents.circuit_breaker import CircuitBreakerRegistry
+from agents.rate_limiter import RateLimiter, MemoryBucketStore
+from stub_server import StubServerTestCase
+
+class TestDeadlineScope(unittest.TestCase):
+    def test_timeouts_fit_the_time_left(self):
+        self.assertEqual(request_timeout(15), (5, 15))
+        with deadline_scope(2):
+            connect, read = request_timeout(15)
+            self.assertLessEqual(read, 2)
+            self.assertLessEqual(connect, read)
+        with deadline_scope(0.01):
+            time.sleep(0.02)
+            with self.assertRaises(DeadlineExceeded):
+                request_timeout(15)
+
+    def test_nested_scope_never_extends_the_deadline(self):
+        with deadline_scope(1):
+            with deadline_scope(60):
+                self.assertLessEqual(time_left(), 1)
+            with deadline_scope(0.5):
+                self.assertLessEqual(time_left(), 0.5)
+        self.assertIsNone(time_left())
+
+    def test_route_budget_from_config(self):
+        """Views get their ROUTE_BUDGETS entry, or REQUEST_BUDGET"""
+        def jobs():
+            return time_left()
+
+        def search_jobs_api():
+            return time_left()
+
+        config = dict(deadline_module.SCRAPER_CONFIG, REQUEST_BUDGET=25, ROUTE_BUDGETS={'jobs': 3})
+        with patch.object(deadline_module, 'SCRAPER_CONFIG', config):
+            self.assertLessEqual(with_deadline()(jobs)(), 3)
+            self.assertGreater(with_deadline()(search_jobs_api)(), 3)
+            self.assertLessEqual(with_deadline(1)(search_jobs_api)(), 1)
+
+class TestSearchExecutorDeadline(unittest.TestCase):
+    def test_returns_partial_results_when_time_runs_out(self):
+        """A slow preferred search is given up on at the deadline in favour of one that answered"""
+        executor = SearchExecutor(max_workers=2)
+        self.addCleanup(executor.shutdown)
+        searches = [('slow', lambda: time.sleep(1) or ['slow job']), ('fast', lambda: ['fast job'])]
+
+        start = time.monotonic()
+        with deadline_scope(0.2):
+            self.assertEqual(executor.first_non_empty(searches), ('fast', ['fast job']))
+        self.assertLess(time.monotonic() - start, 0.6)
+
+    def test_searches_run_under_the_callers_deadline(self):
+        executor = SearchExecutor(max_workers=1)
+        self.addCleanup(executor.shutdown)
+        with deadline_scope(5):
+            _, results = executor.first_non_empty([('budget', lambda: [time_left()])])
+        self.assertLessEqual(results[0], 5)
+
+class SlowHandler(BaseHTTPRequestHandler):
+    """Takes two seconds to answer, counting requests"""
+    hits = 0
+
+    def do_GET(self):
+        SlowHandler.hits += 1
+        time.sleep(2)
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+class TestUpstreamDeadline(StubServerTestCase):
+    handler = SlowHandler
+
+    def test_timeouts_and_retries_stop_at_the_deadline(self):
+        SlowHandler.hits = 0
+        scraper = JobScraperAgent(rate_limiter=RateLimiter(rate=0, store=MemoryBucketStore()),
+                                  breakers=CircuitBreakerRegistry())
+        scraper.SEARCH_URL = f"{self.base}/Search/Results"
+
+        start = time.monotonic()
+        with deadline_scope(0.3):
+            self.assertEqual(scraper.fetch_usajobs("clerk", ""), [])
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(SlowHandler.hits, 1)
+
+if __name__ == '__main__':
+    unittest.main()
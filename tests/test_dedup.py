@@ -0,0 +1,101 @@
+import unittest
+import sys
+import os
+import time
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.dedup import DedupIndex, job_fingerprint, merge_jobs
+from agents.job_sources import JobSource, SourceRegistry
+
+POSTING = {
+    'title': "IT Specialist (INFOSEC)",
+    'company': "Department of the Army",
+    'location': "Fort Meade, Maryland",
+    'description': "Serves as an IT specialist responsible for the information security of systems "
+                   "and networks, including risk assessment and incident response.",
+    'salary': "Salary not specified",
+    'url': "https://www.usajobs.gov/job/100",
+    'source': 'USAJobs.gov'
+}
+
+def copy_of(job, **changes):
+    return dict(job, **changes)
+
+class TestFingerprint(unittest.TestCase):
+    def test_near_copies_are_close_and_other_postings_far(self):
+        distance = lambda a, b: bin(job_fingerprint(a) ^ job_fingerprint(b)).count('1')
+        reworded = copy_of(POSTING, description=POSTING['description'] + " Apply now.")
+        self.assertLessEqual(distance(POSTING, reworded), 3)
+        self.assertGreater(distance(POSTING, copy_of(POSTING, title="Budget Analyst")), 3)
+        self.assertGreater(distance(POSTING, copy_of(POSTING, location="Fort Bragg, North Carolina")), 3)
+
+class TestDedupIndex(unittest.TestCase):
+    def test_copies_are_merged_in_first_seen_order(self):
+        other = copy_of(POSTING, title="Budget Analyst", url="https://www.usajobs.gov/job/200")
+        tracked = copy_of(POSTING, url="https://WWW.usajobs.gov/job/100/?utm_source=search")
+        mirrored = copy_of(POSTING, url="https://boards.greenhouse.io/army/jobs/7", source='Greenhouse',
+                           salary="$90,000 per year", description=POSTING['description'] + " Apply now.")
+
+        jobs = DedupIndex().dedupe([POSTING, other, tracked, mirrored])
+        self.assertEqual([job['title'] for job in jobs], [POSTING['title'], "Budget Analyst"])
+        self.assertEqual(jobs[0]['url'], POSTING['url'])
+        self.assertEqual(jobs[0]['salary'], "$90,000 per year")
+        self.assertTrue(jobs[0]['description'].endswith("Apply now."))
+        self.assertEqual(jobs[0]['also_from'], ['Greenhouse'])
+        self.assertEqual(jobs[0]['duplicate_urls'], ["https://boards.greenhouse.io/army/jobs/7"])
+
+    def test_copies_across_calls_point_at_the_first_posting(self):
+        index = DedupIndex()
+        index.dedupe([POSTING])
+        mirrored = copy_of(POSTING, url="https://boards.greenhouse.io/army/jobs/7")
+        self.assertEqual(index.dedupe([mirrored])[0]['duplicate_of'], POSTING['url'])
+        # The same search again is not a copy of itself
+        self.assertNotIn('duplicate_of', index.dedupe([POSTING])[0])
+
+    def test_oldest_postings_are_forgotten(self):
+        index = DedupIndex(max_entries=2)
+        jobs = [copy_of(POSTING, title=title, url=f"https://www.usajobs.gov/job/{n}")
+                for n, title in enumerate(["Nurse", "Budget Analyst", "Park Ranger"])]
+        for job in jobs:
+            self.assertIsNone(index.add(job))
+        self.assertEqual(len(index), 2)
+        self.assertIsNone(index.add(jobs[0]))
+        self.assertEqual(index.add(jobs[2]), "https://www.usajobs.gov/job/2")
+
+    def test_merge_keeps_real_values_over_placeholders(self):
+        kept = copy_of(POSTING, location="Various Locations")
+        merged = merge_jobs(kept, copy_of(POSTING, location="Fort Meade, Maryland", salary=""))
+        self.assertEqual(merged['location'], "Fort Meade, Maryland")
+        self.assertEqual(merged['salary'], "Salary not specified")
+
+class StaticSource(JobSource):
+    def __init__(self, name, jobs, delay=0):
+        super().__init__()
+        self.name = name
+        self.jobs = jobs
+        self.delay = delay
+
+    def fetch(self, keywords, location, job_type="full-time"):
+        time.sleep(self.delay)
+        return self.jobs
+
+    def parse(self, raw, keywords="", location=""):
+        return raw
+
+class TestRegistryDedup(unittest.TestCase):
+    def test_postings_listed_by_two_sources_are_merged(self):
+        registry = SourceRegistry()
+        self.addCleanup(registry.shutdown)
+        # The first registered source answers last, and its copy is still the one kept
+        registry.register(StaticSource('usajobs', [POSTING], delay=0.1))
+        registry.register(StaticSource('greenhouse', [copy_of(POSTING, url="https://boards.greenhouse.io/army/jobs/7",
+                                                              source='Greenhouse')]))
+        jobs = registry.search("it specialist", "")
+        self.assertEqual(len(jobs), 1)
+        self.assertEqual(jobs[0]['url'], POSTING['url'])
+        self.assertEqual(jobs[0]['duplicate_urls'], ["https://boards.greenhouse.io/army/jobs/7"])
+
+if __name__ == '__main__':
+    unittest.main()
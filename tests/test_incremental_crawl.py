@@ -0,0 +1,149 @@
+import unittest
+import sys
+import os
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+import requests
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.job_scraper import JobScraperAgent
+from agents.rate_limiter import RateLimiter, MemoryBucketStore
+from agents.search_cache import SearchCache, HighWaterMarks, MemoryBackend
+from stub_server import StubServerTestCase
+
+CARD_HTML = """
+<div class="usajobs-search-result">
+    <h3 class="usajobs-search-result__title"><a href="/job/{number}">Analyst {number}</a></h3>
+    <div class="usajobs-search-result__department">Department of Labor</div>
+</div>
+"""
+
+class PostingsHandler(BaseHTTPRequestHandler):
+    """Serves `postings` (newest first) three to a page, recording requested pages"""
+    postings = []
+    requested = []
+    # Cards sent before the next response is cut off (None sends whole pages)
+    cut_after = None
+
+    def do_GET(self):
+        page = int(parse_qs(urlparse(self.path).query).get('p', ['1'])[0])
+        self.requested.append(page)
+        numbers = self.postings[(page - 1) * 3:page * 3]
+        cards = [CARD_HTML.format(number=number).encode() for number in numbers]
+        body = b''.join(cards)
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.cut_after is not None:
+            PostingsHandler.cut_after, cut_after = None, self.cut_after
+            self.wfile.write(b''.join(cards[:cut_after]))
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class TestIncrementalCrawl(StubServerTestCase):
+    handler = PostingsHandler
+
+    def setUp(self):
+        PostingsHandler.postings = list(range(20, 11, -1))
+        PostingsHandler.requested = []
+        PostingsHandler.cut_after = None
+        self.scraper = JobScraperAgent(cache=SearchCache(ttl=600),
+                                       rate_limiter=RateLimiter(rate=0, store=MemoryBucketStore()))
+        self.scraper.SEARCH_URL = f"{self.base}/Search/Results"
+
+    def titles(self, jobs):
+        return [job['title'] for job in jobs]
+
+    def test_full_fetch_sets_the_mark(self):
+        jobs = self.scraper.scrape_usajobs("analyst", "")
+        self.assertEqual(self.titles(jobs)[:3], ["Analyst 20", "Analyst 19", "Analyst 18"])
+        mark = self.scraper.high_water_marks.get("analyst", "")
+        self.assertTrue(mark['url'].endswith("/job/20"))
+
+    def test_crawl_stops_at_the_first_seen_posting(self):
+        """Only the new postings are read; later pages are never requested"""
+        self.scraper.scrape_usajobs("analyst", "")
+        PostingsHandler.postings = [22, 21] + PostingsHandler.postings
+        PostingsHandler.requested = []
+
+        new_jobs, reached = self.scraper.crawl_new_usajobs("analyst", "")
+        self.assertTrue(reached)
+        self.assertEqual(self.titles(new_jobs), ["Analyst 22", "Analyst 21"])
+        self.assertEqual(PostingsHandler.requested, [1])
+        self.assertTrue(self.scraper.high_water_marks.get("analyst", "")['url'].endswith("/job/22"))
+
+        # Nothing new since: the first posting is the mark
+        self.assertEqual(self.scraper.crawl_new_usajobs("analyst", ""), ([], True))
+
+    def test_refresh_puts_new_postings_in_front_of_the_cached_ones(self):
+        cached = self.scraper.scrape_usajobs("analyst", "")
+        PostingsHandler.postings = [21] + PostingsHandler.postings
+        PostingsHandler.requested = []
+
+        jobs = self.scraper.refresh_search("analyst", "")
+        self.assertEqual(self.titles(jobs), ["Analyst 21"] + self.titles(cached)[:len(cached) - 1])
+        self.assertEqual(PostingsHandler.requested, [1])
+        self.assertEqual(self.titles(self.scraper.cache.peek("analyst", "")), self.titles(jobs))
+
+    def test_page_cut_off_part_way_is_not_cached(self):
+        """A refresh whose page fails mid-read falls back to a full fetch instead of caching the part read"""
+        self.scraper.scrape_usajobs("analyst", "")
+        PostingsHandler.postings = [22, 21] + PostingsHandler.postings
+        PostingsHandler.cut_after = 2
+
+        jobs = self.scraper.refresh_search("analyst", "")
+        self.assertEqual(self.titles(jobs), ["Analyst 22", "Analyst 21", "Analyst 20"])
+        self.assertEqual(self.titles(self.scraper.cache.peek("analyst", "")), self.titles(jobs))
+        self.assertTrue(self.scraper.high_water_marks.get("analyst", "")['url'].endswith("/job/22"))
+
+    def test_crawl_cut_off_part_way_keeps_the_mark(self):
+        self.scraper.scrape_usajobs("analyst", "")
+        PostingsHandler.postings = [22, 21] + PostingsHandler.postings
+        PostingsHandler.cut_after = 2
+
+        with self.assertRaises(requests.RequestException):
+            self.scraper.crawl_new_usajobs("analyst", "")
+        self.assertTrue(self.scraper.high_water_marks.get("analyst", "")['url'].endswith("/job/20"))
+
+    def test_mark_out_of_reach_returns_only_new_postings(self):
+        self.scraper.scrape_usajobs("analyst", "")
+        PostingsHandler.postings = list(range(40, 30, -1)) + PostingsHandler.postings
+
+        new_jobs, reached = self.scraper.crawl_new_usajobs("analyst", "", max_pages=2)
+        self.assertFalse(reached)
+        self.assertEqual(len(new_jobs), 6)
+
+    def test_refresh_without_a_mark_is_a_full_fetch(self):
+        self.scraper.cache.set("analyst", "", "full-time", [{'title': "Old", 'url': "https://www.usajobs.gov/job/1"}])
+        jobs = self.scraper.refresh_search("analyst", "")
+        self.assertEqual(self.titles(jobs)[0], "Analyst 20")
+        self.assertNotIn("Old", self.titles(jobs))
+
+class TestHighWaterMarks(unittest.TestCase):
+    def test_round_trip(self):
+        marks = HighWaterMarks(MemoryBackend())
+        self.assertIsNone(marks.get("nurse", "Denver"))
+        marks.set("Nurse ", "denver", "full-time", "https://www.usajobs.gov/job/9", datetime(2024, 5, 1))
+        self.assertEqual(marks.get("nurse", "Denver"),
+                         {'url': "https://www.usajobs.gov/job/9", 'date_posted': datetime(2024, 5, 1)})
+        marks.invalidate("nurse", "Denver")
+        self.assertIsNone(marks.get("nurse", "Denver"))
+
+    def test_older_api_postings_are_below_the_mark(self):
+        mark = {'url': "https://www.usajobs.gov/job/9", 'date_posted': datetime(2024, 5, 1)}
+        below = JobScraperAgent.below_high_water_mark
+        self.assertTrue(below({'url': "https://www.usajobs.gov/job/9?utm_source=x"}, mark))
+        self.assertTrue(below({'url': "https://www.usajobs.gov/job/3", 'date_posted': datetime(2024, 4, 1)}, mark))
+        self.assertFalse(below({'url': "https://www.usajobs.gov/job/12", 'date_posted': datetime(2024, 5, 1)}, mark))
+
+if __name__ == '__main__':
+    unittest.main()
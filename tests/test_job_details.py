@@ -0,0 +1,156 @@
+import unittest
+import sys
+import os
+import time
+from http.server import BaseHTTPRequestHandler
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.job_details import JobDetailFetcher, extract_details
+from agents.job_scraper import JobScraperAgent
+from agents.rate_limiter import RateLimiter, MemoryBucketStore
+from agents.search_cache import MemoryBackend
+from agents.seen_urls import SeenURLFilter
+from stub_server import StubServerTestCase
+
+ANNOUNCEMENT_HTML = """
+<html><body>
+<nav>Search jobs | Sign in</nav>
+<div id="summary"><h2>Summary</h2><p>Join the {title} team.</p></div>
+<div id="duties"><h2>Duties</h2><ul><li>Review budget requests</li><li>Prepare   reports</li></ul></div>
+<div id="requirements">
+  <h2>Requirements</h2>
+  <div id="qualifications"><p>One year of specialized experience in federal budgeting.</p></div>
+</div>
+</body></html>
+"""
+
+class AnnouncementHandler(BaseHTTPRequestHandler):
+    """Serves an announcement per /job/<title>, each taking `delay` seconds"""
+    delay = 0
+    requested = []
+
+    def do_GET(self):
+        self.requested.append(self.path)
+        time.sleep(self.delay)
+        if self.path.startswith('/missing'):
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body = ANNOUNCEMENT_HTML.format(title=self.path.rsplit('/', 1)[-1]).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class TestExtractDetails(unittest.TestCase):
+    def test_announcement_sections(self):
+        details = extract_details(ANNOUNCEMENT_HTML.format(title="budget"))
+        self.assertEqual(details['summary'], "Summary\nJoin the budget team.")
+        self.assertEqual(details['duties'], "Duties\nReview budget requests\nPrepare reports")
+        self.assertEqual(details['qualifications'], "One year of specialized experience in federal budgeting.")
+        self.assertNotIn("Sign in", details['description'])
+        self.assertIn("Review budget requests", details['description'])
+
+    def test_other_pages_fall_back_to_the_page_text(self):
+        details = extract_details("<html><body><nav>Menu</nav><main><p>Build   pipelines.</p></main></body></html>")
+        self.assertIn("Build pipelines.", details['description'])
+        self.assertNotIn("Menu", details['description'])
+
+class TestJobDetailFetcher(StubServerTestCase):
+    handler = AnnouncementHandler
+
+    def setUp(self):
+        AnnouncementHandler.delay = 0
+        AnnouncementHandler.requested = []
+        self.scraper = JobScraperAgent(rate_limiter=RateLimiter(rate=0, store=MemoryBucketStore()),
+                                       detail_rate_limiter=RateLimiter(rate=0, store=MemoryBucketStore()))
+        self.scraper.details = JobDetailFetcher(self.scraper.detail_session, backend=MemoryBackend(),
+                                                seen=SeenURLFilter(path='', capacity=1000), max_workers=4)
+        self.addCleanup(self.scraper.details.shutdown)
+
+    def job(self, title):
+        return {'title': title, 'description': "Short snippet", 'url': f"{self.base}/job/{title}"}
+
+    def test_jobs_are_enriched_in_parallel(self):
+        AnnouncementHandler.delay = 0.3
+        jobs = [self.job(f"analyst{n}") for n in range(4)]
+
+        start = time.monotonic()
+        enriched = self.scraper.enrich_jobs(jobs)
+        self.assertLess(time.monotonic() - start, 1.0)
+
+        self.assertTrue(all("Review budget requests" in job['description'] for job in enriched))
+        self.assertEqual(enriched[0]['snippet'], "Short snippet")
+        self.assertEqual(jobs[0]['description'], "Short snippet")
+
+    def test_details_are_cached_by_url(self):
+        job = self.job("clerk")
+        self.scraper.full_description(job['url'])
+        description = self.scraper.full_description(job['url'] + "?utm_source=search")
+        self.assertIn("Join the clerk team.", description)
+        self.assertEqual(len(AnnouncementHandler.requested), 1)
+
+    def test_details_cached_by_other_workers_are_found(self):
+        """A process whose in-memory filter never saw a URL still reads the shared cache"""
+        job = self.job("clerk")
+        self.scraper.full_description(job['url'])
+        other = JobDetailFetcher(self.scraper.detail_session, backend=self.scraper.details.backend,
+                                 seen=SeenURLFilter(path='', capacity=1000), max_workers=1)
+        self.addCleanup(other.shutdown)
+        self.assertIn("Join the clerk team.", other.cached(job['url'])['description'])
+
+    def test_slow_pages_keep_the_snippet_and_finish_in_the_background(self):
+        AnnouncementHandler.delay = 0.5
+        job = self.job("ranger")
+        self.assertEqual(self.scraper.enrich_jobs([job], timeout=0.05)[0]['description'], "Short snippet")
+
+        for _ in range(50):
+            if self.scraper.details.cached(job['url']):
+                break
+            time.sleep(0.05)
+        self.assertIn("Join the ranger team.", self.scraper.details.cached(job['url'])['description'])
+
+    def test_slow_pages_return_the_snippet_within_the_timeout(self):
+        AnnouncementHandler.delay = 0.5
+        job = self.job("clerk")
+        start = time.monotonic()
+        self.assertEqual(self.scraper.full_description(job['url'], "Short snippet", timeout=0.05), "Short snippet")
+        self.assertLess(time.monotonic() - start, 0.4)
+        for _ in range(50):
+            if self.scraper.details.cached(job['url']):
+                break
+            time.sleep(0.05)
+        self.assertIn("Join the clerk team.", self.scraper.full_description(job['url'], "Short snippet"))
+
+    def test_sample_jobs_are_never_fetched(self):
+        sample = self.scraper.get_sample_jobs()[0]
+        self.assertEqual(self.scraper.full_description(sample['url'], sample['description']), sample['description'])
+        self.scraper.prefetch_details(self.scraper.get_sample_jobs())
+        self.assertEqual(self.scraper.details.stats()['pending'], 0)
+        self.assertEqual(AnnouncementHandler.requested, [])
+
+    def test_unreadable_pages_fall_back_to_the_snippet(self):
+        self.assertEqual(self.scraper.full_description(f"{self.base}/missing/1", "Short snippet"), "Short snippet")
+        self.assertEqual(self.scraper.details.stats()['failed'], 1)
+
+    def test_search_results_are_enriched_in_the_background(self):
+        self.scraper.enrich_details = True
+        job = self.job("nurse")
+        self.scraper.fetch_usajobs = lambda keywords, location, job_type="full-time", page=1: [job]
+        self.assertEqual(self.scraper.scrape_usajobs("nurse", "")[0]['description'], "Short snippet")
+
+        for _ in range(50):
+            if self.scraper.details.cached(job['url']):
+                break
+            time.sleep(0.05)
+        self.assertIsNotNone(self.scraper.details.cached(job['url']))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -23,7 +23,7 @@ class TestJobScraper(unittest.TestCase):
             self.assertIn('title', job, "Job should have a title")
             self.assertIn('company', job, "Job should have a company")
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_scraper_with_realistic_html(self, mock_get):
         """Test scraper with realistic HTML from USAJobs"""
         # Setup a mock response with sample HTML
@@ -59,7 +59,7 @@ class TestJobScraper(unittest.TestCase):
         self.assertEqual(job['salary'], "$80,000 to $120,000 per year")
         self.assertEqual(job['source'], "USAJobs.gov")
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_scraper_with_alternative_html_structure(self, mock_get):
         """Test scraper with a different HTML structure to ensure resilience"""
         # Setup mock response with alternative HTML structure
@@ -91,7 +91,7 @@ class TestJobScraper(unittest.TestCase):
         self.assertIn("Analyze government data", job['description'])
         self.assertEqual(job['salary'], "$70,000 - $90,000 annually")
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_scraper_with_minimal_html(self, mock_get):
         """Test scraper with minimal HTML to test fallback extraction"""
         mock_response = MagicMock()
@@ -118,6 +118,50 @@ class TestJobScraper(unittest.TestCase):
         job = results[0]
         self.assertEqual(job['title'], "Project Manager")
         self.assertEqual(job['source'], "USAJobs.gov")
+
+    def test_fallback_fields_share_one_text_pass(self):
+        """Test that all fallback heuristics read a card's text only once"""
+        sample_html = """
+        <div>
+            <h3>Project Manager</h3>
+            Department of Defense
+            Arlington, Virginia
+            Lead project teams for critical missions.
+            $90,000 per year
+        </div>
+        """
+        with patch('bs4.element.Tag.get_text', autospec=True,
+                   side_effect=lambda tag, *args, **kwargs: ''.join(tag.strings)) as mock_get_text:
+            results = self.scraper.parse_search_results(sample_html)
+
+        card_reads = [call for call in mock_get_text.call_args_list if call.args[0].name == 'div']
+        self.assertEqual(len(card_reads), 1)
+        job = results[0]
+        self.assertEqual(job['company'], "Department of Defense")
+        self.assertEqual(job['location'], "Arlington, Virginia")
+        self.assertEqual(job['salary'], "$90,000 per year")
+        self.assertEqual(job['description'], "Lead project teams for critical missions. $90,000 per year")
+
+    @patch('requests.Session.get')
+    def test_scraper_reuses_pooled_session(self, mock_get):
+        """Test that repeated searches go through the agent's pooled session"""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.text = "<div><h3>Clerk</h3></div>"
+        mock_get.return_value = mock_response
+        
+        session = self.scraper.session
+        self.scraper.scrape_usajobs("clerk", "")
+        self.scraper.scrape_usajobs("clerk", "Remote")
+        
+        self.assertIs(self.scraper.session, session, "Agent should keep a single session")
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertIn('User-Agent', session.headers)
+        
+        # The pool size should be applied to the mounted adapter
+        scraper = JobScraperAgent(pool_size=3)
+        adapter = scraper.session.get_adapter('https://www.usajobs.gov')
+        self.assertEqual(adapter._pool_maxsize, 3)
     
     def test_scraper_format_output(self):
         """Test that the scraper always outputs the correct format"""
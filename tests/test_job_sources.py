@@ -0,0 +1,119 @@
+import unittest
+import sys
+import os
+import threading
+import time
+from datetime import datetime
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.job_sources import JobSource, GreenhouseSource, SourceRegistry
+
+def job(title, url):
+    return {'title': title, 'company': 'Acme', 'location': 'Remote', 'description': '',
+            'salary': 'Salary not specified', 'url': url, 'source': 'Test', 'date_posted': datetime.utcnow()}
+
+class FakeSource(JobSource):
+    """Returns canned jobs after an optional delay"""
+
+    def __init__(self, name, jobs, delay=0, error=None, **kwargs):
+        super().__init__(**kwargs)
+        self.name = name
+        self.jobs = jobs
+        self.delay = delay
+        self.error = error
+        self.running = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def fetch(self, keywords, location, job_type="full-time"):
+        with self._lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        try:
+            time.sleep(self.delay)
+            if self.error:
+                raise self.error
+            return self.jobs
+        finally:
+            with self._lock:
+                self.running -= 1
+
+    def parse(self, raw, keywords="", location=""):
+        return list(raw)
+
+class TestSourceRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = SourceRegistry()
+        self.addCleanup(self.registry.shutdown)
+
+    def test_results_arrive_in_completion_order(self):
+        """A fast source is yielded before a slower one registered ahead of it"""
+        self.registry.register(FakeSource('slow', [job('Slow', 'https://a/1')], delay=0.3))
+        self.registry.register(FakeSource('fast', [job('Fast', 'https://b/1')]))
+
+        names = [name for name, _ in self.registry.iter_search('engineer', '')]
+        self.assertEqual(names, ['fast', 'slow'])
+
+    def test_slow_source_times_out_without_delaying_others(self):
+        """A source past its own timeout is dropped; the rest are returned on time"""
+        self.registry.register(FakeSource('stuck', [job('Stuck', 'https://a/1')], delay=2, timeout=0.2))
+        self.registry.register(FakeSource('ok', [job('Ok', 'https://b/1')], timeout=5))
+        self.registry.register(FakeSource('broken', [], error=RuntimeError('upstream down')))
+
+        start = time.monotonic()
+        jobs = self.registry.search('engineer', '')
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual([j['title'] for j in jobs], ['Ok'])
+
+    def test_merge_drops_duplicate_postings(self):
+        """The same posting listed by two sources is kept once"""
+        self.registry.register(FakeSource('one', [job('Analyst', 'https://x.gov/job/1?src=one')]))
+        self.registry.register(FakeSource('two', [job('Analyst', 'https://x.gov/job/1'),
+                                                  job('Clerk', 'https://x.gov/job/2')], delay=0.1))
+        self.assertEqual([j['title'] for j in self.registry.search('', '')], ['Analyst', 'Clerk'])
+
+    def test_concurrency_budget_per_source(self):
+        """Concurrent searches never exceed a source's concurrency budget"""
+        source = self.registry.register(FakeSource('limited', [], delay=0.1, max_concurrency=2))
+        threads = [threading.Thread(target=self.registry.search, args=('x', '')) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(source.peak, 2)
+
+    def test_disabled_sources_are_skipped(self):
+        self.registry.register(FakeSource('off', [job('Off', 'https://a/1')], enabled=False))
+        self.assertEqual(self.registry.search('', ''), [])
+
+class TestGreenhouseSource(unittest.TestCase):
+    def test_parse_filters_and_maps_postings(self):
+        """Board postings are matched locally and mapped to the job schema"""
+        source = GreenhouseSource('acme-labs')
+        raw = {'jobs': [
+            {'title': 'Data Engineer', 'location': {'name': 'Remote - US'},
+             'absolute_url': 'https://boards.greenhouse.io/acme/jobs/1', 'updated_at': '2026-10-02T12:00:00-04:00',
+             'content': '&lt;p&gt;Build &lt;b&gt;pipelines&lt;/b&gt;&lt;/p&gt;'},
+            {'title': 'Office Manager', 'location': {'name': 'Boston, MA'},
+             'absolute_url': 'https://boards.greenhouse.io/acme/jobs/2', 'content': ''},
+        ]}
+        jobs = source.parse(raw, keywords='engineer', location='remote')
+
+        self.assertEqual(len(jobs), 1)
+        self.assertEqual(jobs[0]['company'], 'Acme Labs')
+        self.assertEqual(jobs[0]['description'], 'Build pipelines')
+        self.assertEqual(jobs[0]['source'], 'Acme Labs Careers')
+        self.assertEqual(jobs[0]['date_posted'], datetime(2026, 10, 2, 12, 0))
+
+    def test_postings_without_an_update_time(self):
+        source = GreenhouseSource('acme-labs')
+        raw = {'jobs': [{'title': 'Data Engineer', 'location': {'name': 'Remote'}, 'updated_at': None,
+                         'absolute_url': 'https://boards.greenhouse.io/acme/jobs/1', 'content': ''}]}
+        jobs = source.parse(raw, keywords='engineer')
+        self.assertEqual(len(jobs), 1)
+        self.assertIsInstance(jobs[0]['date_posted'], datetime)
+
+if __name__ == '__main__':
+    unittest.main()
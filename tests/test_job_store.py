@@ -0,0 +1,202 @@
+import unittest
+import sys
+import os
+import time
+from datetime import datetime
+
+from sqlalchemy import (Column, DateTime, Integer, MetaData, String, Table, Text, create_engine,
+                        event, func, inspect, select, text)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.job_scraper import JobScraperAgent, canonical_job_url
+from agents.job_store import JobStore, upgrade_job_table
+from agents.seen_urls import SeenURLFilter
+
+# Same columns as models.Job (importing the model would open the app's database)
+metadata = MetaData()
+job_table = Table(
+    'job', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('title', String(200), nullable=False),
+    Column('company', String(200), nullable=False),
+    Column('description', Text, nullable=False),
+    Column('location', String(200)),
+    Column('url', String(500), nullable=False),
+    Column('url_key', String(500), unique=True),
+    Column('content_hash', String(40)),
+    Column('date_posted', DateTime),
+    Column('source', String(50)),
+    Column('applicants_count', Integer),
+    Column('contact_info', String(500))
+)
+
+def make_job(number, title=None):
+    return {
+        'title': title or f"Analyst {number}",
+        'company': "Department of Labor",
+        'location': "Washington, DC",
+        'description': "Analyze things",
+        'url': f"https://www.usajobs.gov/job/{number}?utm_source=search",
+        'source': 'USAJobs.gov',
+        'date_posted': datetime(2024, 5, 1)
+    }
+
+class TestJobStore(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine('sqlite://')
+        metadata.create_all(self.engine)
+        self.session = Session(self.engine)
+        self.addCleanup(self.session.close)
+        self.scraper = JobScraperAgent()
+
+    def save(self, jobs, batch_size=None):
+        if batch_size:
+            return JobStore(self.session, job_table, batch_size).upsert(jobs, canonical_job_url)
+        return self.scraper.save_scraped_jobs(jobs, self.session, job_table)
+
+    def stored_titles(self):
+        return dict(self.session.execute(select(job_table.c.url_key, job_table.c.title)).all())
+
+    def test_inserts_updates_and_skips_unchanged(self):
+        self.assertEqual(self.save([make_job(1), make_job(2)]), {'inserted': 2, 'updated': 0, 'unchanged': 0})
+
+        # A scraped copy with other tracking parameters is the same posting
+        again = [make_job(1), make_job(2, "Senior Analyst 2"), make_job(3)]
+        again[0]['url'] = "https://www.usajobs.gov/job/1/"
+        self.assertEqual(self.save(again), {'inserted': 1, 'updated': 1, 'unchanged': 1})
+        self.assertEqual(self.stored_titles(), {
+            "https://www.usajobs.gov/job/1": "Analyst 1",
+            "https://www.usajobs.gov/job/2": "Senior Analyst 2",
+            "https://www.usajobs.gov/job/3": "Analyst 3"
+        })
+
+    def test_duplicates_within_a_batch_are_written_once(self):
+        self.assertEqual(self.save([make_job(1), make_job(1, "Other")]), {'inserted': 1, 'updated': 0, 'unchanged': 0})
+        self.assertEqual(list(self.stored_titles().values()), ["Analyst 1"])
+
+    def test_copies_of_earlier_postings_keep_the_original_row(self):
+        self.save([make_job(1)])
+        mirrored = dict(make_job(1), url="https://boards.greenhouse.io/labor/jobs/1", source='Greenhouse')
+        self.assertEqual(self.save([mirrored]), {'inserted': 0, 'updated': 0, 'unchanged': 0})
+        stored = self.session.execute(select(job_table.c.url, job_table.c.source)).all()
+        self.assertEqual(stored, [("https://www.usajobs.gov/job/1?utm_source=search", 'USAJobs.gov')])
+
+    def test_sample_jobs_are_not_saved(self):
+        self.assertEqual(self.save(self.scraper.get_sample_jobs()), {'inserted': 0, 'updated': 0, 'unchanged': 0})
+        self.assertEqual(self.stored_titles(), {})
+
+    def test_one_transaction_and_two_statements_per_batch(self):
+        statements = []
+        commits = []
+        event.listen(self.engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+        event.listen(self.engine, 'commit', lambda conn: commits.append(1))
+
+        start = time.monotonic()
+        counts = self.save([make_job(n) for n in range(2500)], batch_size=1000)
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(counts['inserted'], 2500)
+        self.assertEqual(len(commits), 3)
+        self.assertLessEqual(len([sql for sql in statements if sql.lstrip().upper().startswith('INSERT')]), 3)
+        self.assertEqual(self.session.execute(select(func.count()).select_from(job_table)).scalar(), 2500)
+        self.assertLess(elapsed, 5)
+
+    def test_postgresql_upsert(self):
+        """The same statement compiles to ON CONFLICT on PostgreSQL"""
+        store = JobStore(self.session, job_table)
+        statement = postgresql.insert(job_table)
+        store.insert = lambda: statement
+        sql = str(store.upsert_statement().compile(dialect=postgresql.dialect()))
+        self.assertIn("ON CONFLICT (url_key) DO UPDATE", sql)
+        self.assertIn("WHERE job.content_hash IS DISTINCT FROM excluded.content_hash", sql)
+
+    def test_rows_without_a_hash_are_updated(self):
+        """Rows saved before content hashes existed get one on their next save"""
+        with self.engine.begin() as connection:
+            connection.execute(job_table.insert().values(
+                title="Old title", company="DOL", description="x", url="https://www.usajobs.gov/job/1",
+                url_key="https://www.usajobs.gov/job/1", content_hash=None))
+
+        self.assertEqual(self.save([make_job(1)]), {'inserted': 0, 'updated': 1, 'unchanged': 0})
+        self.assertEqual(self.stored_titles(), {"https://www.usajobs.gov/job/1": "Analyst 1"})
+        stored_hash = self.session.execute(select(job_table.c.content_hash)).scalar()
+        self.assertIsNotNone(stored_hash)
+
+class TestUpgradeJobTable(unittest.TestCase):
+    def test_adds_upsert_columns_to_an_old_table(self):
+        engine = create_engine('sqlite://')
+        with engine.begin() as connection:
+            connection.execute(text("CREATE TABLE job (id INTEGER PRIMARY KEY, title VARCHAR(200) NOT NULL, "
+                                    "company VARCHAR(200) NOT NULL, description TEXT NOT NULL, location VARCHAR(200), "
+                                    "url VARCHAR(500) NOT NULL, date_posted DATETIME, source VARCHAR(50), "
+                                    "applicants_count INTEGER, contact_info VARCHAR(500))"))
+            connection.execute(text("INSERT INTO job (title, company, description, url) VALUES ('Old', 'DOL', 'x', 'u')"))
+
+        self.assertEqual(upgrade_job_table(engine), ['url_key', 'content_hash'])
+        self.assertEqual(upgrade_job_table(engine), [])
+        self.assertIn('url_key', {column['name'] for column in inspect(engine).get_columns('job')})
+
+        with Session(engine) as session:
+            counts = JobStore(session, job_table).upsert([make_job(1)], canonical_job_url)
+            self.assertEqual(counts['inserted'], 1)
+            counts = JobStore(session, job_table).upsert([make_job(1, "Senior Analyst 1")], canonical_job_url)
+            self.assertEqual(counts['updated'], 1)
+            self.assertEqual(session.execute(select(func.count()).select_from(job_table)).scalar(), 2)
+
+class TestSeenURLsInScraper(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine('sqlite://')
+        metadata.create_all(self.engine)
+        self.session = Session(self.engine)
+        self.addCleanup(self.session.close)
+        self.scraper = JobScraperAgent()
+        self.scraper.seen_urls = SeenURLFilter(path='', capacity=1000, error_rate=0.001)
+
+    def test_saved_versions_are_not_written_again(self):
+        self.scraper.save_scraped_jobs([make_job(1), make_job(2)], self.session, job_table)
+        statements = []
+        event.listen(self.engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+
+        counts = self.scraper.save_scraped_jobs([make_job(1), make_job(2)], self.session, job_table)
+        self.assertEqual(counts, {'inserted': 0, 'updated': 0, 'unchanged': 2})
+        self.assertEqual(statements, [])
+
+        # A changed posting is a new version
+        counts = self.scraper.save_scraped_jobs([make_job(2, "Senior Analyst 2")], self.session, job_table)
+        self.assertEqual(counts, {'inserted': 0, 'updated': 1, 'unchanged': 0})
+
+    def test_rebuilt_from_the_job_table(self):
+        self.scraper.save_scraped_jobs([make_job(1), make_job(2)], self.session, job_table)
+        self.scraper.seen_urls.clear()
+        self.assertNotIn("https://www.usajobs.gov/job/1", self.scraper.seen_urls)
+
+        # Each job's URL, its current version and its details cache key
+        self.assertEqual(self.scraper.rebuild_seen_urls(self.session, job_table), 6)
+        self.assertIn("https://www.usajobs.gov/job/1", self.scraper.seen_urls)
+        self.assertIn("detail:https://www.usajobs.gov/job/1", self.scraper.seen_urls)
+        counts = self.scraper.save_scraped_jobs([make_job(1)], self.session, job_table)
+        self.assertEqual(counts['unchanged'], 1)
+
+    def test_rebuilt_when_built_from_another_database(self):
+        self.scraper.save_scraped_jobs([make_job(1)], self.session, job_table)
+        generation = self.scraper.seen_urls.generation
+        self.assertEqual(len(generation), 32)
+
+        # A new database (or a filter file left over from one) has another generation
+        engine = create_engine('sqlite://')
+        metadata.create_all(engine)
+        with Session(engine) as session:
+            counts = self.scraper.save_scraped_jobs([make_job(1)], session, job_table)
+            self.assertEqual(counts, {'inserted': 1, 'updated': 0, 'unchanged': 0})
+        self.assertNotEqual(self.scraper.seen_urls.generation, generation)
+
+    def test_generation_is_stable(self):
+        store = JobStore(self.session, job_table)
+        self.assertEqual(store.generation(), JobStore(self.session, job_table).generation())
+
+if __name__ == '__main__':
+    unittest.main()
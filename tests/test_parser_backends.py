@@ -0,0 +1,52 @@
+import unittest
+import sys
+import os
+import glob
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.job_scraper import JobScraperAgent
+from agents.parser_backends import available_backends, resolve_backend
+
+FIXTURES = sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', '*.html')))
+
+def parse(backend, html):
+    jobs = JobScraperAgent(parser=backend).parse_search_results(html)
+    for job in jobs:
+        job.pop('date_posted')
+    return jobs
+
+class TestParserBackends(unittest.TestCase):
+    def test_backends_extract_identical_jobs(self):
+        """Every backend yields the same job dictionaries from recorded pages"""
+        self.assertTrue(FIXTURES, "No recorded pages in tests/fixtures")
+        for path in FIXTURES:
+            with open(path, encoding='utf-8') as f:
+                html = f.read()
+            expected = parse('html.parser', html)
+            self.assertEqual(len(expected), 25)
+            for backend in available_backends():
+                with self.subTest(page=os.path.basename(path), backend=backend):
+                    self.assertEqual(parse(backend, html), expected)
+
+    def test_strainer_falls_back_for_other_layouts(self):
+        """Pages without USAJobs result cards are still parsed in full"""
+        html = """
+        <html><body><div class="job-listing">
+            <h3 class="job-title"><a href="/job/1">Park Ranger</a></h3>
+            <span class="location">Yosemite, California</span>
+        </div></body></html>
+        """
+        jobs = parse('strainer', html)
+        self.assertEqual([job['title'] for job in jobs], ['Park Ranger'])
+        self.assertEqual(jobs, parse('html.parser', html))
+
+    def test_unknown_backend_uses_html_parser(self):
+        """Misconfigured backends degrade to the pure-Python parser"""
+        self.assertEqual(resolve_backend('html5lib'), 'html.parser')
+        self.assertEqual(resolve_backend(None), 'html.parser')
+        self.assertEqual(JobScraperAgent(parser='bogus').parser, 'html.parser')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+import sys
+import os
+import time
+from unittest.mock import patch
+
+from flask import Flask
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.job_scraper import JobScraperAgent
+from agents.prefetch import SearchLog, PrefetchCrawler
+from agents.search_cache import SearchCache
+
+class TestSearchLog(unittest.TestCase):
+    def test_hot_queries_by_popularity(self):
+        log = SearchLog(window=60)
+        for keywords in ["Nurse", "analyst", "nurse ", "", "nurse", "analyst", "clerk"]:
+            log.record(keywords, "")
+        self.assertEqual(log.hot(2), [("nurse", "", "full-time"), ("analyst", "", "full-time")])
+
+    def test_old_searches_are_forgotten(self):
+        log = SearchLog(window=0.05)
+        log.record("nurse", "")
+        time.sleep(0.1)
+        log.record("clerk", "")
+        self.assertEqual(log.hot(), [("clerk", "", "full-time")])
+
+class TestPrefetchCrawler(unittest.TestCase):
+    def setUp(self):
+        self.fetched = []
+        self.scraper = JobScraperAgent(cache=SearchCache(ttl=600, soft_ttl=300))
+        # Refreshes go through the patched full fetch
+        self.scraper.incremental = False
+
+        def fetch(keywords, location, job_type="full-time", page=1):
+            self.fetched.append(keywords)
+            return [{'title': f"{keywords} job", 'url': f"https://www.usajobs.gov/job/{keywords}"}]
+
+        patcher = patch.object(self.scraper, 'fetch_usajobs', side_effect=fetch)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_warms_fixed_and_popular_queries(self):
+        """After a run, page views for hot queries are served from the cache"""
+        log = SearchLog()
+        log.record("nurse", "Denver")
+        crawler = PrefetchCrawler(self.scraper, queries=[("analyst", "")], search_log=log, interval=60)
+
+        self.assertEqual(crawler.run_once(), 2)
+        self.assertEqual(self.fetched, ["analyst", "nurse"])
+
+        self.fetched.clear()
+        jobs, freshness = self.scraper.search_usajobs("Nurse", "denver")
+        self.assertEqual(freshness['status'], 'fresh')
+        self.assertEqual(jobs[0]['title'], "nurse job")
+        self.assertEqual(self.fetched, [])
+
+    def test_only_entries_due_before_next_run_are_refetched(self):
+        crawler = PrefetchCrawler(self.scraper, queries=[("analyst", ""), ("clerk", "")],
+                                  search_log=SearchLog(), interval=60)
+        self.scraper.cache.set("analyst", "", "full-time", [{'title': "cached"}])
+        crawler.run_once()
+        self.assertEqual(self.fetched, ["clerk"])
+
+        # Entries older than soft TTL minus the interval would go stale before the next run
+        with patch('agents.search_cache.time.time', return_value=time.time() + 250):
+            self.fetched.clear()
+            crawler.run_once()
+        self.assertEqual(sorted(self.fetched), ["analyst", "clerk"])
+
+    def test_background_thread(self):
+        crawler = PrefetchCrawler(self.scraper, queries=[("analyst", "")], search_log=SearchLog(), interval=60)
+        crawler.start()
+        for _ in range(50):
+            if crawler.runs:
+                break
+            time.sleep(0.02)
+        crawler.stop(timeout=1)
+        self.assertEqual(self.fetched, ["analyst"])
+        self.assertFalse(crawler.stats()['running'])
+
+    def test_started_once_by_the_first_request(self):
+        """Any WSGI server starts the crawler, in the process that serves requests"""
+        app = Flask(__name__)
+        app.add_url_rule('/', 'index', lambda: 'ok')
+        crawler = PrefetchCrawler(self.scraper, queries=[("analyst", "")], search_log=SearchLog(), interval=60)
+        crawler.init_app(app)
+        self.addCleanup(crawler.stop, 1)
+        self.assertFalse(crawler.stats()['running'])
+
+        with patch.object(crawler, 'start', wraps=crawler.start) as start:
+            client = app.test_client()
+            client.get('/')
+            client.get('/')
+        self.assertEqual(start.call_count, 1)
+        self.assertTrue(crawler.stats()['running'])
+
+    def test_not_started_by_test_apps(self):
+        app = Flask(__name__)
+        app.testing = True
+        app.add_url_rule('/', 'index', lambda: 'ok')
+        crawler = PrefetchCrawler(self.scraper, search_log=SearchLog(), interval=60).init_app(app)
+        app.test_client().get('/')
+        self.assertFalse(crawler.stats()['running'])
+
+if __name__ == '__main__':
+    unittest.main()
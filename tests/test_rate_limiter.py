@@ -0,0 +1,133 @@
+import unittest
+import sys
+import os
+import tempfile
+import threading
+import time
+from unittest.mock import patch
+
+import requests
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.rate_limiter import (RateLimiter, RateLimitTimeout, MemoryBucketStore,
+                                 SQLiteBucketStore, next_slot)
+from agents.job_scraper import JobScraperAgent
+
+class TestNextSlot(unittest.TestCase):
+    def test_burst_then_rate(self):
+        """The first `burst` requests go at once, later ones one interval apart"""
+        tat, waits = None, []
+        for _ in range(5):
+            wait, tat = next_slot(tat, 100.0, 0.5, 1.0, max_wait=10)
+            waits.append(wait)
+        self.assertEqual(waits, [0, 0, 0, 0.5, 1.0])
+
+    def test_slot_past_deadline_is_not_booked(self):
+        wait, tat = next_slot(105.0, 100.0, 0.5, 0.0, max_wait=1)
+        self.assertIsNone(wait)
+        self.assertEqual(tat, 105.0)
+
+class LimiterContract:
+    """Behaviour every bucket store must provide"""
+
+    def test_threads_share_the_budget(self):
+        """Concurrent callers are spaced out to the configured rate"""
+        limiter = RateLimiter(rate=20, burst=1, max_wait=5, store=self.store)
+        sent = []
+        lock = threading.Lock()
+
+        def call():
+            limiter.acquire('usajobs.gov')
+            with lock:
+                sent.append(time.monotonic())
+
+        threads = [threading.Thread(target=call) for _ in range(6)]
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # Six requests at 20/s need at least five intervals
+        self.assertGreaterEqual(max(sent) - start, 0.24)
+
+    def test_caller_past_deadline_is_turned_away(self):
+        limiter = RateLimiter(rate=1, burst=1, max_wait=0.1, store=self.store)
+        limiter.acquire('usajobs.gov')
+        start = time.monotonic()
+        with self.assertRaises(RateLimitTimeout):
+            limiter.acquire('usajobs.gov')
+        self.assertLess(time.monotonic() - start, 0.1)
+        # Other hosts have their own bucket
+        limiter.acquire('boards-api.greenhouse.io')
+
+    def test_backoff_holds_every_caller(self):
+        limiter = RateLimiter(rate=100, burst=4, max_wait=5, store=self.store)
+        limiter.backoff('usajobs.gov', 0.5)
+        self.assertAlmostEqual(limiter.reserve('usajobs.gov'), 0.5, delta=0.05)
+        self.assertIsNone(limiter.reserve('usajobs.gov', timeout=0.1))
+
+class TestMemoryBucketStore(LimiterContract, unittest.TestCase):
+    def setUp(self):
+        self.store = MemoryBucketStore()
+
+class TestSQLiteBucketStore(LimiterContract, unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'limits.db')
+        self.store = SQLiteBucketStore(self.path)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_limit_holds_across_processes(self):
+        """Two limiters on the same file (as in two workers) draw from one bucket"""
+        first = RateLimiter(rate=1, burst=2, max_wait=0, store=self.store)
+        second = RateLimiter(rate=1, burst=2, max_wait=0, store=SQLiteBucketStore(self.path))
+        first.acquire('usajobs.gov')
+        second.acquire('usajobs.gov')
+        with self.assertRaises(RateLimitTimeout):
+            first.acquire('usajobs.gov')
+
+class TestScraperUsesLimiter(unittest.TestCase):
+    def test_every_session_request_takes_a_slot(self):
+        """Requests sent through the scraper's session are counted against their host"""
+        limiter = RateLimiter(rate=1, burst=1, max_wait=0, store=MemoryBucketStore())
+        scraper = JobScraperAgent(rate_limiter=limiter)
+        response = requests.Response()
+        response.status_code = 200
+        with patch('requests.adapters.HTTPAdapter.send', return_value=response) as send:
+            scraper.session.get('https://www.usajobs.gov/Search/Results?k=nurse')
+            with self.assertRaises(RateLimitTimeout):
+                scraper.session.get('https://www.usajobs.gov/Search/Results?k=nurse&p=2')
+        self.assertEqual(send.call_count, 1)
+
+    def test_detail_fetches_do_not_use_up_search_slots(self):
+        """Announcement fetches draw from their own bucket for the same host"""
+        store = MemoryBucketStore()
+        limiter = RateLimiter(rate=1, burst=1, max_wait=0, store=store)
+        details = RateLimiter(rate=1, burst=1, max_wait=0, store=store, prefix='detail:')
+        scraper = JobScraperAgent(rate_limiter=limiter, detail_rate_limiter=details)
+        response = requests.Response()
+        response.status_code = 200
+        with patch('requests.adapters.HTTPAdapter.send', return_value=response) as send:
+            scraper.detail_session.get('https://www.usajobs.gov/job/1')
+            with self.assertRaises(RateLimitTimeout):
+                scraper.detail_session.get('https://www.usajobs.gov/job/2')
+            scraper.session.get('https://www.usajobs.gov/Search/Results?k=nurse')
+        self.assertEqual(send.call_count, 2)
+
+    def test_retries_back_off_through_the_limiter(self):
+        """Failed requests push back the host's next slot instead of sleeping"""
+        limiter = RateLimiter(rate=100, burst=1, max_wait=5, store=MemoryBucketStore())
+        scraper = JobScraperAgent(rate_limiter=limiter)
+        with patch.object(scraper.session, 'get', side_effect=requests.ConnectionError('down')), \
+                patch.object(limiter, 'backoff') as backoff, \
+                patch('agents.job_scraper.time.sleep') as sleep:
+            self.assertEqual(scraper.fetch_usajobs('nurse', ''), [])
+        self.assertEqual([c.args for c in backoff.call_args_list], [('www.usajobs.gov', 2), ('www.usajobs.gov', 4)])
+        sleep.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import unittest
+import sys
+import os
+import time
+from unittest.mock import patch, MagicMock
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.search_cache import SearchCache, normalize_query
+from agents.job_scraper import JobScraperAgent
+
+class TestSearchCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = SearchCache(ttl=60, max_entries=2)
+        self.jobs = [{'title': 'Clerk', 'url': 'https://www.usajobs.gov/job/1'}]
+
+    def test_normalized_key(self):
+        """Case and whitespace differences share one cache entry"""
+        self.assertEqual(normalize_query("Data  Analyst", " DC ", "Full-Time"),
+                         normalize_query("data analyst", "dc", "full-time"))
+
+        self.cache.set("Data  Analyst", "DC", "full-time", self.jobs)
+        self.assertEqual(self.cache.get("data analyst", "dc", "full-time"), self.jobs)
+
+    def test_hit_and_miss_counters(self):
+        """Lookups are counted as hits or misses"""
+        self.assertIsNone(self.cache.get("clerk", "", "full-time"))
+        self.cache.set("clerk", "", "full-time", self.jobs)
+        self.cache.get("clerk", "", "full-time")
+
+        stats = self.cache.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['entries'], 1)
+
+    def test_ttl_expiry(self):
+        """Entries older than the TTL are treated as misses"""
+        cache = SearchCache(ttl=0.05, max_entries=2)
+        cache.set("clerk", "", "full-time", self.jobs)
+        time.sleep(0.06)
+        self.assertIsNone(cache.get("clerk", "", "full-time"))
+
+    def test_lru_eviction(self):
+        """The least recently used entry is evicted when the cache is full"""
+        self.cache.set("a", "", "full-time", self.jobs)
+        self.cache.set("b", "", "full-time", self.jobs)
+        self.cache.get("a", "", "full-time")
+        self.cache.set("c", "", "full-time", self.jobs)
+
+        self.assertIsNotNone(self.cache.get("a", "", "full-time"))
+        self.assertIsNone(self.cache.get("b", "", "full-time"))
+
+    def test_invalidate(self):
+        """Single searches or the whole cache can be invalidated by hand"""
+        self.cache.set("a", "", "full-time", self.jobs)
+        self.cache.set("b", "", "full-time", self.jobs)
+
+        self.assertEqual(self.cache.invalidate("a", ""), 1)
+        self.assertIsNone(self.cache.get("a", "", "full-time"))
+        self.assertEqual(self.cache.invalidate(), 1)
+        self.assertEqual(self.cache.stats()['entries'], 0)
+
+    @patch('requests.Session.get')
+    def test_scraper_serves_repeat_searches_from_cache(self, mock_get):
+        """A repeated search does not hit USAJobs again"""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.text = "<div><h3>Clerk</h3></div>"
+        mock_get.return_value = mock_response
+
+        scraper = JobScraperAgent(cache=SearchCache(ttl=60))
+        first = scraper.scrape_usajobs("Clerk", "")
+        second = scraper.scrape_usajobs("clerk ", "")
+
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(first, second)
+        self.assertEqual(scraper.cache_stats()['hits'], 1)
+
+    @patch('requests.Session.get')
+    def test_stale_results_served_while_refreshing(self, mock_get):
+        """Past the soft TTL, cached results are returned at once and refreshed in the background"""
+        titles = iter(["Clerk", "Senior Clerk"])
+
+        def respond(*args, **kwargs):
+            response = MagicMock()
+            response.status_code = 200
+            response.text = f"<div><h3>{next(titles)}</h3></div>"
+            return response
+
+        mock_get.side_effect = respond
+        scraper = JobScraperAgent(cache=SearchCache(ttl=60, soft_ttl=0.05))
+        # The mocked responses can't be streamed, so refresh with a full fetch
+        scraper.incremental = False
+
+        jobs, freshness = scraper.search_usajobs("clerk", "")
+        self.assertEqual(freshness['status'], 'live')
+        self.assertEqual(jobs[0]['title'], "Clerk")
+
+        time.sleep(0.1)
+        jobs, freshness = scraper.search_usajobs("clerk", "")
+        self.assertEqual(freshness['status'], 'stale')
+        self.assertTrue(freshness['refreshing'])
+        self.assertEqual(jobs[0]['title'], "Clerk")
+
+        # The background refresh replaces the entry
+        for _ in range(50):
+            if mock_get.call_count == 2 and not scraper._refreshing:
+                break
+            time.sleep(0.02)
+        jobs, freshness = scraper.search_usajobs("clerk", "")
+        self.assertEqual(freshness['status'], 'fresh')
+        self.assertEqual(jobs[0]['title'], "Senior Clerk")
+
+if __name__ == '__main__':
+    unittest.main()
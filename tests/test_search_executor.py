@@ -0,0 +1,72 @@
+import unittest
+import sys
+import os
+import threading
+import time
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.search_executor import SearchExecutor
+
+class TestSearchExecutor(unittest.TestCase):
+    def setUp(self):
+        self.executor = SearchExecutor(max_workers=3)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def test_returns_first_non_empty_in_priority_order(self):
+        """A fast low-priority hit must not beat a slower higher-priority hit"""
+        def slow_hit():
+            time.sleep(0.2)
+            return ['slow']
+
+        searches = [
+            ('empty', lambda: []),
+            ('slow', slow_hit),
+            ('fast', lambda: ['fast']),
+        ]
+        label, results = self.executor.first_non_empty(searches)
+        self.assertEqual(label, 'slow')
+        self.assertEqual(results, ['slow'])
+
+    def test_all_empty_returns_no_results(self):
+        """All empty (or failing) searches yield an empty result"""
+        def broken():
+            raise ValueError("upstream error")
+
+        label, results = self.executor.first_non_empty([('a', lambda: []), ('b', broken)])
+        self.assertIsNone(label)
+        self.assertEqual(results, [])
+
+    def test_concurrency_is_bounded_and_rest_cancelled(self):
+        """No more than max_workers searches run at once, and queued ones are cancelled"""
+        lock = threading.Lock()
+        running = [0]
+        peak = [0]
+        started = []
+
+        def search(name, results):
+            def run():
+                with lock:
+                    started.append(name)
+                    running[0] += 1
+                    peak[0] = max(peak[0], running[0])
+                time.sleep(0.1)
+                with lock:
+                    running[0] -= 1
+                return results
+            return run
+
+        searches = [(str(i), search(str(i), [i] if i == 0 else [])) for i in range(10)]
+        label, results = self.executor.first_non_empty(searches)
+        self.assertEqual(label, '0')
+        self.assertLessEqual(peak[0], 3)
+
+        # Give already-running searches time to drain; queued ones never start
+        time.sleep(0.3)
+        self.assertLess(len(started), 10)
+
+if __name__ == '__main__':
+    unittest.main()
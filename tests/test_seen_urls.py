@@ -0,0 +1,88 @@
+import unittest
+import sys
+import os
+import multiprocessing
+import tempfile
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.seen_urls import SeenURLFilter, bloom_size
+
+def add_urls(path, start, count):
+    seen = SeenURLFilter(path, capacity=10000, error_rate=0.001)
+    seen.update(f"https://www.usajobs.gov/job/{n}" for n in range(start, start + count))
+    seen.close()
+
+class TestSeenURLFilter(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, 'seen.bloom')
+
+    def test_sized_from_capacity_and_error_rate(self):
+        bits, hashes = bloom_size(1000000, 0.001)
+        self.assertAlmostEqual(bits / 1000000, 14.38, delta=0.01)
+        self.assertEqual(hashes, 10)
+
+    def test_no_false_negatives_and_few_false_positives(self):
+        seen = SeenURLFilter(path='', capacity=5000, error_rate=0.01)
+        urls = [f"https://www.usajobs.gov/job/{n}" for n in range(5000)]
+        # Keys already reported as present (false positives) don't count as new
+        self.assertGreater(seen.update(urls), len(urls) * 0.98)
+        self.assertTrue(all(url in seen for url in urls))
+        false_positives = sum(1 for n in range(5000, 15000) if f"https://www.usajobs.gov/job/{n}" in seen)
+        self.assertLess(false_positives / 10000, 0.02)
+        self.assertFalse(seen.add(urls[0]))
+
+    def test_reopened_from_disk(self):
+        seen = SeenURLFilter(self.path, capacity=1000, error_rate=0.01)
+        seen.add("https://www.usajobs.gov/job/1")
+        seen.close()
+
+        # Different settings don't resize an existing file
+        reopened = SeenURLFilter(self.path, capacity=50000, error_rate=0.0001)
+        self.addCleanup(reopened.close)
+        self.assertIn("https://www.usajobs.gov/job/1", reopened)
+        self.assertNotIn("https://www.usajobs.gov/job/2", reopened)
+        self.assertEqual(len(reopened), 1)
+        self.assertEqual(reopened.bits, bloom_size(1000, 0.01)[0])
+
+    def test_unreadable_file_is_replaced(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'not a filter')
+        seen = SeenURLFilter(self.path, capacity=1000, error_rate=0.01)
+        self.addCleanup(seen.close)
+        self.assertEqual(len(seen), 0)
+        self.assertTrue(seen.add("https://www.usajobs.gov/job/1"))
+
+    def test_generation_is_kept_in_the_file(self):
+        seen = SeenURLFilter(self.path, capacity=1000, error_rate=0.01)
+        self.assertEqual(seen.generation, '')
+        self.assertEqual(seen.rebuild(["https://www.usajobs.gov/job/1"], 'a' * 32), 1)
+        seen.close()
+
+        reopened = SeenURLFilter(self.path, capacity=1000, error_rate=0.01)
+        self.addCleanup(reopened.close)
+        self.assertEqual(reopened.generation, 'a' * 32)
+        reopened.add("https://www.usajobs.gov/job/2")
+        self.assertEqual(reopened.generation, 'a' * 32)
+        reopened.clear()
+        self.assertEqual(reopened.generation, '')
+
+    def test_processes_sharing_the_file_keep_every_write(self):
+        SeenURLFilter(self.path, capacity=10000, error_rate=0.001).close()
+        workers = [multiprocessing.Process(target=add_urls, args=(self.path, n * 500, 500)) for n in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        seen = SeenURLFilter(self.path)
+        self.addCleanup(seen.close)
+        self.assertTrue(all(f"https://www.usajobs.gov/job/{n}" in seen for n in range(2000)))
+        # Counts written under the lock aren't lost (false positives aren't counted)
+        self.assertGreater(len(seen), 1980)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+import sys
+import os
+from bs4 import BeautifulSoup
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.job_scraper import JobScraperAgent
+from agents.selector_plan import SelectorPlan
+
+ALTERNATE_LAYOUT_HTML = """
+<div class="job-search-results__item"><h3><a href="/job/alt-{n}">Alternate {n}</a></h3></div>
+"""
+
+CARD_HTML = """
+<article class="usajobs-search-result-card">
+    <h3><a class="usa-link" href="/job/{n}">Analyst {n}</a></h3>
+    <span class="agency-name">Department of Energy</span>
+    <span class="location-text">Denver, CO</span>
+    <p class="usa-prose">Analyze programs.</p>
+    <span class="pay">$90,000 per year</span>
+</article>
+"""
+
+class TestSelectorPlan(unittest.TestCase):
+    def test_remembers_last_matching_selector(self):
+        """After one cascade walk the winning selector is tried first"""
+        plan = SelectorPlan('title', ['.missing', 'h3 a', 'h3'])
+        soup = BeautifulSoup("<div><h3><a href='/x'>Job</a></h3></div>", 'html.parser')
+
+        self.assertEqual(plan.select_one(soup).text, 'Job')
+        self.assertEqual(plan.preferred_selector, 'h3 a')
+        plan.select_one(soup)
+        plan.select_one(soup)
+
+        stats = plan.stats()
+        self.assertEqual((stats['hits'], stats['fallbacks'], stats['misses']), (2, 1, 0))
+        self.assertAlmostEqual(stats['hit_rate'], 0.667)
+
+    def test_falls_back_when_layout_changes(self):
+        """A miss on the remembered selector walks the cascade and re-learns"""
+        plan = SelectorPlan('title', ['.old-title', '.new-title'])
+        old = BeautifulSoup("<span class='old-title'>Old</span>", 'html.parser')
+        new = BeautifulSoup("<span class='new-title'>New</span>", 'html.parser')
+
+        self.assertEqual(plan.select_one(old).text, 'Old')
+        self.assertEqual(plan.select_one(new).text, 'New')
+        self.assertEqual(plan.preferred_selector, '.new-title')
+        self.assertIsNone(plan.select_one(BeautifulSoup("<p></p>", 'html.parser')))
+        self.assertEqual(plan.stats()['misses'], 1)
+
+    def test_generic_selectors_are_never_remembered(self):
+        """A last-resort match doesn't get tried ahead of the specific selectors"""
+        plan = SelectorPlan('container', ['.result-card'], generic=['div:has(h3)'])
+        loose = BeautifulSoup("<div><h3>Sign up for alerts</h3></div>", 'html.parser')
+        cards = BeautifulSoup("<div class='result-card'><h3>Analyst</h3></div><div><h3>Ad</h3></div>",
+                              'html.parser')
+
+        self.assertEqual(len(plan.select(loose)), 1)
+        self.assertEqual(plan.last_selector, 'div:has(h3)')
+        self.assertIsNone(plan.preferred_selector)
+
+        matched = plan.select(cards)
+        self.assertEqual([card.h3.text for card in matched], ['Analyst'])
+        self.assertEqual(plan.preferred_selector, '.result-card')
+
+    def test_parser_learns_plan_across_cards(self):
+        """Parsing a page of same-template cards hits the remembered selectors"""
+        scraper = JobScraperAgent()
+        html = ''.join(CARD_HTML.format(n=n) for n in range(5))
+
+        jobs = scraper.parse_search_results(html)
+        self.assertEqual([job['title'] for job in jobs], [f"Analyst {n}" for n in range(5)])
+        self.assertEqual(jobs[0]['company'], 'Department of Energy')
+        self.assertEqual(jobs[0]['salary'], '$90,000 per year')
+
+        stats = scraper.selector_stats()
+        self.assertEqual(stats['title']['fallbacks'], 1)
+        self.assertEqual(stats['title']['hits'], 4)
+        self.assertEqual(stats['salary']['preferred'], 'span[class*="pay"]')
+
+        # A second page re-uses the container selector without walking the cascade
+        scraper.parse_search_results(html)
+        self.assertEqual(scraper.selector_stats()['container']['hits'], 1)
+
+    def test_alternate_layout_does_not_change_the_standard_page(self):
+        """A page only substring selectors match doesn't make them the first choice"""
+        scraper = JobScraperAgent()
+        alternate = scraper.parse_search_results(''.join(ALTERNATE_LAYOUT_HTML.format(n=n) for n in range(3)))
+        self.assertEqual([job['title'] for job in alternate], [f"Alternate {n}" for n in range(3)])
+
+        with open(os.path.join(FIXTURES, 'usajobs_results.html'), encoding='utf-8') as f:
+            jobs = scraper.parse_search_results(f.read())
+        self.assertEqual(len(jobs), 25)
+        self.assertEqual(len({job['url'] for job in jobs}), 25)
+
+if __name__ == '__main__':
+    unittest.main()
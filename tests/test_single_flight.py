@@ -0,0 +1,126 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import threading
+import time
+from unittest.mock import patch, MagicMock
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.single_flight import SingleFlight
+from agents.deadline import DeadlineExceeded, deadline_scope
+from agents.job_scraper import JobScraperAgent
+from agents.search_cache import SearchCache, SQLiteBackend
+
+class TestSingleFlight(unittest.TestCase):
+    def test_concurrent_callers_share_one_call(self):
+        """Callers arriving while a call runs wait for it instead of repeating it"""
+        flight = SingleFlight()
+        calls = []
+
+        def work():
+            calls.append(1)
+            time.sleep(0.2)
+            return 'result'
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(flight.do('key', work))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ['result'] * 5)
+        self.assertEqual(flight.in_flight(), 0)
+
+    def test_errors_reach_every_waiter(self):
+        """An exception in the shared call is raised to the caller"""
+        flight = SingleFlight()
+
+        def broken():
+            raise ValueError("upstream error")
+
+        with self.assertRaises(ValueError):
+            flight.do('key', broken)
+        self.assertEqual(flight.do('key', lambda: 'retried'), 'retried')
+
+    def test_waiters_give_up_at_their_deadline(self):
+        """A caller waiting on a slow shared call stops waiting when its budget runs out"""
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow():
+            started.set()
+            release.wait(2)
+            return 'result'
+
+        leader = threading.Thread(target=lambda: flight.do('key', slow))
+        leader.start()
+        started.wait(1)
+        begin = time.monotonic()
+        with deadline_scope(0.1):
+            with self.assertRaises(DeadlineExceeded):
+                flight.do('key', slow)
+        self.assertLess(time.monotonic() - begin, 0.5)
+        release.set()
+        leader.join()
+
+class TestScraperCoalescing(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def slow_response(self, *args, **kwargs):
+        time.sleep(0.2)
+        response = MagicMock()
+        response.status_code = 200
+        response.text = "<div><h3>Clerk</h3></div>"
+        return response
+
+    @patch('requests.Session.get')
+    def test_threads_share_one_upstream_fetch(self, mock_get):
+        """Concurrent identical searches in a worker issue one request"""
+        mock_get.side_effect = self.slow_response
+        scraper = JobScraperAgent(cache=SearchCache(ttl=60))
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(scraper.scrape_usajobs("clerk", "")))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual([len(jobs) for jobs in results], [1, 1, 1, 1])
+
+    @patch('requests.Session.get')
+    def test_workers_wait_on_shared_lease(self, mock_get):
+        """A worker waits for the lease holder's result instead of fetching itself"""
+        path = os.path.join(self.test_dir, 'cache.db')
+        first_worker = SearchCache(ttl=60, backend=SQLiteBackend(path))
+        second_worker = JobScraperAgent(cache=SearchCache(ttl=60, backend=SQLiteBackend(path)))
+
+        # The first worker is mid-fetch when the second one asks
+        self.assertTrue(first_worker.acquire_lease("clerk", "", "full-time", 30))
+
+        def finish_first_fetch():
+            time.sleep(0.3)
+            first_worker.set("clerk", "", "full-time", [{'title': 'Clerk'}])
+            first_worker.release_lease("clerk", "", "full-time")
+
+        threading.Thread(target=finish_first_fetch).start()
+        jobs = second_worker.scrape_usajobs("clerk", "")
+
+        self.assertEqual(jobs, [{'title': 'Clerk'}])
+        mock_get.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
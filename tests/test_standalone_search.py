@@ -0,0 +1,158 @@
+import unittest
+import sys
+import os
+import json
+from datetime import datetime
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import standalone_job_search
+from agents.search_cache import FallbackCache, MemoryBackend
+
+class TestSearchWithFallbacks(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.fallback_cache = FallbackCache(MemoryBackend(), ttl=60)
+        patcher = patch.object(standalone_job_search, 'fallback_cache', self.fallback_cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def fake_search(self, answers):
+        """scrape_usajobs/search_usajobs stand-ins that only answer the given keywords"""
+        def scrape(keywords, location, job_type="full-time"):
+            self.calls.append((keywords, location))
+            return [{'title': f"{keywords} job"}] if keywords in answers else []
+
+        def search(keywords, location, job_type="full-time"):
+            return scrape(keywords, location, job_type), None
+
+        scraper = standalone_job_search.job_scraper
+        return (patch.object(scraper, 'scrape_usajobs', side_effect=scrape),
+                patch.object(scraper, 'search_usajobs', side_effect=search))
+
+    def test_remembers_answering_fallback_step(self):
+        """A repeated empty query goes straight to the step that answered it"""
+        scrape_patch, search_patch = self.fake_search({'engineering'})
+        with scrape_patch, search_patch:
+            results, _ = standalone_job_search.search_with_fallbacks("engineer", "Nowhere", "full-time")
+            self.assertEqual(results, [{'title': 'engineering job'}])
+            self.assertEqual(self.fallback_cache.get("engineer", "Nowhere"), "related term engineering")
+
+            self.calls.clear()
+            results, _ = standalone_job_search.search_with_fallbacks("Engineer", "nowhere", "full-time")
+            self.assertEqual(results, [{'title': 'engineering job'}])
+            self.assertEqual(self.calls, [("engineering", "")])
+
+    def test_remembers_that_nothing_answers(self):
+        """When only sample data answers, later requests skip every upstream search"""
+        scrape_patch, search_patch = self.fake_search(set())
+        with scrape_patch, search_patch:
+            first, _ = standalone_job_search.search_with_fallbacks("software", "", "full-time")
+            self.calls.clear()
+            second, _ = standalone_job_search.search_with_fallbacks("software", "", "full-time")
+
+        self.assertEqual(self.calls, [])
+        self.assertEqual([job['title'] for job in first], [job['title'] for job in second])
+
+    def test_open_circuit_falls_back_without_remembering(self):
+        """While USAJobs is unreachable, sample data is served but not remembered for the search"""
+        scrape_patch, search_patch = self.fake_search(set())
+        scraper = standalone_job_search.job_scraper
+        with scrape_patch, search_patch, patch.object(scraper, 'circuit_open', return_value=True):
+            results, _ = standalone_job_search.search_with_fallbacks("software", "", "full-time")
+
+        self.assertTrue(results)
+        self.assertIsNone(self.fallback_cache.get("software", ""))
+
+def job_dict(title):
+    return {'title': title, 'company': 'Department of Energy', 'location': 'Denver, CO',
+            'description': 'Analyze programs.', 'salary': '$90,000 per year',
+            'url': f'https://www.usajobs.gov/job/{title}', 'source': 'USAJobs.gov',
+            'date_posted': datetime(2026, 1, 5)}
+
+def parse_events(body):
+    """Split a text/event-stream body into (event, data) pairs"""
+    events = []
+    for block in body.strip().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.split('\n'))
+        events.append((fields['event'], json.loads(fields['data'])))
+    return events
+
+class TestSearchJobsStream(unittest.TestCase):
+    def setUp(self):
+        standalone_job_search.app.config['LOGIN_DISABLED'] = True
+        self.addCleanup(standalone_job_search.app.config.pop, 'LOGIN_DISABLED')
+        # Testing mode also keeps the prefetcher from starting
+        standalone_job_search.app.config['TESTING'] = True
+        self.addCleanup(standalone_job_search.app.config.__setitem__, 'TESTING', False)
+        patcher = patch.object(standalone_job_search, 'fallback_cache', FallbackCache(MemoryBackend(), ttl=60))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = standalone_job_search.app.test_client()
+
+    def stream(self, **params):
+        response = self.client.get('/api/search-jobs/stream', query_string=params)
+        self.assertEqual(response.mimetype, 'text/event-stream')
+        return parse_events(response.get_data(as_text=True))
+
+    def test_streams_jobs_with_rendered_cards(self):
+        """Each parsed job is pushed as its own event, after a progress event"""
+        scraper = standalone_job_search.job_scraper
+        jobs = iter([job_dict('Analyst'), job_dict('Economist')])
+        with patch.object(scraper, 'stream_usajobs', return_value=jobs):
+            events = self.stream(keywords='analyst', location='')
+
+        self.assertEqual([event for event, _ in events], ['progress', 'job', 'job', 'done'])
+        self.assertIn('Analyst', events[1][1]['card'])
+        self.assertIn(f"jobModal{events[1][1]['id']}", events[1][1]['modal'])
+        self.assertEqual(events[-1][1], {'count': 2, 'step': 'usajobs'})
+
+        # Streamed jobs can be opened in the resume optimizer
+        ids = {job.id for job in standalone_job_search.scraped_jobs}
+        self.assertIn(events[2][1]['id'], ids)
+
+    def test_reports_each_fallback_step(self):
+        """Empty searches report progress for every fallback step they try"""
+        scraper = standalone_job_search.job_scraper
+        def scrape(keywords, location, job_type="full-time"):
+            return [job_dict('Engineering Technician')] if keywords == 'engineering' else []
+
+        with patch.object(scraper, 'stream_usajobs', return_value=iter([])), \
+             patch.object(scraper, 'scrape_usajobs', side_effect=scrape):
+            events = self.stream(keywords='engineer', location='Nowhere')
+
+        steps = [data['step'] for event, data in events if event == 'progress']
+        self.assertEqual(steps, ['usajobs', 'alternatives', 'without location', 'related term engineering'])
+        self.assertEqual(events[-1], ('done', {'count': 1, 'step': 'related term engineering'}))
+
+class TestSearchJobsAPI(unittest.TestCase):
+    def setUp(self):
+        standalone_job_search.app.config['LOGIN_DISABLED'] = True
+        self.addCleanup(standalone_job_search.app.config.pop, 'LOGIN_DISABLED')
+        standalone_job_search.app.config['TESTING'] = True
+        self.addCleanup(standalone_job_search.app.config.__setitem__, 'TESTING', False)
+        patcher = patch.object(standalone_job_search.job_scraper, 'crawl_usajobs', return_value=[])
+        self.crawl = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = standalone_job_search.app.test_client()
+
+    def search(self, **data):
+        return self.client.post('/api/search-jobs', json=dict(keywords="nurse", **data))
+
+    def test_crawl_limits_are_capped(self):
+        response = self.search(max_pages="3", max_results=100000)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.crawl.call_args.kwargs,
+                         {'max_pages': 3, 'max_results': standalone_job_search.SCRAPER_CONFIG['REQUEST_MAX_RESULTS']})
+
+    def test_bad_crawl_limits_are_rejected(self):
+        for data in ({'max_pages': "lots"}, {'max_pages': 0}, {'max_results': -5}, {'max_results': [1]}):
+            response = self.search(**data)
+            self.assertEqual(response.status_code, 400, data)
+            self.assertFalse(response.get_json()['success'])
+        self.crawl.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+import sys
+import os
+import threading
+from http.server import BaseHTTPRequestHandler
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.job_scraper import JobScraperAgent
+from agents.stream_parser import ResultCardStream
+from stub_server import StubServerTestCase
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'usajobs_results.html')
+
+with open(FIXTURE, encoding='utf-8') as f:
+    PAGE = f.read()
+
+# Split after the second result card, so the stub can stall mid-page
+SPLIT_AT = PAGE.index('data-document-id', PAGE.index('data-document-id', PAGE.index('data-document-id') + 1) + 1)
+
+def without_dates(jobs):
+    for job in jobs:
+        job.pop('date_posted')
+    return jobs
+
+class StallingHandler(BaseHTTPRequestHandler):
+    """Sends the first cards, then holds the rest of the page until released"""
+    protocol_version = 'HTTP/1.1'
+    release = threading.Event()
+
+    def write_chunk(self, text):
+        data = text.encode()
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        self.write_chunk(PAGE[:SPLIT_AT])
+        self.release.wait(5)
+        self.write_chunk(PAGE[SPLIT_AT:])
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, format, *args):
+        pass
+
+class TestResultCardStream(unittest.TestCase):
+    def test_cards_split_across_chunks(self):
+        """Cards are emitted whole no matter where the chunk boundaries fall"""
+        stream = ResultCardStream()
+        cards = []
+        for i in range(0, len(PAGE), 37):
+            cards.extend(stream.feed(PAGE[i:i + 37]))
+        cards.extend(stream.close())
+
+        self.assertEqual(len(cards), 25)
+        self.assertTrue(cards[0].startswith('<div class="usajobs-search-result--core"'))
+        self.assertTrue(cards[0].endswith('</div>'))
+        self.assertIsNone(stream.buffered_page)
+
+    def test_streamed_jobs_match_full_parse(self):
+        """Incremental parsing yields the same jobs as parsing the whole page"""
+        scraper = JobScraperAgent()
+        chunks = (PAGE[i:i + 512] for i in range(0, len(PAGE), 512))
+        self.assertEqual(without_dates(list(scraper.iter_search_results(chunks))),
+                         without_dates(scraper.parse_search_results(PAGE)))
+
+    def test_other_layouts_fall_back_to_full_parse(self):
+        """Pages without result cards are parsed in full once the body has been read"""
+        html = "<div><h3>Project Manager</h3>Department of Defense</div>"
+        jobs = list(JobScraperAgent().iter_search_results([html[:10], html[10:]]))
+        self.assertEqual([job['title'] for job in jobs], ["Project Manager"])
+
+class TestStreamUSAJobs(StubServerTestCase):
+    handler = StallingHandler
+
+    @classmethod
+    def tearDownClass(cls):
+        StallingHandler.release.set()
+        super().tearDownClass()
+
+    def test_first_jobs_arrive_before_page_completes(self):
+        """Jobs are yielded while the rest of the page is still downloading"""
+        scraper = JobScraperAgent()
+        scraper.SEARCH_URL = f"{self.base}/Search/Results"
+
+        jobs = scraper.stream_usajobs("analyst", "", chunk_size=1024)
+        first = next(jobs)
+        self.assertFalse(StallingHandler.release.is_set())
+
+        StallingHandler.release.set()
+        streamed = [first] + list(jobs)
+        self.assertEqual(len(streamed), 25)
+
+        # The complete result is cached for the next search
+        self.assertEqual(len(scraper.cache.get("analyst", "")), 25)
+
+if __name__ == '__main__':
+    unittest.main()
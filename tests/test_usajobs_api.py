@@ -0,0 +1,139 @@
+import unittest
+import sys
+import os
+import json
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import agents.job_scraper as job_scraper_module
+from agents.job_scraper import JobScraperAgent, USAJobsAPIAdapter
+from stub_server import StubServerTestCase
+
+API_KEY = 'test-key'
+TOTAL_RECORDS = 7
+
+def record(n):
+    return {
+        'MatchedObjectId': str(n),
+        'MatchedObjectDescriptor': {
+            'PositionTitle': f"Economist {n}",
+            'PositionURI': f"https://www.usajobs.gov/job/{n}",
+            'PositionLocationDisplay': "Washington, District of Columbia",
+            'OrganizationName': "Bureau of Labor Statistics",
+            'DepartmentName': "Department of Labor",
+            'PositionRemuneration': [{'MinimumRange': "86962.0", 'MaximumRange': "135111.0",
+                                      'RateIntervalCode': "PA", 'Description': "Per Year"}],
+            'PublicationStartDate': "2026-10-01T00:00:00.0000",
+            'UserArea': {'Details': {'JobSummary': "Analyze  labor market\ndata."}}
+        }
+    }
+
+class StubSearchAPIHandler(BaseHTTPRequestHandler):
+    """Pages through TOTAL_RECORDS records, like data.usajobs.gov/api/search"""
+    requests_seen = []
+
+    def do_GET(self):
+        query = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+        self.requests_seen.append(query)
+        if self.headers.get('Authorization-Key') != API_KEY:
+            self.send_response(401)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        per_page = int(query['ResultsPerPage'])
+        page = int(query['Page'])
+        numbers = range((page - 1) * per_page + 1, min(page * per_page, TOTAL_RECORDS) + 1)
+        body = json.dumps({'SearchResult': {
+            'SearchResultCount': len(numbers),
+            'SearchResultCountAll': TOTAL_RECORDS,
+            'SearchResultItems': [record(n) for n in numbers],
+        }}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class TestUSAJobsAPIAdapter(StubServerTestCase):
+    handler = StubSearchAPIHandler
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.url = f"{cls.base}/api/search"
+
+    def setUp(self):
+        StubSearchAPIHandler.requests_seen = []
+
+    def scraper_with_api(self, results_per_page=500):
+        config = dict(job_scraper_module.SCRAPER_CONFIG, USAJOBS_API_KEY=API_KEY,
+                      USAJOBS_API_EMAIL='dev@example.com', USAJOBS_API_URL=self.url,
+                      API_RESULTS_PER_PAGE=results_per_page)
+        with patch.object(job_scraper_module, 'SCRAPER_CONFIG', config):
+            return JobScraperAgent()
+
+    def test_maps_records_to_job_schema(self):
+        """API records become the same job dictionaries the HTML scraper returns"""
+        jobs = self.scraper_with_api().scrape_usajobs("economist", "Washington", "part-time")
+
+        self.assertEqual(len(jobs), TOTAL_RECORDS)
+        self.assertEqual(jobs[0], {
+            'title': "Economist 1",
+            'company': "Bureau of Labor Statistics",
+            'location': "Washington, District of Columbia",
+            'description': "Analyze labor market data.",
+            'salary': "$86,962 - $135,111 per year",
+            'url': "https://www.usajobs.gov/job/1",
+            'source': 'USAJobs.gov',
+            'date_posted': datetime(2026, 10, 1)
+        })
+        query = next(query for query in StubSearchAPIHandler.requests_seen if 'LocationName' in query)
+        self.assertEqual((query['Keyword'], query['LocationName'], query['PositionScheduleTypeCode']),
+                         ("economist", "Washington", "2"))
+        self.assertEqual(query['ResultsPerPage'], '500')
+
+    def test_missing_publication_date(self):
+        """Records with a null start date are dated now instead of failing"""
+        adapter = USAJobsAPIAdapter(None, API_KEY, 'dev@example.com')
+        descriptor = record(1)['MatchedObjectDescriptor']
+        descriptor['PublicationStartDate'] = None
+        job = adapter.to_job(descriptor)
+        self.assertEqual(job['title'], "Economist 1")
+        self.assertIsInstance(job['date_posted'], datetime)
+
+    def test_bulk_pages_through_crawl(self):
+        """Multi-page crawls request API pages until an empty one"""
+        scraper = self.scraper_with_api(results_per_page=3)
+        jobs = scraper.crawl_usajobs("economist", "", max_pages=5)
+
+        self.assertEqual([job['title'] for job in jobs], [f"Economist {n}" for n in range(1, 8)])
+        crawl = [query for query in StubSearchAPIHandler.requests_seen if query['ResultsPerPage'] == '3']
+        self.assertLessEqual({1, 2, 3, 4}, {int(query['Page']) for query in crawl})
+
+    def test_selected_only_with_credentials(self):
+        """Without credentials the agent keeps scraping result pages"""
+        config = dict(job_scraper_module.SCRAPER_CONFIG, USAJOBS_API_KEY='', USAJOBS_API_EMAIL='')
+        with patch.object(job_scraper_module, 'SCRAPER_CONFIG', config):
+            self.assertIsNone(JobScraperAgent().api)
+        self.assertIsInstance(self.scraper_with_api().api, USAJobsAPIAdapter)
+
+    @patch('agents.job_scraper.time.sleep')
+    def test_rejected_key_returns_no_jobs(self, mock_sleep):
+        """Authentication failures are retried, then reported as an empty result"""
+        scraper = self.scraper_with_api()
+        scraper.api.headers['Authorization-Key'] = 'wrong'
+        self.assertEqual(scraper.scrape_usajobs("statistician", ""), [])
+        attempts = [query for query in StubSearchAPIHandler.requests_seen if query['Keyword'] == "statistician"]
+        self.assertEqual(len(attempts), 3)
+
+if __name__ == '__main__':
+    unittest.main()